@@ -6,6 +6,9 @@ from .commands import (
     )
 from .pool import ConnectionsPool, create_pool
 from .pubsub import Channel
+from .queue import QueueConsumer
+from .subscriber import create_subscriber
+from .keyspace import create_keyspace_listener
 from .sentinel import RedisSentinel, create_sentinel
 from .cluster import create_cluster, create_pool_cluster
 from .errors import (
@@ -21,6 +24,7 @@ from .errors import (
     MaxClientsError,
     AuthError,
     ChannelClosedError,
+    ChannelOverflowError,
     WatchVariableError,
     PoolClosedError,
     SlaveNotFoundError,
@@ -40,6 +44,8 @@ __all__ = [
     'create_sentinel',
     'create_cluster',
     'create_pool_cluster',
+    'create_subscriber',
+    'create_keyspace_listener',
     # Classes
     'RedisConnection',
     'ConnectionsPool',
@@ -47,6 +53,7 @@ __all__ = [
     'GeoPoint',
     'GeoMember',
     'Channel',
+    'QueueConsumer',
     'RedisSentinel',
     # Errors
     'RedisError',
@@ -61,6 +68,7 @@ __all__ = [
     'ConnectionForcedCloseError',
     'PoolClosedError',
     'ChannelClosedError',
+    'ChannelOverflowError',
     'MasterNotFoundError',
     'SlaveNotFoundError',
     'ReadOnlyError',
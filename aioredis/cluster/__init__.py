@@ -2,7 +2,13 @@ from .cluster import (
     create_cluster,
     create_pool_cluster,
     RedisCluster,
-    RedisPoolCluster
+    RedisPoolCluster,
+    READ_FROM_MASTER,
+    READ_PREFER_REPLICA,
+    READ_ROUND_ROBIN,
+    READ_LOWEST_LATENCY,
+    RetryPolicy,
+    NodeResult,
 )
 
 
@@ -10,5 +16,11 @@ __all__ = [
     'create_cluster',
     'create_pool_cluster',
     'RedisCluster',
-    'RedisPoolCluster'
+    'RedisPoolCluster',
+    'READ_FROM_MASTER',
+    'READ_PREFER_REPLICA',
+    'READ_ROUND_ROBIN',
+    'READ_LOWEST_LATENCY',
+    'RetryPolicy',
+    'NodeResult',
 ]
@@ -1,5 +1,7 @@
 import asyncio
 
+from collections import deque
+
 from aioredis.errors import RedisClusterError
 from aioredis.util import _NOTSET
 
@@ -12,11 +14,100 @@ class RedisClusterBase:
         res = await self._execute_nodes('keys', pattern, encoding=encoding)
         return [item for part in res for item in part]
 
-    async def scan(self, cursor=0, match=None, count=None):
-        """Incrementally iterate the keys space.
+    def _group_keys_by_slot(self, keys):
+        """Group keys indexes by key slot.
+
+        Returns list of indexes lists.
+        """
+        if any(key is None for key in keys):
+            raise TypeError('key must not be None')
+        groups = {}
+        slots = self._cluster_manager.key_slots(keys)
+        for index, slot in enumerate(slots):
+            groups.setdefault(slot, []).append(index)
+        return list(groups.values())
+
+    async def _execute_keys(self, command, keys, *, step=1, **kwargs):
+        """Split multi-key command by key slots and execute
+        sub-commands of every node pipelined on single connection,
+        nodes in parallel.
+
+        ``keys`` holds command arguments, every ``step``-th of them is
+        a key followed by its values.
+
+        Returns list of (indexes, result) pairs.
+        """
+        groups = self._group_keys_by_slot(keys[::step])
+        if len(groups) == 1:
+            return [(range(len(keys) // step),
+                     await self.execute(command, *keys, **kwargs))]
+        nodes = {}
+        for indexes in groups:
+            args = [
+                arg for i in indexes for arg in keys[i * step:i * step + step]
+            ]
+            entity = self._route(command, args[:1])
+            nodes.setdefault(entity, []).append((indexes, args))
+        results = await asyncio.gather(*[
+            self._execute_pipeline(entity, command, batch, kwargs)
+            for entity, batch in nodes.items()
+        ], loop=self._loop)
+        return [pair for res in results for pair in res]
+
+    async def mget(self, key, *keys, encoding=_NOTSET):
+        """Get the values of all the given keys.
+
+        Keys may map to different slots; one MGET per slot is sent
+        and values are returned in keys order.
+        """
+        keys = (key,) + keys
+        reply = [None] * len(keys)
+        for indexes, values in await self._execute_keys(
+                'mget', keys, encoding=encoding):
+            for index, value in zip(indexes, values):
+                reply[index] = value
+        return reply
+
+    async def mset(self, key, value, *pairs):
+        """Set multiple keys to multiple values.
+
+        Keys may map to different slots; one MSET per slot is sent,
+        so the operation is atomic only per slot.
+
+        :raises TypeError: if len of pairs is not event number
+        """
+        if len(pairs) % 2 != 0:
+            raise TypeError("length of pairs must be even number")
+        res = await self._execute_keys(
+            'mset', (key, value) + pairs, step=2)
+        return all(ok for _, ok in res)
+
+    async def _execute_keys_count(self, command, keys):
+        res = await self._execute_keys(command, keys)
+        return sum(count for _, count in res)
+
+    async def delete(self, key, *keys):
+        """Delete a key(s), keys may map to different slots."""
+        return await self._execute_keys_count('delete', (key,) + keys)
+
+    async def exists(self, key, *keys):
+        """Check if key(s) exists, keys may map to different slots."""
+        return await self._execute_keys_count('exists', (key,) + keys)
+
+    async def unlink(self, key, *keys):
+        """Delete a key(s) asynchronously, keys may map to different slots.
+        """
+        return await self._execute_keys_count('unlink', (key,) + keys)
+
+    async def scan(self, cursor=0, match=None, count=None, key_type=None):
+        """Incrementally iterate the keys space of all master nodes.
+
+        Returns list of all matched keys, use :meth:`iscan`
+        to iterate large key spaces.
 
         :param match - str
         :param count - int
+        :param key_type - str
         :param cursor
         Usage example:
 
@@ -25,30 +116,59 @@ class RedisClusterBase:
         ...     print('Matched:', keys)
 
         """
-        async def scan_coroutine(address, cur=cursor):
-            """
-
-            :param address - address tuple
-            :param cur
-            Usage example:
-            """
-            if not cur:
-                cur = b'0'
-            ks = []
-            while cur:
-                fut = await self._execute_node(
-                    address, b'SCAN', cursor=cur, match=match, count=count)
-                cur, values = fut
-                ks.extend(values)
-            return ks
-
-        result = await asyncio.gather(*[
-            scan_coroutine(e, cur=cursor) for e in self._get_nodes_entities()
-        ], loop=self._loop)
+        cursors = {node.address: cursor for node in self.master_nodes}
+        it = self.iscan(match=match, count=count, key_type=key_type,
+                        cursors=cursors, pages=True)
+        result = []
+        async for keys in it:
+            result.extend(keys)
+        return result
+
+    def iscan(self, *, match=None, count=None, key_type=None,
+              concurrency=None, cursors=None, pages=False):
+        """Incrementally iterate the keys space of all master nodes
+        using async for.
+
+        Nodes are scanned concurrently, at most ``concurrency`` SCAN
+        commands are in flight at once and at most one page per node
+        is buffered.
+
+        :param match - str
+        :param count - int
+        :param key_type - str, limits keys to given type (Redis 6.0+)
+        :param concurrency - int, defaults to number of nodes
+        :param cursors - dict of node address to cursor, as returned by
+            :attr:`ClusterScanIter.cursors`, to resume a previous scan
+        :param pages - bool, yield lists of keys instead of single keys
+        Usage example:
 
-        flatten_result = []
-        list(map(flatten_result.extend, result))
-        return flatten_result
+        >>> it = cluster.iscan(match='key*', concurrency=2)
+        >>> async for key in it:
+        ...     print('Matched:', key)
+        ...     checkpoint = it.cursors  # may be saved to resume later
+
+        """
+        if concurrency is not None and concurrency < 1:
+            raise ValueError("concurrency must be positive")
+        if cursors is None:
+            cursors = {node.address: 0 for node in self.master_nodes}
+
+        entities = {}
+        for address in cursors:
+            node = self._cluster_manager.get_node_by_address(address)
+            entity = node and self._node_entity(node)
+            if entity is None:
+                raise RedisClusterError(
+                    'Unknown cluster node {}'.format(address))
+            entities[address] = entity
+
+        def scan(address, cur):
+            return self._execute_node(
+                entities[address], 'scan', cur,
+                match=match, count=count, key_type=key_type)
+
+        return ClusterScanIter(scan, cursors, concurrency=concurrency,
+                               pages=pages, loop=self._loop)
 
     async def cluster_del_slots(self, slot, *slots, many=False, slaves=False):
         """
@@ -191,3 +311,93 @@ class RedisClusterBase:
         Disables read queries for a connection to a Redis Cluster slave node.
         """
         return await self._execute_node(address, 'cluster_readwrite')
+
+
+class ClusterScanIter:
+    """Async iterator over keys of several cluster nodes.
+
+    Keeps SCAN cursor for every node not yet scanned to the end.
+    Cursor of a node is advanced only after all keys of its page
+    have been consumed, so scan resumed from :attr:`cursors` checkpoint
+    may return some keys again but never misses them.
+    """
+
+    def __init__(self, scan, cursors, *, concurrency=None, pages=False,
+                 loop=None):
+        self._scan = scan
+        self._cursors = dict(cursors)
+        self._concurrency = concurrency or max(len(self._cursors), 1)
+        self._pages = pages
+        self._loop = loop
+        self._pending = {}
+        self._ready = deque()
+        self._busy = set()
+        self._current = None
+        self._keys = deque()
+
+    @property
+    def cursors(self):
+        """Checkpoint: dict of node address to cursor for every node
+        which has not been scanned to the end yet.
+        """
+        return dict(self._cursors)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if self._pages:
+            return await self._next_page()
+        while not self._keys:
+            self._keys.extend(await self._next_page())
+        return self._keys.popleft()
+
+    def close(self):
+        """Cancel all in-flight SCAN commands."""
+        for task in self._pending:
+            task.cancel()
+        self._pending.clear()
+
+    async def _next_page(self):
+        if self._current is not None:
+            self._commit(*self._current)
+            self._current = None
+        while True:
+            while self._ready:
+                address, cur, keys = self._ready.popleft()
+                if keys:
+                    self._current = address, cur
+                    return keys
+                self._commit(address, cur)
+            self._schedule()
+            if not self._pending:
+                raise StopAsyncIteration    # noqa
+            done, _ = await asyncio.wait(
+                self._pending, loop=self._loop,
+                return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                address = self._pending.pop(task)
+                try:
+                    cur, keys = task.result()
+                except Exception:
+                    self.close()
+                    raise
+                self._ready.append((address, int(cur), keys))
+
+    def _schedule(self):
+        for address, cur in self._cursors.items():
+            if len(self._pending) >= self._concurrency:
+                break
+            if address in self._busy:
+                continue
+            self._busy.add(address)
+            task = asyncio.ensure_future(
+                self._scan(address, cur), loop=self._loop)
+            self._pending[task] = address
+
+    def _commit(self, address, cur):
+        self._busy.discard(address)
+        if cur:
+            self._cursors[address] = cur
+        else:
+            del self._cursors[address]
@@ -1,16 +1,24 @@
 import random
 import asyncio
-from functools import partial
+from collections import namedtuple
+from functools import lru_cache
 
-from aioredis.errors import ProtocolError
+from aioredis.errors import (
+    ProtocolError,
+    ConnectionClosedError,
+    PoolClosedError,
+)
 from aioredis.commands import (
     create_redis,
     Redis,
     create_redis_pool
 )
+from aioredis.commands.cluster import parse_info
+from aioredis.pool import ConnectionsPool, _BLOCKING_COMMANDS
 from aioredis.util import decode, encode_str, cached_property
 from aioredis.log import logger
-from aioredis.errors import ReplyError, RedisClusterError
+from aioredis.locks import Lock
+from aioredis.errors import ReplyError, RedisClusterError, RedisError
 from .crc import crc16
 from .base import RedisClusterBase
 
@@ -20,20 +28,272 @@ __all__ = (
     'RedisPoolCluster',
     'create_cluster',
     'RedisCluster',
+    'READ_FROM_MASTER',
+    'READ_PREFER_REPLICA',
+    'READ_ROUND_ROBIN',
+    'READ_LOWEST_LATENCY',
+    'RetryPolicy',
+    'NodeResult',
 )
 
 
-def parse_moved_response_error(err):
+REDIS_CLUSTER_HASH_SLOTS = 16384
+
+# Number of recently used keys which slots are memoized.
+KEY_SLOT_CACHE_SIZE = 4096
+
+_HASHABLE_KEY_TYPES = frozenset((str, bytes, int, float))
+
+# Read policies: which nodes serve read-only commands.
+READ_FROM_MASTER = 'master'
+READ_PREFER_REPLICA = 'prefer_replica'
+READ_ROUND_ROBIN = 'round_robin'
+READ_LOWEST_LATENCY = 'lowest_latency'
+
+_READ_POLICIES = frozenset((
+    READ_FROM_MASTER, READ_PREFER_REPLICA,
+    READ_ROUND_ROBIN, READ_LOWEST_LATENCY,
+))
+
+# Read-only commands (by commands mixin method name)
+# which may be served by replicas.
+READONLY_COMMANDS = frozenset((
+    'bitcount', 'bitpos', 'get', 'getbit', 'getrange', 'mget', 'strlen',
+    'dump', 'exists', 'pttl', 'ttl', 'type',
+    'hexists', 'hget', 'hgetall', 'hkeys', 'hlen', 'hmget', 'hscan',
+    'hstrlen', 'hvals',
+    'lindex', 'llen', 'lrange',
+    'scard', 'sdiff', 'sinter', 'sismember', 'smembers', 'srandmember',
+    'sscan', 'sunion',
+    'zcard', 'zcount', 'zlexcount', 'zrange', 'zrangebylex',
+    'zrangebyscore', 'zrank', 'zrevrange', 'zrevrangebylex',
+    'zrevrangebyscore', 'zrevrank', 'zscan', 'zscore',
+    'pfcount', 'geodist', 'geohash', 'geopos',
+))
+
+
+def _key_slot(key, bucket=REDIS_CLUSTER_HASH_SLOTS):
+    k = encode_str(key)
+    start = k.find(b'{')
+    if start > -1:
+        end = k.find(b'}', start + 1)
+        if end > -1 and end != start + 1:
+            return crc16(memoryview(k)[start + 1:end]) % bucket
+    return crc16(k) % bucket
+
+
+# typed=True: keys 1 and 1.0 are equal but encode differently.
+_cached_key_slot = lru_cache(maxsize=KEY_SLOT_CACHE_SIZE, typed=True)(
+    _key_slot)
+
+
+def key_slot(key, bucket=REDIS_CLUSTER_HASH_SLOTS):
+    """Calculate key slot for a given key.
+
+    Slots of hashable keys are memoized.
+
+    :param key - str|bytes
+    :param bucket - int
+    """
+    if bucket == REDIS_CLUSTER_HASH_SLOTS and \
+            type(key) in _HASHABLE_KEY_TYPES:
+        return _cached_key_slot(key)
+    return _key_slot(key, bucket)
+
+
+def key_slots(keys):
+    """Calculate key slots for a sequence of keys.
+
+    Returns list of slots in keys order.
+    """
+    cached, hashable = _cached_key_slot, _HASHABLE_KEY_TYPES
+    return [cached(key) if type(key) in hashable else _key_slot(key)
+            for key in keys]
+
+
+def parse_redirect_response_error(err):
+    """Parse MOVED or ASK redirection error.
+
+    Returns tuple of (kind, slot, address) or None.
+    """
     if not err or not err.args or not err.args[0]:
         return
     data = err.args[0].strip()
-    if not data.startswith('MOVED'):
+    if not data.startswith(('MOVED ', 'ASK ')):
         return
     try:
-        host, port = data.split()[-1].split(':')
-        return host, int(port)
-    except IndexError:
+        kind, slot, address = data.split()
+        host, port = address.rsplit(':', 1)
+        return kind, int(slot), (host, int(port))
+    except ValueError:
+        return
+
+
+def parse_moved_response_error(err):
+    redirect = parse_redirect_response_error(err)
+    if redirect is None or redirect[0] != 'MOVED':
         return
+    return redirect[2]
+
+
+# Result of command executed on a single node, see RedisCluster.iter_nodes;
+# either result or error is set.
+NodeResult = namedtuple('NodeResult', 'address result error')
+
+
+def _command_name(command):
+    """Normalize command name to commands mixin method name."""
+    return decode(command, 'utf-8').lower()
+
+
+def _first_key(args, kwargs):
+    return args[:1]
+
+
+def _eval_keys(args, kwargs):
+    keys = kwargs.get('keys', [])
+    if not isinstance(keys, (list, tuple)):
+        raise TypeError('keys must be given as list or tuple')
+    return keys
+
+
+def _migrate_keys(args, kwargs):
+    return args[2:3]
+
+
+# Keys getters of commands (by commands mixin method name)
+# which key is not the first argument.
+_COMMAND_KEYS = {
+    'eval': _eval_keys,
+    'evalsha': _eval_keys,
+    'migrate': _migrate_keys,
+}
+
+
+# Errors meaning command could not be delivered or its reply was lost
+_CONNECTION_ERRORS = (ConnectionClosedError, PoolClosedError, OSError)
+
+
+def _retry_reason(cmd, err):
+    """Return reason to retry command ``cmd`` failed with err or None.
+
+    Connection errors are retried only for read-only commands
+    as write command may have been applied before connection failed.
+    """
+    if isinstance(err, ReplyError):
+        if err.args and err.args[0]:
+            reason = err.args[0].split(None, 1)[0]
+            if reason in ('TRYAGAIN', 'CLUSTERDOWN'):
+                return reason
+        return None
+    if isinstance(err, _CONNECTION_ERRORS):
+        if cmd in READONLY_COMMANDS:
+            return 'CONNECTION'
+    return None
+
+
+def _may_resend(cmd, err):
+    """Return True if command failed with err may be sent again:
+    it was redirected or rejected by node, or it is read-only one
+    and connection failed.
+    """
+    if isinstance(err, ReplyError) and \
+            parse_redirect_response_error(err) is not None:
+        return True
+    return _retry_reason(cmd, err) is not None
+
+
+def _log_refresh_error(fut):
+    if not fut.cancelled() and fut.exception() is not None:
+        logger.warning(
+            "Cluster topology refresh failed with %r", fut.exception())
+
+
+async def _execute_asking(conn, cmd, *args, **kwargs):
+    """Send ASKING immediately followed by the command."""
+    asking = conn.execute(b'ASKING')
+    result = getattr(conn, cmd)(*args, **kwargs)
+    await asking
+    return await result
+
+
+async def _execute_pipeline(conn, cmd, commands, kwargs):
+    """Send command ``cmd`` with every arguments list of ``commands``
+    pipelined on connection.
+
+    Returns list of results (or exceptions) in commands order.
+    """
+    pipe = conn.pipeline()
+    for args in commands:
+        getattr(pipe, cmd)(*args, **kwargs)
+    return await pipe.execute(return_exceptions=True)
+
+
+class RetryPolicy:
+    """Retry policy for commands routed by key.
+
+    Commands failed with TRYAGAIN or CLUSTERDOWN (and read-only
+    commands failed with connection error) are retried
+    up to ``attempts`` times after exponential backoff with full jitter.
+    Retries are limited by budget: every command adds ``budget_ratio``
+    tokens (up to ``budget``), every retry takes one token,
+    so outage does not turn into retry storm.
+
+    :param attempts - int
+    :param backoff - float, base delay in seconds
+    :param max_backoff - float, max delay in seconds
+    :param budget - int
+    :param budget_ratio - float
+    """
+
+    def __init__(self, attempts=3, backoff=0.05, max_backoff=1.0,
+                 budget=10, budget_ratio=0.1):
+        assert attempts >= 0, ("attempts must be >= 0", attempts)
+        assert 0 <= backoff <= max_backoff, (
+            "backoff must be in [0, max_backoff]", backoff, max_backoff)
+        self.attempts = attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.budget = budget
+        self.budget_ratio = budget_ratio
+        self._tokens = budget
+
+    def __repr__(self):
+        return '<RetryPolicy attempts:{}, backoff:{}, tokens:{:.1f}>'.format(
+            self.attempts, self.backoff, self._tokens)
+
+    def deposit(self):
+        """Account new command in retry budget."""
+        self._tokens = min(self.budget, self._tokens + self.budget_ratio)
+
+    def acquire(self, attempt):
+        """Return True if command may be retried once more."""
+        if attempt >= self.attempts or self._tokens < 1:
+            return False
+        self._tokens -= 1
+        return True
+
+    def delay(self, attempt):
+        """Return delay in seconds before retry."""
+        return random.uniform(
+            0, min(self.max_backoff, self.backoff * 2 ** attempt))
+
+
+class ReadOnlyConnectionsPool(ConnectionsPool):
+    """Connections pool for cluster replica node.
+
+    Every new connection is switched to READONLY mode.
+    """
+
+    async def _create_new_connection(self, address):
+        conn = await super()._create_new_connection(address)
+        try:
+            await conn.execute(b'READONLY')
+        except Exception:
+            conn.close()
+            await conn.wait_closed()
+            raise
+        return conn
 
 
 class ClusterNode:
@@ -83,9 +343,43 @@ class ClusterNode:
         return any(rng[0] <= value <= rng[1] for rng in self.slots)
 
 
+class _AsCompletedIter:
+
+    __slots__ = ('_futures', '_iter', '_loop')
+
+    def __init__(self, futures, *, loop):
+        self._futures = [
+            asyncio.ensure_future(fut, loop=loop) for fut in futures]
+        self._iter = iter(asyncio.as_completed(self._futures, loop=loop))
+        self._loop = loop
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        try:
+            fut = next(self._iter)
+        except StopIteration:
+            raise StopAsyncIteration    # noqa
+        return await fut
+
+    def close(self):
+        """Cancel commands not completed yet."""
+        for fut in self._futures:
+            fut.cancel()
+
+    def __del__(self):
+        # iteration was left (eg: with break) without close
+        if not self._loop.is_closed():
+            self.close()
+
+
 class ClusterNodesManager:
 
-    REDIS_CLUSTER_HASH_SLOTS = 16384
+    REDIS_CLUSTER_HASH_SLOTS = REDIS_CLUSTER_HASH_SLOTS
+
+    key_slot = staticmethod(key_slot)
+    key_slots = staticmethod(key_slots)
 
     def __init__(self, nodes):
         nodes = list(nodes)
@@ -94,6 +388,21 @@ class ClusterNodesManager:
             if node.is_slave:
                 node.slots = masters_slots[node.master]
         self.nodes = nodes
+        self._nodes_by_id = {}
+        self._nodes_by_address = {}
+        for node in nodes:
+            self._nodes_by_id.setdefault(node.id, node)
+            self._nodes_by_address.setdefault(node.address, node)
+        self._slots = self._build_slots_table(self.masters)
+
+    @classmethod
+    def _build_slots_table(cls, masters):
+        """Build flat slot -> master node table."""
+        table = [None] * cls.REDIS_CLUSTER_HASH_SLOTS
+        for node in masters:
+            for start, end in node.slots:
+                table[start:end + 1] = [node] * (end - start + 1)
+        return table
 
     def __repr__(self):
         return r' == '.join(repr(node) for node in self.nodes)
@@ -111,20 +420,28 @@ class ClusterNodesManager:
         nodes = cls.parse_info(data)
         return cls(nodes)
 
-    @staticmethod
-    def key_slot(key, bucket=REDIS_CLUSTER_HASH_SLOTS):
-        """Calculate key slot for a given key.
+    @classmethod
+    def create_from_slots(cls, slots_info):
+        """Create manager from decoded CLUSTER SLOTS reply.
 
-        :param key - str|bytes
-        :param bucket - int
+        Redis prior 4.0 does not report node ids in CLUSTER SLOTS;
+        'host:port' is used as node id in such case.
         """
-        k = encode_str(key)
-        start = k.find(b'{')
-        if start > -1:
-            end = k.find(b'}', start + 1)
-            if end > -1 and end != start + 1:
-                k = k[start + 1:end]
-        return crc16(k) % bucket
+        nodes = {}
+        for start, end, master, *replicas in slots_info:
+            master_id = _slots_node_id(master)
+            if master_id not in nodes:
+                nodes[master_id] = _slots_node(
+                    master, master_id, ('master',), None, [])
+            nodes[master_id]['slots'].append((start, end))
+            for replica in replicas:
+                replica_id = _slots_node_id(replica)
+                if replica_id not in nodes:
+                    nodes[replica_id] = _slots_node(
+                        replica, replica_id, ('slave',), master_id, ())
+        for node in nodes.values():
+            node['slots'] = tuple(sorted(node['slots']))
+        return cls.create(nodes.values())
 
     @cached_property
     def alive_nodes(self):
@@ -150,33 +467,38 @@ class ClusterNodesManager:
     def slaves(self):
         return [node for node in self.alive_nodes if node.is_slave]
 
+    @cached_property
+    def _replicas_by_master(self):
+        replicas = {}
+        for node in self.slaves:
+            replicas.setdefault(node.master, []).append(node)
+        return replicas
+
+    def get_replicas(self, node):
+        """Return alive replicas of master node."""
+        return self._replicas_by_master.get(node.id, [])
+
     @cached_property
     def all_slots_covered(self):
-        covered_slots_number = sum(
-            end - start + 1
-            for master in self.masters for start, end in master.slots
-        )
-        return covered_slots_number >= self.REDIS_CLUSTER_HASH_SLOTS
+        return None not in self._slots
 
     def get_node_by_slot(self, slot):
-        for node in self.masters:
-            if node.in_range(slot):
-                return node
-        else:
-            return None
+        if 0 <= slot < self.REDIS_CLUSTER_HASH_SLOTS:
+            return self._slots[slot]
+        return None
+
+    def set_slot_node(self, slot, node):
+        """Route slot to the node, e.g. after MOVED redirection."""
+        self._slots[slot] = node
 
     def get_node_by_id(self, node_id):
-        for node in self.nodes:
-            if node_id == node.id:
-                return node
-        else:
-            return None
+        return self._nodes_by_id.get(node_id)
 
     def get_node_by_address(self, address):
-        for node in self.nodes:
-            if address == node.address:
-                return node
-        else:
+        try:
+            return self._nodes_by_address.get(address)
+        except TypeError:
+            # unhashable address
             return None
 
     def get_random_node(self):
@@ -194,16 +516,37 @@ class ClusterNodesManager:
         if len(keys) == 1:
             return self.key_slot(keys[0])
         else:
-            slots = {self.key_slot(key) for key in keys}
+            slots = set(self.key_slots(keys))
             if len(slots) != 1:
                 raise RedisClusterError(
                     'all keys must map to the same key slot')
             return slots.pop()
 
 
+def _slots_node_id(node):
+    if len(node) > 2:
+        return node[2]
+    return '{}:{}'.format(node[0], node[1])
+
+
+def _slots_node(node, node_id, flags, master, slots):
+    return {
+        'id': node_id,
+        'host': node[0],
+        'port': node[1],
+        'flags': flags,
+        'master': master,
+        'status': 'connected',
+        'slots': slots,
+    }
+
+
 async def create_pool_cluster(
         nodes, *, db=0, password=None, encoding=None,
-        minsize=10, maxsize=10, commands_factory=Redis, loop=None):
+        minsize=10, maxsize=10, commands_factory=Redis,
+        refresh_interval=None, read_from=READ_FROM_MASTER,
+        retry_policy=None, pool_sizes=None, lazy=False, idle_timeout=None,
+        loop=None):
     """
     Create Redis Pool Cluster.
 
@@ -214,6 +557,16 @@ async def create_pool_cluster(
     :param minsize: int
     :param maxsize: int
     :param commands_factory: obj
+    :param refresh_interval: float - seconds between background
+        topology refreshes, None disables refresher
+    :param read_from: str - read policy for read-only commands,
+        one of READ_FROM_MASTER, READ_PREFER_REPLICA, READ_ROUND_ROBIN
+        or READ_LOWEST_LATENCY
+    :param retry_policy: RetryPolicy - None for default policy
+    :param pool_sizes: dict - (minsize, maxsize) overrides by node address
+    :param lazy: bool - open node pool connections on first use only
+    :param idle_timeout: float - close free connections of node pools
+        not used for that many seconds, None disables trimming
     :param loop: obj
     :return RedisPoolCluster instance.
     """
@@ -224,14 +577,18 @@ async def create_pool_cluster(
 
     cluster = RedisPoolCluster(
         nodes, db, password, encoding=encoding, minsize=minsize,
-        maxsize=maxsize, commands_factory=commands_factory, loop=loop)
+        maxsize=maxsize, commands_factory=commands_factory,
+        refresh_interval=refresh_interval, read_from=read_from,
+        retry_policy=retry_policy, pool_sizes=pool_sizes, lazy=lazy,
+        idle_timeout=idle_timeout, loop=loop)
     await cluster.initialize()
     return cluster
 
 
 async def create_cluster(
         nodes, *, db=0, password=None, encoding=None,
-        commands_factory=Redis, loop=None):
+        commands_factory=Redis, refresh_interval=None,
+        read_from=READ_FROM_MASTER, retry_policy=None, loop=None):
     """
     Create Redis Pool Cluster.
 
@@ -240,6 +597,12 @@ async def create_cluster(
     :param password: str
     :param encoding: str
     :param commands_factory: obj
+    :param refresh_interval: float - seconds between background
+        topology refreshes, None disables refresher
+    :param read_from: str - read policy for read-only commands,
+        one of READ_FROM_MASTER, READ_PREFER_REPLICA, READ_ROUND_ROBIN
+        or READ_LOWEST_LATENCY
+    :param retry_policy: RetryPolicy - None for default policy
     :param loop: obj
     :return RedisPoolCluster instance.
     """
@@ -250,7 +613,9 @@ async def create_cluster(
 
     cluster = RedisCluster(
         nodes, db, password, encoding=encoding,
-        commands_factory=commands_factory, loop=loop)
+        commands_factory=commands_factory,
+        refresh_interval=refresh_interval, read_from=read_from,
+        retry_policy=retry_policy, loop=loop)
     await cluster.initialize()
     return cluster
 
@@ -259,11 +624,20 @@ class RedisCluster(RedisClusterBase):
     """Redis cluster."""
 
     MAX_MOVED_COUNT = 10
+    # Minimal number of seconds between two topology refreshes.
+    REFRESH_DEBOUNCE = 1.0
+    # Weight of the last response time in node latency average.
+    LATENCY_ALPHA = 0.2
 
     def __init__(self, nodes, db=0, password=None, encoding=None,
-                 *, commands_factory, loop=None):
+                 *, commands_factory, refresh_interval=None,
+                 read_from=READ_FROM_MASTER, retry_policy=None, loop=None):
         if loop is None:
             loop = asyncio.get_event_loop()
+        assert refresh_interval is None or refresh_interval > 0, (
+            "refresh_interval must be None or > 0", refresh_interval)
+        assert read_from in _READ_POLICIES, (
+            "Unknown read policy", read_from)
         self._nodes = nodes
         self._db = db
         self._password = password
@@ -272,20 +646,31 @@ class RedisCluster(RedisClusterBase):
         self._loop = loop
         self._moved_count = 0
         self._cluster_manager = None
-
-    def _is_eval_command(self, command):
-        if isinstance(command, bytes):
-            command = command.decode('utf-8')
-        return command.lower() in ['eval', 'evalsha']
+        self._connections = {}
+        self._connections_locks = {}
+        self._refresh_interval = refresh_interval
+        self._refresher = None
+        self._refreshing = None
+        self._refreshing_forced = False
+        self._last_refresh = None
+        self._current_epoch = None
+        self._read_from = read_from
+        self._read_counter = 0
+        self._latencies = {}
+        if retry_policy is None:
+            retry_policy = RetryPolicy()
+        self._retry_policy = retry_policy
 
     def get_node(self, command, *args, **kwargs):
-        if self._is_eval_command(command):
-            keys = kwargs.get('keys', [])
-            if not isinstance(keys, (list, tuple)):
-                raise TypeError('keys must be given as list or tuple')
-        else:
-            keys = args[:1]
+        return self._get_master_node(command, *args, **kwargs)
 
+    def _get_master_node(self, command, *args, **kwargs):
+        name = _command_name(command)
+        keys = _COMMAND_KEYS.get(name, _first_key)(args, kwargs)
+        return self._get_keys_node(keys)
+
+    def _get_keys_node(self, keys):
+        """Get master node serving slot of keys."""
         if len(keys) > 0:
             slot = self._cluster_manager.determine_slot(*keys)
             node = self._cluster_manager.get_node_by_slot(slot)
@@ -294,6 +679,44 @@ class RedisCluster(RedisClusterBase):
 
         return self._cluster_manager.get_random_master_node()
 
+    def _get_node_entity(self, command, *args, **kwargs):
+        """Get entity to execute command with by _execute_node."""
+        name = _command_name(command)
+        keys = _COMMAND_KEYS.get(name, _first_key)(args, kwargs)
+        return self._route(name, keys)
+
+    def _route(self, name, keys):
+        """Get entity to execute command with normalized name
+        by its keys.
+        """
+        node = self._get_keys_node(keys)
+        if self._read_from != READ_FROM_MASTER and \
+                name in READONLY_COMMANDS:
+            node = self._get_read_node(node)
+        return self._node_entity(node)
+
+    def _get_read_node(self, master):
+        """Choose master or one of its replicas to serve read-only
+        command according to read policy.
+        """
+        nodes = [
+            node for node in self._cluster_manager.get_replicas(master)
+            if self._node_entity(node) is not None]
+        if not nodes:
+            return master
+        if self._read_from == READ_PREFER_REPLICA:
+            return random.choice(nodes)
+        nodes.append(master)
+        if self._read_from == READ_ROUND_ROBIN:
+            self._read_counter += 1
+            return nodes[self._read_counter % len(nodes)]
+        latencies = self._latencies
+        return min(nodes, key=lambda node: latencies.get(
+            self._node_entity(node), 0))
+
+    def _node_entity(self, node):
+        return node.address
+
     def node_count(self):
         return self._cluster_manager.nodes_count
 
@@ -369,11 +792,142 @@ class RedisCluster(RedisClusterBase):
     async def initialize(self):
         logger.info('Initializing cluster...')
         self._moved_count = 0
+        self._current_epoch = None
         await self.fetch_cluster_info()
+        await self._close_stale_connections()
+        self._start_refresher()
         logger.info('Initialized cluster.\n{}'.format(self._cluster_manager))
 
     async def clear(self):
-        pass  # All connections are created on demand and destroyed afterwards.
+        """Stop topology refresher and close all cached node connections."""
+        self._stop_refresher()
+        connections, self._connections = self._connections, {}
+        self._connections_locks = {}
+        await self._close_connections(connections.values())
+
+    def _start_refresher(self):
+        if self._refresh_interval is None:
+            return
+        if self._refresher is None or self._refresher.done():
+            self._refresher = asyncio.ensure_future(
+                self._refresh_loop(self._refresh_interval), loop=self._loop)
+
+    def _stop_refresher(self):
+        if self._refresher is not None:
+            self._refresher.cancel()
+            self._refresher = None
+
+    async def _refresh_loop(self, interval):
+        while True:
+            await asyncio.sleep(interval, loop=self._loop)
+            try:
+                await self.refresh_topology()
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.warning(
+                    "Cluster topology refresh failed with %r", exc)
+
+    async def refresh_topology(self, *, force=False):
+        """Reload slots map with CLUSTER SLOTS from one of known masters.
+
+        Unless forced, refresh is debounced (see REFRESH_DEBOUNCE) and
+        CLUSTER SLOTS is only requested if cluster_current_epoch
+        reported by CLUSTER INFO has changed.
+        Concurrent calls share single refresh; forced call waits for
+        unforced refresh in progress and then starts its own.
+
+        Returns True if slots map was reloaded.
+        """
+        while force and self._refreshing is not None and \
+                not self._refreshing_forced:
+            # unforced refresh may skip reloading slots
+            await asyncio.wait([self._refreshing], loop=self._loop)
+        if self._refreshing is None:
+            self._refreshing = asyncio.ensure_future(
+                self._do_refresh_topology(force), loop=self._loop)
+            self._refreshing_forced = force
+            self._refreshing.add_done_callback(self._refresh_done)
+        return await asyncio.shield(self._refreshing, loop=self._loop)
+
+    def _refresh_done(self, fut):
+        self._refreshing = None
+
+    def _schedule_refresh(self):
+        """Start forced topology refresh in background."""
+        fut = asyncio.ensure_future(self.refresh_topology(force=True),
+                                    loop=self._loop)
+        fut.add_done_callback(_log_refresh_error)
+
+    async def _do_refresh_topology(self, force):
+        now = self._loop.time()
+        if (not force and self._last_refresh is not None and
+                now - self._last_refresh < self.REFRESH_DEBOUNCE):
+            return False
+        self._last_refresh = now
+
+        nodes = list(self._cluster_manager.masters)
+        random.shuffle(nodes)
+        last_error = None
+        for node in nodes:
+            entity = self._node_entity(node)
+            if entity is None:
+                continue
+            try:
+                info = await self._execute_entity(
+                    entity, 'execute', b'CLUSTER', b'INFO',
+                    encoding='utf-8')
+                epoch = parse_info(info, encoding='utf-8').get(
+                    'cluster_current_epoch')
+                if not force and epoch is not None and \
+                        epoch == self._current_epoch:
+                    return False
+                slots = await self._execute_entity(
+                    entity, 'execute', b'CLUSTER', b'SLOTS',
+                    encoding='utf-8')
+            except (RedisError, OSError) as exc:
+                last_error = exc
+                logger.warning(
+                    "Loading cluster slots from %r failed with %r",
+                    node.address, exc)
+                continue
+            manager = ClusterNodesManager.create_from_slots(slots)
+            await self._update_topology(manager)
+            self._current_epoch = epoch
+            self._moved_count = 0
+            return True
+        raise RedisClusterError(
+            "No cluster slots could be loaded from any master: {!r}"
+            .format(last_error))
+
+    async def _update_topology(self, manager):
+        """Switch to new slots map keeping connections to unchanged nodes.
+        """
+        old = {node.address for node in self._cluster_manager.nodes}
+        new = {node.address for node in manager.nodes}
+        if old != new:
+            logger.info('Cluster nodes changed; added: %r, removed: %r',
+                        new - old, old - new)
+        self._cluster_manager = manager
+        await self._close_stale_connections()
+
+    async def _close_stale_connections(self):
+        """Close connections to nodes which are no longer in cluster."""
+        stale = [
+            address for address in self._connections
+            if self._cluster_manager.get_node_by_address(address) is None
+        ]
+        await self._close_connections(
+            self._connections.pop(address) for address in stale)
+        for address in stale:
+            self._connections_locks.pop(address, None)
+
+    async def _close_connections(self, connections):
+        waiters = []
+        for conn in connections:
+            conn.close()
+            waiters.append(conn.wait_closed())
+        await asyncio.gather(*waiters, loop=self._loop)
 
     @property
     def all_slots_covered(self):
@@ -390,40 +944,226 @@ class RedisCluster(RedisClusterBase):
         )
         return conn
 
-    async def _execute_node(self, address, command, *args, **kwargs):
+    async def get_connection(self, address):
+        """Get cached connection to node, create it if there is none
+        or cached one is closed.
+        """
+        conn = self._connections.get(address)
+        if conn is not None and not conn.closed:
+            return conn
+        lock = self._connections_locks.get(address)
+        if lock is None:
+            lock = self._connections_locks[address] = Lock(loop=self._loop)
+        with (await lock):
+            conn = self._connections.get(address)
+            if conn is None or conn.closed:
+                conn = await self.create_connection(address)
+                if self._read_from != READ_FROM_MASTER:
+                    await self._set_readonly(address, conn)
+                self._connections[address] = conn
+            return conn
+
+    async def _set_readonly(self, address, conn):
+        node = self._cluster_manager.get_node_by_address(address)
+        if node is None or not node.is_slave:
+            return
+        try:
+            await conn.execute(b'READONLY')
+        except Exception:
+            conn.close()
+            await conn.wait_closed()
+            raise
+
+    def _drop_connection(self, address, conn):
+        if self._connections.get(address) is conn:
+            del self._connections[address]
+        conn.close()
+
+    async def _execute_command(self, address, cmd, *args, **kwargs):
+        """Execute command on node connection."""
+        if cmd.upper() in _BLOCKING_COMMANDS:
+            # blocking command runs on a separate short-lived connection
+            conn = await self.create_connection(address)
+            try:
+                return await getattr(conn, cmd)(*args, **kwargs)
+            finally:
+                conn.close()
+                await conn.wait_closed()
+
+        conn = await self.get_connection(address)
+        try:
+            return await getattr(conn, cmd)(*args, **kwargs)
+        except (ConnectionClosedError, ProtocolError, OSError):
+            self._drop_connection(address, conn)
+            raise
+
+    async def _execute_asking(self, address, cmd, *args, **kwargs):
+        """Execute command on importing node after ASK redirection."""
+        conn = await self.get_connection(address)
+        try:
+            return await _execute_asking(conn, cmd, *args, **kwargs)
+        except (ConnectionClosedError, ProtocolError, OSError):
+            self._drop_connection(address, conn)
+            raise
+
+    async def _execute_entity(self, address, cmd, *args, **kwargs):
+        return await self._execute_command(address, cmd, *args, **kwargs)
+
+    async def _execute_entity_pipeline(self, address, cmd, commands, kwargs):
+        conn = await self.get_connection(address)
+        results = await _execute_pipeline(conn, cmd, commands, kwargs)
+        if any(isinstance(res, (ConnectionClosedError, ProtocolError, OSError))
+               for res in results):
+            self._drop_connection(address, conn)
+        return results
+
+    async def _execute_pipeline(self, entity, cmd, batch, kwargs):
+        """Execute command with normalized name ``cmd`` for every
+        ``(indexes, args)`` pair of batch pipelined on node ``entity``.
+
+        Redirected sub-commands follow redirection, ones rejected
+        by node (TRYAGAIN, CLUSTERDOWN) are executed again
+        with :meth:`execute`.
+        Returns list of (indexes, result) pairs.
+        """
+        if entity is None:
+            # no pool for the node, route sub-commands one by one
+            results = [None] * len(batch)
+            retries = list(range(len(batch)))
+        else:
+            results = await self._execute_entity_pipeline(
+                entity, cmd, [args for _, args in batch], kwargs)
+            retries = []
+            for i, res in enumerate(results):
+                if isinstance(res, Exception):
+                    if not _may_resend(cmd, res):
+                        raise res
+                    retries.append(i)
+        retried = await asyncio.gather(*[
+            self._resend(cmd, batch[i][1], kwargs, results[i])
+            for i in retries
+        ], loop=self._loop)
+        for i, res in zip(retries, retried):
+            results[i] = res
+        return [(indexes, res) for (indexes, _), res in zip(batch, results)]
+
+    async def _resend(self, cmd, args, kwargs, err):
+        redirect = None
+        if isinstance(err, ReplyError):
+            redirect = parse_redirect_response_error(err)
+        if redirect is not None:
+            return await self._follow_redirect(redirect, cmd, args, kwargs)
+        return await self.execute(cmd, *args, **kwargs)
+
+    async def _execute_measured(self, entity, cmd, *args, **kwargs):
+        """Execute command updating average latency of the node."""
+        started = self._loop.time()
+        try:
+            return await self._execute_entity(entity, cmd, *args, **kwargs)
+        finally:
+            latency = self._loop.time() - started
+            average = self._latencies.get(entity, latency)
+            self._latencies[entity] = (
+                average + (latency - average) * self.LATENCY_ALPHA)
+
+    async def _reload_topology(self):
+        try:
+            await self.refresh_topology(force=True)
+        except (RedisError, OSError):
+            await self._reload_cluster()
+
+    async def _reload_cluster(self):
+        await self.initialize()
+
+    async def _execute_node(self, entity, command, *args, **kwargs):
         """Execute redis command and returns Future waiting for the answer.
 
+        Follows single MOVED or ASK redirection.
+        MOVED updates the slot owner in the routing table
+        (or reloads whole topology after MAX_MOVED_COUNT redirections
+        to unknown nodes).
+
         :param command str
-        :param pool obj
+        :param entity - node address or pool
         Raises:
         * TypeError if any of args can not be encoded as bytes.
         * ReplyError on redis '-ERR' responses.
         * ProtocolError when response can not be decoded meaning connection
           is broken.
         """
-        cmd = decode(command, 'utf-8').lower()
-        to_close = []
+        return await self._execute_cmd(
+            entity, _command_name(command), args, kwargs)
+
+    async def _execute_cmd(self, entity, cmd, args, kwargs):
+        """Execute command with normalized name ``cmd``
+        following redirections.
+        """
+        execute = self._execute_entity
+        if self._read_from == READ_LOWEST_LATENCY:
+            execute = self._execute_measured
         try:
-            conn = await self.create_connection(address)
-            to_close.append(conn)
-            return await getattr(conn, cmd)(*args, **kwargs)
+            return await execute(entity, cmd, *args, **kwargs)
         except ReplyError as err:
-            address = parse_moved_response_error(err)
-            if address is None:
+            redirect = parse_redirect_response_error(err)
+            if redirect is None:
                 raise
-            logger.debug('Got MOVED command: {}'.format(err))
-            self._moved_count += 1
-            if self._moved_count >= self.MAX_MOVED_COUNT:
-                await self.initialize()
-                node = self.get_node(command, *args, **kwargs)
-                address = node.address
-            conn = await self.create_connection(address)
-            to_close.append(conn)
-            return await getattr(conn, cmd)(*args, **kwargs)
-        finally:
-            for conn in to_close:
-                conn.close()
-                await conn.wait_closed()
+            logger.debug('Got redirection: {}'.format(err))
+        return await self._follow_redirect(redirect, cmd, args, kwargs)
+
+    async def _follow_redirect(self, redirect, cmd, args, kwargs):
+        """Execute command redirected with MOVED or ASK."""
+        kind, slot, address = redirect
+        if kind == 'ASK':
+            return await self._execute_asking(address, cmd, *args, **kwargs)
+
+        node = self._cluster_manager.get_node_by_address(address)
+        entity = None
+        if node is not None and node.is_master:
+            entity = self._node_entity(node)
+        if entity is not None:
+            self._cluster_manager.set_slot_node(slot, node)
+            return await self._execute_entity(entity, cmd, *args, **kwargs)
+
+        self._moved_count += 1
+        if self._moved_count >= self.MAX_MOVED_COUNT:
+            await self._reload_topology()
+            entity = self._get_node_entity(cmd, *args, **kwargs)
+            return await self._execute_entity(entity, cmd, *args, **kwargs)
+        return await self._execute_command(address, cmd, *args, **kwargs)
+
+    async def _execute_routed(self, name, keys, args, kwargs):
+        """Execute command with normalized name on node routed by keys.
+
+        Retries command according to retry policy; topology is refreshed
+        before retry unless node replied with TRYAGAIN
+        (so after failover command goes to promoted replica).
+        Command which is not retried after connection error
+        (eg: write) still schedules topology refresh.
+        """
+        policy = self._retry_policy
+        policy.deposit()
+        attempt = 0
+        while True:
+            entity = self._route(name, keys)
+            try:
+                return await self._execute_cmd(entity, name, args, kwargs)
+            except (RedisError, OSError) as err:
+                reason = _retry_reason(name, err)
+                if reason is None or not policy.acquire(attempt):
+                    if isinstance(err, _CONNECTION_ERRORS):
+                        self._schedule_refresh()
+                    raise
+                delay = policy.delay(attempt)
+                attempt += 1
+                logger.debug('Retrying %r in %.3fs (attempt %d): %r',
+                             name, delay, attempt, err)
+            await asyncio.sleep(delay, loop=self._loop)
+            if reason != 'TRYAGAIN':
+                try:
+                    await self.refresh_topology(force=True)
+                except (RedisError, OSError) as exc:
+                    logger.warning(
+                        "Cluster topology refresh failed with %r", exc)
 
     async def _execute_nodes(self, command, *args, slaves=False, **kwargs):
         """
@@ -444,12 +1184,59 @@ class RedisCluster(RedisClusterBase):
             for node in nodes
         ], loop=self._loop)
 
+    def iter_nodes(self, command, *args, slaves=False, timeout=None,
+                   **kwargs):
+        """Execute redis command on all nodes and iterate over
+        results as they come.
+
+        Yields :class:`NodeResult` for every node; errors (including
+        timeouts) are reported in ``error`` field, not raised.
+
+        :param command str
+        :param slaves bool - Execute on all nodes masters + slaves
+        :param timeout float - per node timeout in seconds
+        Usage example:
+
+        >>> async for res in cluster.iter_nodes('info', timeout=1):
+        ...     if res.error is not None:
+        ...         print('Failed on', res.address, res.error)
+
+        Iterator ``close()`` method cancels commands not completed yet;
+        call it when leaving the loop early.
+        """
+        nodes = list(self.master_nodes)
+        if slaves:
+            nodes.extend(self.slave_nodes)
+        futures = [
+            self._execute_node_result(
+                node.address, entity, command, args, kwargs, timeout)
+            for node, entity in (
+                (node, self._node_entity(node)) for node in nodes)
+            if entity is not None
+        ]
+        return _AsCompletedIter(futures, loop=self._loop)
+
+    async def _execute_node_result(
+            self, address, entity, command, args, kwargs, timeout):
+        try:
+            fut = self._execute_node(entity, command, *args, **kwargs)
+            if timeout is not None:
+                fut = asyncio.wait_for(fut, timeout, loop=self._loop)
+            result = await fut
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            return NodeResult(address, None, exc)
+        return NodeResult(address, result, None)
+
     async def execute(
             self, command, *args, address=None, many=False, slaves=False,
             **kwargs
     ):
         """Execute redis command and returns Future waiting for the answer.
 
+        Commands routed by keys are retried according to retry policy.
+
         :param command str
         :param address tuple - Execute on node with specified address
             if many specified will be ignored
@@ -462,56 +1249,118 @@ class RedisCluster(RedisClusterBase):
           is broken.
         """
 
+        name = _command_name(command)
         # bad hack to prevent execution on many nodes
-        if many or (not args and 'cluster_' not in command):
+        if many or (not args and not name.startswith('cluster_')):
             return await self._execute_nodes(
-                command, *args, slaves=slaves, **kwargs
+                name, *args, slaves=slaves, **kwargs
             )
 
         if not address:
-            address = self.get_node(command, *args, **kwargs).address
+            keys = _COMMAND_KEYS.get(name, _first_key)(args, kwargs)
+            return await self._execute_routed(name, keys, args, kwargs)
+
+        return await self._execute_cmd(address, name, args, kwargs)
+
+    def _bind_command(self, cmd):
+        """Build coroutine function executing command ``cmd``.
+
+        Plain calls (positional arguments only) are routed directly,
+        others go through :meth:`execute`.
+        """
+        name = _command_name(cmd)
+        get_keys = _COMMAND_KEYS.get(name, _first_key)
+        execute, execute_routed = self.execute, self._execute_routed
+
+        async def command(*args, **kwargs):
+            if args and not kwargs:
+                return await execute_routed(
+                    name, get_keys(args, kwargs), args, kwargs)
+            return await execute(name, *args, **kwargs)
 
-        return await self._execute_node(address, command, *args, **kwargs)
+        command.__name__ = command.__qualname__ = name
+        return command
 
     def __getattr__(self, cmd):
-        return partial(self.execute, cmd)
+        command = self._bind_command(cmd)
+        if not cmd.startswith('_'):
+            # cache bound command, so next lookup will not get here
+            self.__dict__[cmd] = command
+        return command
 
 
 class RedisPoolCluster(RedisCluster):
     """
     Redis pool cluster.
     Do not use it for cluster management.
-    Will not operate with slaves and target node
+    Will not operate with target node. Replicas are used only
+    to serve read-only commands if read policy is set.
     """
 
     def __init__(self, nodes, db=0, password=None, encoding=None,
-                 *, minsize, maxsize, commands_factory, loop=None):
+                 *, minsize, maxsize, commands_factory,
+                 refresh_interval=None, read_from=READ_FROM_MASTER,
+                 retry_policy=None, pool_sizes=None, lazy=False,
+                 idle_timeout=None, loop=None):
         if loop is None:
             loop = asyncio.get_event_loop()
+        assert idle_timeout is None or idle_timeout > 0, (
+            "idle_timeout must be None or > 0", idle_timeout)
         super().__init__(nodes, db=db, password=password, encoding=encoding,
-                         commands_factory=commands_factory, loop=loop)
+                         commands_factory=commands_factory,
+                         refresh_interval=refresh_interval,
+                         read_from=read_from, retry_policy=retry_policy,
+                         loop=loop)
         self._minsize = minsize
         self._maxsize = maxsize
+        self._pool_sizes = dict(pool_sizes or {})
+        self._lazy = lazy
+        self._idle_timeout = idle_timeout
+        self._trimmer = None
+        self._last_used = {}
         self._cluster_pool = {}
+        self._replica_pools = {}
 
     def _get_nodes_entities(self, **kwargs):
         return self._cluster_pool.values()
 
     async def get_cluster_pool(self):
+        return await self._create_node_pools(self._cluster_manager.masters)
+
+    async def get_replica_pools(self):
+        """Create READONLY pools for replicas if read policy uses them."""
+        if self._read_from == READ_FROM_MASTER:
+            return {}
+        return await self._create_node_pools(
+            self._cluster_manager.slaves, readonly=True)
+
+    def _node_pool_size(self, node):
+        return self._pool_sizes.get(
+            node.address, (self._minsize, self._maxsize))
+
+    async def _create_node_pools(self, nodes, *, readonly=False):
         cluster_pool = {}
-        nodes = list(self._cluster_manager.masters)
+        nodes = list(nodes)
+        pool_cls = ReadOnlyConnectionsPool if readonly else None
+        if self._lazy:
+            for node in nodes:
+                cluster_pool[node.id] = self._create_lazy_pool(
+                    node, pool_cls or ConnectionsPool)
+            return cluster_pool
         tasks = [
             create_redis_pool(
                 node.address,
                 db=self._db,
                 password=self._password,
                 encoding=self._encoding,
-                minsize=self._minsize,
-                maxsize=self._maxsize,
+                minsize=minsize,
+                maxsize=maxsize,
                 commands_factory=self._factory,
+                pool_cls=pool_cls,
                 loop=self._loop
             )
-            for node in nodes
+            for node, (minsize, maxsize) in (
+                (node, self._node_pool_size(node)) for node in nodes)
         ]
         results = await asyncio.gather(*tasks, loop=self._loop)
 
@@ -519,6 +1368,56 @@ class RedisPoolCluster(RedisCluster):
             cluster_pool[node.id] = connection
         return cluster_pool
 
+    def _create_lazy_pool(self, node, pool_cls):
+        """Create node pool without connecting;
+        connections are opened on first acquire.
+        """
+        minsize, maxsize = self._node_pool_size(node)
+        pool = pool_cls(
+            node.address, self._db, self._password, self._encoding,
+            minsize=minsize, maxsize=maxsize, loop=self._loop)
+        return self._factory(pool)
+
+    def _start_trimmer(self):
+        if self._idle_timeout is None:
+            return
+        if self._trimmer is None or self._trimmer.done():
+            self._trimmer = asyncio.ensure_future(
+                self._trim_loop(self._idle_timeout), loop=self._loop)
+
+    def _stop_trimmer(self):
+        if self._trimmer is not None:
+            self._trimmer.cancel()
+            self._trimmer = None
+
+    async def _trim_loop(self, idle_timeout):
+        while True:
+            await asyncio.sleep(idle_timeout / 2, loop=self._loop)
+            try:
+                await self.trim_idle_pools()
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.warning("Trimming idle node pools failed with %r", exc)
+
+    async def trim_idle_pools(self):
+        """Close free connections of node pools which have not been used
+        for idle_timeout seconds.
+
+        Returns number of trimmed pools.
+        """
+        deadline = self._loop.time() - (self._idle_timeout or 0)
+        pools = list(self._cluster_pool.values())
+        pools.extend(self._replica_pools.values())
+        last_used = {pool: self._last_used.get(pool, 0) for pool in pools}
+        self._last_used = last_used
+        trimmed = 0
+        for pool in pools:
+            if last_used[pool] <= deadline and pool.connection.freesize:
+                await pool.connection.clear()
+                trimmed += 1
+        return trimmed
+
     async def reload_cluster_pool(self):
         logger.info('Reloading cluster...')
         await self.clear()
@@ -526,59 +1425,111 @@ class RedisPoolCluster(RedisCluster):
         await self.fetch_cluster_info()
         logger.info('Connecting to cluster...')
         self._cluster_pool = await self.get_cluster_pool()
+        self._replica_pools = await self.get_replica_pools()
+        self._start_refresher()
+        self._start_trimmer()
         logger.info('Reloaded cluster')
 
+    async def _update_topology(self, manager):
+        """Switch to new slots map.
+
+        Pools of masters (and replicas) which are still in cluster
+        are kept; pools are created only for new nodes
+        and closed only for removed ones.
+        """
+        cluster_pool, new_masters, old_pools = await self._update_node_pools(
+            self._cluster_pool, manager.masters)
+        if new_masters or old_pools:
+            logger.info('Cluster masters changed; added: %r, removed: %r',
+                        [node.address for node in new_masters],
+                        [pool.address for pool in old_pools])
+        replicas = []
+        if self._read_from != READ_FROM_MASTER:
+            replicas = manager.slaves
+        replica_pools, _, old_replica_pools = await self._update_node_pools(
+            self._replica_pools, replicas, readonly=True)
+        self._cluster_pool = cluster_pool
+        self._replica_pools = replica_pools
+        self._cluster_manager = manager
+        await self._close_stale_connections()
+        for pool in old_pools + old_replica_pools:
+            pool.close()
+            await pool.wait_closed()
+
+    async def _update_node_pools(self, pools, nodes, *, readonly=False):
+        """Match existing pools with nodes by address.
+
+        Returns tuple of new pools dict, nodes for which pools were
+        created and list of pools which are no longer used.
+        """
+        old_pools = {pool.address: pool for pool in pools.values()}
+        node_pools, new_nodes = {}, []
+        for node in nodes:
+            pool = old_pools.pop(node.address, None)
+            if pool is None or pool.closed:
+                new_nodes.append(node)
+            else:
+                node_pools[node.id] = pool
+        node_pools.update(
+            await self._create_node_pools(new_nodes, readonly=readonly))
+        return node_pools, new_nodes, list(old_pools.values())
+
     async def initialize(self):
         await super().initialize()
         self._cluster_pool = await self.get_cluster_pool()
+        self._replica_pools = await self.get_replica_pools()
+        self._start_trimmer()
 
     async def clear(self):
         """Clear pool connections. Close and remove all free connections."""
-        for pool in self._get_nodes_entities():
+        self._stop_trimmer()
+        self._last_used = {}
+        pools = list(self._get_nodes_entities())
+        pools.extend(self._replica_pools.values())
+        self._replica_pools = {}
+        for pool in pools:
             pool.close()
             await pool.wait_closed()
+        await super().clear()
 
     def get_node(self, command, *args, **kwargs):
         node = super().get_node(command, *args, **kwargs)
         return self._cluster_pool[node.id]
 
-    async def _execute_node(self, pool, command, *args, **kwargs):
-        """Execute redis command and returns Future waiting for the answer.
+    def _node_entity(self, node):
+        if node.is_slave:
+            return self._replica_pools.get(node.id)
+        return self._cluster_pool.get(node.id)
 
-        :param command str
-        :param pool obj
-        Raises:
-        * TypeError if any of args can not be encoded as bytes.
-        * ReplyError on redis '-ERR' responses.
-        * ProtocolError when response can not be decoded meaning connection
-          is broken.
-        """
-        cmd = decode(command, 'utf-8').lower()
-        try:
-            with await pool as conn:
-                return await getattr(conn, cmd)(*args, **kwargs)
-        except ReplyError as err:
-            address = parse_moved_response_error(err)
-            if address is None:
-                raise
+    async def _execute_entity(self, pool, cmd, *args, **kwargs):
+        if self._idle_timeout is not None:
+            self._last_used[pool] = self._loop.time()
+        with await pool as conn:
+            return await getattr(conn, cmd)(*args, **kwargs)
 
-            logger.debug('Got MOVED command: {}'.format(err))
-            self._moved_count += 1
-            if self._moved_count >= self.MAX_MOVED_COUNT:
-                await self.initialize()
-                pool = self.get_node(command, *args, **kwargs)
-                with await pool as conn:
-                    return await getattr(conn, cmd)(*args, **kwargs)
-            else:
-                conn = await self.create_connection(address)
-                res = await getattr(conn, cmd)(*args, **kwargs)
-                conn.close()
-                await conn.wait_closed()
-                return res
+    async def _execute_entity_pipeline(self, pool, cmd, commands, kwargs):
+        if self._idle_timeout is not None:
+            self._last_used[pool] = self._loop.time()
+        with await pool as conn:
+            return await _execute_pipeline(conn, cmd, commands, kwargs)
+
+    async def _execute_asking(self, address, cmd, *args, **kwargs):
+        node = self._cluster_manager.get_node_by_address(address)
+        pool = node and self._cluster_pool.get(node.id)
+        if pool is None:
+            return await super()._execute_asking(
+                address, cmd, *args, **kwargs)
+        with await pool as conn:
+            return await _execute_asking(conn, cmd, *args, **kwargs)
+
+    async def _reload_cluster(self):
+        await self.reload_cluster_pool()
 
     async def execute(self, command, *args, many=False, **kwargs):
         """Execute redis command and returns Future waiting for the answer.
 
+        Commands routed by keys are retried according to retry policy.
+
         :param command str
         :param many bool - invoke on all master nodes
         Raises:
@@ -588,9 +1539,10 @@ class RedisPoolCluster(RedisCluster):
           is broken.
         """
 
+        name = _command_name(command)
         # bad hack to prevent execution on many nodes
-        if many or (not args and 'cluster_' not in command):
-            return await self._execute_nodes(command, *args, **kwargs)
+        if many or (not args and not name.startswith('cluster_')):
+            return await self._execute_nodes(name, *args, **kwargs)
 
-        pool = self.get_node(command, *args, **kwargs)
-        return await self._execute_node(pool, command, *args, **kwargs)
+        keys = _COMMAND_KEYS.get(name, _first_key)(args, kwargs)
+        return await self._execute_routed(name, keys, args, kwargs)
@@ -15,6 +15,7 @@ from .server import ServerCommandsMixin
 from .pubsub import PubSubCommandsMixin
 from .cluster import ClusterCommandsMixin
 from .geo import GeoCommandsMixin, GeoPoint, GeoMember
+from .streams import StreamCommandsMixin
 
 __all__ = [
     'create_redis',
@@ -33,7 +34,7 @@ class Redis(GenericCommandsMixin, StringCommandsMixin,
             SortedSetCommandsMixin, ListCommandsMixin,
             ScriptingCommandsMixin, ServerCommandsMixin,
             PubSubCommandsMixin, ClusterCommandsMixin,
-            GeoCommandsMixin):
+            GeoCommandsMixin, StreamCommandsMixin):
     """High-level Redis interface.
 
     Gathers in one place Redis commands implemented in mixins.
@@ -179,7 +180,8 @@ async def create_redis_pool(address, *, db=None, password=None, ssl=None,
                             encoding=None, commands_factory=Redis,
                             minsize=1, maxsize=10, parser=None,
                             timeout=None, pool_cls=None,
-                            connection_cls=None, loop=None):
+                            connection_cls=None, blocking_maxsize=None,
+                            loop=None):
     """Creates high-level Redis interface.
 
     This function is a coroutine.
@@ -194,5 +196,6 @@ async def create_redis_pool(address, *, db=None, password=None, ssl=None,
                              create_connection_timeout=timeout,
                              pool_cls=pool_cls,
                              connection_cls=connection_cls,
+                             blocking_maxsize=blocking_maxsize,
                              loop=loop)
     return commands_factory(pool)
@@ -220,9 +220,11 @@ class GenericCommandsMixin:
         """Creates a key associated with a value that is obtained via DUMP."""
         return self.execute(b'RESTORE', key, ttl, value)
 
-    def scan(self, cursor=0, match=None, count=None):
+    def scan(self, cursor=0, match=None, count=None, key_type=None):
         """Incrementally iterate the keys space.
 
+        ``key_type`` limits keys to those of given type (Redis 6.0+).
+
         Usage example:
 
         >>> match = 'something*'
@@ -238,10 +240,12 @@ class GenericCommandsMixin:
             args += [b'MATCH', match]
         if count is not None:
             args += [b'COUNT', count]
+        if key_type is not None:
+            args += [b'TYPE', key_type]
         fut = self.execute(b'SCAN', cursor, *args)
         return wait_convert(fut, lambda o: (int(o[0]), o[1]))
 
-    def iscan(self, *, match=None, count=None):
+    def iscan(self, *, match=None, count=None, key_type=None):
         """Incrementally iterate the keys space using async for.
 
         Usage example:
@@ -251,7 +255,8 @@ class GenericCommandsMixin:
 
         """
         return _ScanIter(lambda cur: self.scan(cur,
-                                               match=match, count=count))
+                                               match=match, count=count,
+                                               key_type=key_type))
 
     def sort(self, key, *get_patterns,
              by=None, offset=None, count=None,
@@ -289,3 +294,8 @@ class GenericCommandsMixin:
         """
         # NOTE: for non-existent keys TYPE returns b'none'
         return self.execute(b'TYPE', key)
+
+    def unlink(self, key, *keys):
+        """Delete a key asynchronously in another thread."""
+        fut = self.execute(b'UNLINK', key, *keys)
+        return wait_convert(fut, int)
@@ -1,5 +1,7 @@
+import asyncio
 import json
 
+from aioredis.abc import AbcPool
 from aioredis.util import wait_make_dict
 
 
@@ -17,6 +19,39 @@ class PubSubCommandsMixin:
         """Post a JSON-encoded message to channel."""
         return self.publish(channel, json.dumps(obj))
 
+    async def publish_many(self, messages, *, serializer=None,
+                           in_executor=False):
+        """Post list of ``(channel, message)`` pairs.
+
+        All PUBLISH commands are sent with single write.
+        Messages are encoded with ``serializer`` (eg: ``json.dumps``)
+        if given; with ``in_executor`` set serializer is run
+        in default loop executor (useful for large payloads).
+
+        Returns list of numbers of clients received each message.
+        """
+        if not messages:
+            return []
+        loop = self._pool_or_conn._loop
+        if serializer is not None:
+            payloads = [msg for _, msg in messages]
+            if in_executor:
+                payloads = await loop.run_in_executor(
+                    None, _serialize, serializer, payloads)
+            else:
+                payloads = _serialize(serializer, payloads)
+            commands = [(b'PUBLISH', channel, payload)
+                        for (channel, _), payload in zip(messages, payloads)]
+        else:
+            commands = [(b'PUBLISH', channel, msg)
+                        for channel, msg in messages]
+        if isinstance(self._pool_or_conn, AbcPool):
+            async with self._pool_or_conn.get() as conn:
+                futs = conn.execute_many(commands)
+                return (await asyncio.gather(*futs, loop=loop))
+        futs = self._pool_or_conn.execute_many(commands)
+        return (await asyncio.gather(*futs, loop=loop))
+
     def subscribe(self, channel, *channels):
         """Switch connection to Pub/Sub mode and
         subscribe to specified channels.
@@ -103,6 +138,10 @@ class PubSubCommandsMixin:
         return self._pool_or_conn.in_pubsub
 
 
+def _serialize(serializer, payloads):
+    return [serializer(payload) for payload in payloads]
+
+
 async def wait_return_channels(fut, conn, field):
     res = await fut
     channels_dict = getattr(conn, field)
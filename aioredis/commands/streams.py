@@ -0,0 +1,399 @@
+import asyncio
+from collections import deque
+
+from aioredis.util import wait_convert, wait_ok, _NOTSET, _converters
+
+
+def fields_to_dict(fields):
+    """Converts flat list of stream entry fields and values to dict."""
+    if fields is None:
+        return None
+    it = iter(fields)
+    return dict(zip(it, it))
+
+
+def parse_messages(messages):
+    """Parses list of stream entries into list of (id, fields) tuples.
+
+    Deleted entries (returned by XCLAIM as nil) are skipped.
+    """
+    if messages is None:
+        return []
+    return [(message_id, fields_to_dict(fields))
+            for message_id, fields in filter(None, messages)]
+
+
+def parse_messages_by_stream(streams):
+    """Parses XREAD/XREADGROUP reply into list of
+    (stream, id, fields) tuples.
+
+    ``fields`` is None for entries deleted from stream
+    while being pending.
+    """
+    if streams is None:
+        return []
+    return [(stream, message_id, fields_to_dict(fields))
+            for stream, messages in streams
+            for message_id, fields in messages]
+
+
+def _check_timeout(timeout):
+    if timeout is None:
+        return
+    if not isinstance(timeout, int):
+        raise TypeError("timeout argument must be int")
+    if timeout < 0:
+        raise ValueError("timeout must be greater equal 0")
+
+
+def _read_args(streams, timeout, count, latest_ids):
+    _check_timeout(timeout)
+    if not streams:
+        raise ValueError("No streams specified")
+    if latest_ids is None:
+        latest_ids = [b'$'] * len(streams)
+    if len(streams) != len(latest_ids):
+        raise ValueError(
+            "The streams and latest_ids parameters must be of the "
+            "same length")
+    args = []
+    if count is not None:
+        args += [b'COUNT', count]
+    if timeout is not None:
+        args += [b'BLOCK', timeout]
+    args.append(b'STREAMS')
+    args.extend(streams)
+    args.extend(latest_ids)
+    return args
+
+
+class StreamCommandsMixin:
+    """Stream commands mixin.
+
+    For commands details see: http://redis.io/commands#stream
+    """
+
+    def xadd(self, stream, fields, message_id=b'*', max_len=None,
+             exact_len=False):
+        """Add a message to stream.
+
+        :raises ValueError: if fields is empty
+        """
+        if not fields:
+            raise ValueError("fields must not be empty")
+        args = []
+        if max_len is not None:
+            args += [b'MAXLEN']
+            if not exact_len:
+                args.append(b'~')
+            args.append(max_len)
+        args.append(message_id)
+        for item in fields.items():
+            args.extend(item)
+        return self.execute(b'XADD', stream, *args)
+
+    def xlen(self, stream):
+        """Returns the number of entries inside a stream."""
+        return self.execute(b'XLEN', stream)
+
+    def xdel(self, stream, id, *ids):
+        """Removes the specified entries from a stream."""
+        return self.execute(b'XDEL', stream, id, *ids)
+
+    def xtrim(self, stream, max_len, exact_len=False):
+        """Trims the stream to a given number of items."""
+        args = [b'MAXLEN']
+        if not exact_len:
+            args.append(b'~')
+        args.append(max_len)
+        return self.execute(b'XTRIM', stream, *args)
+
+    def xrange(self, stream, start='-', stop='+', count=None, *,
+               encoding=_NOTSET):
+        """Retrieve messages from a stream.
+
+        Returns list of (id, fields) tuples.
+        """
+        args = [start, stop]
+        if count is not None:
+            args += [b'COUNT', count]
+        fut = self.execute(b'XRANGE', stream, *args, encoding=encoding)
+        return wait_convert(fut, parse_messages)
+
+    def xrevrange(self, stream, start='+', stop='-', count=None, *,
+                  encoding=_NOTSET):
+        """Retrieve messages from a stream in reverse order.
+
+        Returns list of (id, fields) tuples.
+        """
+        args = [start, stop]
+        if count is not None:
+            args += [b'COUNT', count]
+        fut = self.execute(b'XREVRANGE', stream, *args, encoding=encoding)
+        return wait_convert(fut, parse_messages)
+
+    def xread(self, streams, timeout=0, count=None, latest_ids=None, *,
+              encoding=_NOTSET):
+        """Read messages from one or more streams, blocking
+        up to ``timeout`` milliseconds (forever if 0,
+        not blocking at all if None).
+
+        Messages newer than ``latest_ids`` (new messages by default)
+        are returned as list of (stream, id, fields) tuples.
+
+        :raises TypeError: if timeout is not int
+        :raises ValueError: if timeout is less then 0
+        """
+        args = _read_args(streams, timeout, count, latest_ids)
+        fut = self.execute(b'XREAD', *args, encoding=encoding)
+        return wait_convert(fut, parse_messages_by_stream)
+
+    def xread_group(self, group_name, consumer_name, streams, timeout=0,
+                    count=None, latest_ids=None, no_ack=False, *,
+                    encoding=_NOTSET):
+        """Read messages from one or more streams on behalf
+        of consumer group member.
+
+        ``latest_ids`` default to ``>`` -- messages never delivered
+        to other consumers; any other id reads consumer's
+        pending messages history.
+        Returns list of (stream, id, fields) tuples.
+
+        :raises TypeError: if timeout is not int
+        :raises ValueError: if timeout is less then 0
+        """
+        if latest_ids is None:
+            latest_ids = [b'>'] * len(streams)
+        args = _read_args(streams, timeout, count, latest_ids)
+        if no_ack:
+            args.insert(0, b'NOACK')
+        fut = self.execute(b'XREADGROUP', b'GROUP', group_name,
+                           consumer_name, *args, encoding=encoding)
+        return wait_convert(fut, parse_messages_by_stream)
+
+    def xgroup_create(self, stream, group_name, latest_id='$',
+                      mkstream=False):
+        """Create a consumer group."""
+        args = [b'CREATE', stream, group_name, latest_id]
+        if mkstream:
+            args.append(b'MKSTREAM')
+        fut = self.execute(b'XGROUP', *args)
+        return wait_ok(fut)
+
+    def xgroup_setid(self, stream, group_name, latest_id='$'):
+        """Set the latest ID for a consumer group."""
+        fut = self.execute(b'XGROUP', b'SETID', stream, group_name,
+                           latest_id)
+        return wait_ok(fut)
+
+    def xgroup_destroy(self, stream, group_name):
+        """Delete a consumer group."""
+        return self.execute(b'XGROUP', b'DESTROY', stream, group_name)
+
+    def xgroup_delconsumer(self, stream, group_name, consumer_name):
+        """Delete a specific consumer from a group."""
+        return self.execute(b'XGROUP', b'DELCONSUMER', stream, group_name,
+                            consumer_name)
+
+    def xack(self, stream, group_name, id, *ids):
+        """Acknowledge one or more messages of consumer group."""
+        return self.execute(b'XACK', stream, group_name, id, *ids)
+
+    def xpending(self, stream, group_name, start=None, stop=None,
+                 count=None, consumer=None, *, encoding=_NOTSET):
+        """Get information about pending messages of consumer group.
+
+        Without ``start``, ``stop`` and ``count`` returns summary:
+        [count, min id, max id, [[consumer, count], ...]];
+        otherwise list of [id, consumer, idle time, deliveries count].
+        """
+        args = []
+        if (start, stop, count) != (None, None, None):
+            if None in (start, stop, count):
+                raise ValueError(
+                    "start, stop and count must be specified together")
+            args += [start, stop, count]
+            if consumer is not None:
+                args.append(consumer)
+        return self.execute(b'XPENDING', stream, group_name, *args,
+                            encoding=encoding)
+
+    def xclaim(self, stream, group_name, consumer_name, min_idle_time,
+               id, *ids, encoding=_NOTSET):
+        """Claim pending messages idle for at least ``min_idle_time``
+        milliseconds.
+
+        Returns list of claimed (id, fields) tuples.
+        """
+        fut = self.execute(b'XCLAIM', stream, group_name, consumer_name,
+                           min_idle_time, id, *ids, encoding=encoding)
+        return wait_convert(fut, parse_messages)
+
+    def ixread_group(self, stream, group_name, consumer_name, *,
+                     count=100, timeout=1000, ack_batch=100,
+                     auto_ack=True, claim_min_idle=None,
+                     encoding=_NOTSET, loop=None):
+        """Consume stream messages as consumer group member using async for.
+
+        See :class:`StreamGroupConsumer` for details.
+
+        Usage example:
+
+        >>> async for message_id, fields in redis.ixread_group(
+        ...         'jobs', 'workers', 'worker:1'):
+        ...     await process(fields)
+        """
+        return StreamGroupConsumer(self, stream, group_name, consumer_name,
+                                   count=count, timeout=timeout,
+                                   ack_batch=ack_batch, auto_ack=auto_ack,
+                                   claim_min_idle=claim_min_idle,
+                                   encoding=encoding, loop=loop)
+
+
+class StreamGroupConsumer:
+    """Async iterator reading stream as a member of consumer group.
+
+    Yields ``(message_id, fields)`` tuples.  Entries left in consumer's
+    pending entries list by previous run are replayed first (entries
+    deleted from stream since then are acknowledged without being
+    yielded).  New entries are read with XREADGROUP by ``count``,
+    the next XREADGROUP (without BLOCK) is sent as soon as a batch
+    arrives.  Once stream is drained entries of other consumers idle
+    for at least ``claim_min_idle`` ms are taken over with XCLAIM
+    (if ``claim_min_idle`` is set), otherwise XREADGROUP blocks
+    for up to ``timeout`` ms.
+
+    With ``auto_ack`` entry is acknowledged once the next one is
+    requested or consumer is closed, otherwise :meth:`ack` must be
+    called.  XACK is sent for ``ack_batch`` ids at once and before
+    every blocking read.
+
+    Blocking XREADGROUP occupies a connection, so pool is preferred.
+    """
+
+    def __init__(self, redis, stream, group_name, consumer_name, *,
+                 count=100, timeout=1000, ack_batch=100, auto_ack=True,
+                 claim_min_idle=None, encoding=_NOTSET, loop=None):
+        if loop is None:
+            loop = asyncio.get_event_loop()
+        assert count > 0, ("Invalid count", count)
+        assert ack_batch > 0, ("Invalid ack_batch", ack_batch)
+        _check_timeout(timeout)
+        self._redis = redis
+        self._stream = stream
+        self._group = group_name
+        self._consumer = consumer_name
+        self._count = count
+        self._timeout = timeout
+        self._ack_batch = ack_batch
+        self._auto_ack = auto_ack
+        self._claim_min_idle = claim_min_idle
+        self._encoding = encoding
+        self._loop = loop
+        self._buffer = deque()
+        self._acks = []
+        self._last_id = None
+        self._history_id = b'0'
+        self._prefetch = None
+        self._closed = False
+
+    def __repr__(self):
+        return '<StreamGroupConsumer stream:{!r} group:{!r} consumer:{!r}>'\
+            .format(self._stream, self._group, self._consumer)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if self._last_id is not None:
+            self.ack(self._last_id)
+            self._last_id = None
+        if len(self._acks) >= self._ack_batch:
+            await self.flush_acks()
+        while not self._buffer:
+            if self._closed:
+                raise StopAsyncIteration    # noqa
+            await self._fill()
+        message_id, fields = self._buffer.popleft()
+        if self._auto_ack:
+            self._last_id = message_id
+        return message_id, fields
+
+    def ack(self, message_id):
+        """Schedule message acknowledgement."""
+        self._acks.append(message_id)
+
+    async def flush_acks(self):
+        """Send scheduled acknowledgements."""
+        if self._acks:
+            ids, self._acks = self._acks, []
+            await self._redis.xack(self._stream, self._group, *ids)
+
+    async def close(self):
+        """Stop iteration and XACK scheduled ids.
+
+        With ``auto_ack`` the last yielded entry is acknowledged too.
+        Entries read but not yet yielded stay in pending entries list;
+        they are replayed after restart or claimed by other consumers.
+        """
+        self._closed = True
+        if self._prefetch is not None:
+            self._prefetch.cancel()
+            self._prefetch = None
+        self._buffer.clear()
+        if self._last_id is not None:
+            self.ack(self._last_id)
+            self._last_id = None
+        await self.flush_acks()
+
+    # internal methods
+
+    async def _fill(self):
+        batch = []
+        if self._prefetch is not None:
+            fut, self._prefetch = self._prefetch, None
+            batch = await fut
+        if not batch:
+            await self.flush_acks()
+            batch = await self._claim()
+        if not batch:
+            batch = await self._read(self._timeout)
+        self._buffer.extend(batch)
+        if batch and not self._closed:
+            self._prefetch = asyncio.ensure_future(self._read(None),
+                                                   loop=self._loop)
+
+    async def _read(self, timeout):
+        if self._history_id is not None:
+            res = await self._xread_group(None, self._history_id)
+            if res:
+                self._history_id = res[-1][0]
+                # entries deleted from stream are just acknowledged
+                for message_id, fields in res:
+                    if fields is None:
+                        self.ack(message_id)
+                return [msg for msg in res if msg[1] is not None]
+            self._history_id = None
+        return await self._xread_group(timeout, b'>')
+
+    async def _xread_group(self, timeout, latest_id):
+        res = await self._redis.xread_group(
+            self._group, self._consumer, [self._stream],
+            timeout=timeout, count=self._count, latest_ids=[latest_id],
+            encoding=self._encoding)
+        return [(message_id, fields) for _, message_id, fields in res]
+
+    async def _claim(self):
+        if self._claim_min_idle is None or self._history_id is not None:
+            return []
+        pending = await self._redis.xpending(
+            self._stream, self._group, '-', '+', self._count,
+            encoding=None)
+        consumer = _converters[type(self._consumer)](self._consumer)
+        ids = [message_id for message_id, owner, idle, _ in pending
+               if owner != consumer and idle >= self._claim_min_idle]
+        if not ids:
+            return []
+        return await self._redis.xclaim(
+            self._stream, self._group, self._consumer,
+            self._claim_min_idle, *ids, encoding=self._encoding)
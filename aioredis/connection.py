@@ -36,11 +36,22 @@ __all__ = ['create_connection', 'RedisConnection']
 
 MAX_CHUNK_SIZE = 65536
 
+_UNSUBSCRIBE_COMMANDS = (
+    'UNSUBSCRIBE', b'UNSUBSCRIBE',
+    'PUNSUBSCRIBE', b'PUNSUBSCRIBE',
+    )
+
 _PUBSUB_COMMANDS = (
     'SUBSCRIBE', b'SUBSCRIBE',
     'PSUBSCRIBE', b'PSUBSCRIBE',
-    'UNSUBSCRIBE', b'UNSUBSCRIBE',
-    'PUNSUBSCRIBE', b'PUNSUBSCRIBE',
+    ) + _UNSUBSCRIBE_COMMANDS
+
+# Commands changing connection state, not allowed in execute_many
+_STATE_COMMANDS = _PUBSUB_COMMANDS + (
+    'SELECT', b'SELECT',
+    'MULTI', b'MULTI',
+    'EXEC', b'EXEC',
+    'DISCARD', b'DISCARD',
     )
 
 
@@ -167,6 +178,19 @@ class RedisConnection(AbcConnection):
         self._in_pubsub = 0
         self._pubsub_channels = coerced_keys_dict()
         self._pubsub_patterns = coerced_keys_dict()
+        # (is_pattern, name) of channels (p)unsubscribe was sent for
+        self._pubsub_leaving = set()
+        # (is_pattern, name) of full channel and future resuming reading
+        self._pubsub_paused = None
+        self._pubsub_handlers = {
+            b'message': self._pubsub_message,
+            b'pmessage': self._pubsub_pmessage,
+            b'subscribe': self._pubsub_subscription,
+            b'unsubscribe': self._pubsub_subscription,
+            b'psubscribe': self._pubsub_psubscription,
+            b'punsubscribe': self._pubsub_psubscription,
+            b'pong': self._pubsub_pong,
+        }
         self._encoding = encoding
 
     def __repr__(self):
@@ -178,7 +202,7 @@ class RedisConnection(AbcConnection):
             "Connection has been closed by server")
         while not self._reader.at_eof():
             try:
-                obj = await self._reader.readobj()
+                objs = await self._reader.readobjs()
             except asyncio.CancelledError:
                 # NOTE: reader can get cancelled from `close()` method only.
                 last_error = RuntimeError('this is unexpected')
@@ -196,22 +220,59 @@ class RedisConnection(AbcConnection):
                 last_error = exc
                 break
             else:
-                if (obj == b'' or obj is None) and self._reader.at_eof():
-                    logger.debug("Connection has been closed by server,"
-                                 " response: %r", obj)
-                    last_error = ConnectionClosedError("Reader at end of file")
+                error = await self._process_objs(objs)
+                if error is not None:
+                    last_error = error
                     break
-
-                if isinstance(obj, MaxClientsError):
-                    last_error = obj
-                    break
-                if self._in_pubsub:
-                    self._process_pubsub(obj)
-                else:
-                    self._process_data(obj)
         self._closing = True
         self._loop.call_soon(self._do_close, last_error)
 
+    async def _process_objs(self, objs):
+        """Processes objects parsed from read buffer.
+
+        Returns error if connection must be closed.
+        """
+        idx, count = 0, len(objs)
+        while idx < count:
+            obj = objs[idx]
+            idx += 1
+            if (obj == b'' or obj is None) and self._reader.at_eof():
+                logger.debug("Connection has been closed by server,"
+                             " response: %r", obj)
+                return ConnectionClosedError("Reader at end of file")
+
+            if isinstance(obj, MaxClientsError):
+                return obj
+            if not self._in_pubsub:
+                self._process_data(obj)
+                continue
+            if obj[0] == b'message' and idx < count:
+                # consecutive messages to same channel are put in bulk
+                chan = obj[1]
+                batch = [obj[2]]
+                while idx < count:
+                    obj = objs[idx]
+                    if type(obj) is not list or obj[0] != b'message' or \
+                            obj[1] != chan:
+                        break
+                    batch.append(obj[2])
+                    idx += 1
+                waiter = self._put_messages(chan, batch)
+                key = (False, chan)
+            else:
+                waiter = self._process_pubsub(obj)
+                key = (obj[0] == b'pmessage', obj[1])
+            if waiter is not None and key not in self._pubsub_leaving:
+                # channel is full, stop reading until it is drained
+                # or unsubscribed
+                resume = self._loop.create_future()
+                self._pubsub_paused = key, resume
+                try:
+                    await asyncio.wait([waiter, resume], loop=self._loop,
+                                       return_when=asyncio.FIRST_COMPLETED)
+                finally:
+                    self._pubsub_paused = None
+
     def _process_data(self, obj):
         """Processes command results."""
         assert len(self._waiters) > 0, (type(obj), obj)
@@ -241,37 +302,72 @@ class RedisConnection(AbcConnection):
                 self._in_transaction.append((encoding, cb))
 
     def _process_pubsub(self, obj, *, process_waiters=True):
-        """Processes pubsub messages."""
-        kind, *args, data = obj
-        if kind in (b'subscribe', b'unsubscribe'):
-            chan, = args
-            if process_waiters and self._in_pubsub and self._waiters:
-                self._process_data(obj)
-            if kind == b'unsubscribe':
-                ch = self._pubsub_channels.pop(chan, None)
-                if ch:
-                    ch.close()
-            self._in_pubsub = data
-        elif kind in (b'psubscribe', b'punsubscribe'):
-            chan, = args
-            if process_waiters and self._in_pubsub and self._waiters:
-                self._process_data(obj)
-            if kind == b'punsubscribe':
-                ch = self._pubsub_patterns.pop(chan, None)
-                if ch:
-                    ch.close()
-            self._in_pubsub = data
-        elif kind == b'message':
-            chan, = args
-            self._pubsub_channels[chan].put_nowait(data)
-        elif kind == b'pmessage':
-            pattern, chan = args
-            self._pubsub_patterns[pattern].put_nowait((chan, data))
-        elif kind == b'pong':
-            if process_waiters and self._in_pubsub and self._waiters:
-                self._process_data(data or b'PONG')
-        else:
+        """Processes pubsub messages.
+
+        Returns future to wait for if channel asks to pause reading.
+        """
+        handler = self._pubsub_handlers.get(obj[0])
+        if handler is None:
             logger.warning("Unknown pubsub message received %r", obj)
+            return
+        return handler(obj, process_waiters)
+
+    def _pubsub_message(self, obj, process_waiters):
+        _, chan, data = obj
+        # NOTE: channel names are always bytes here,
+        #   so coerced_keys_dict conversion is not needed.
+        ch = dict.get(self._pubsub_channels, chan)
+        if ch is None:
+            logger.warning("Message for unknown channel %r", chan)
+            return
+        return ch.put_nowait(data)
+
+    def _pubsub_pmessage(self, obj, process_waiters):
+        _, pattern, chan, data = obj
+        ch = dict.get(self._pubsub_patterns, pattern)
+        if ch is None:
+            logger.warning("Message for unknown pattern %r", pattern)
+            return
+        return ch.put_nowait((chan, data))
+
+    def _pubsub_subscription(self, obj, process_waiters):
+        kind, chan, data = obj
+        if process_waiters and self._in_pubsub and self._waiters:
+            self._process_data(obj)
+        if kind == b'unsubscribe':
+            self._pubsub_leaving.discard((False, chan))
+            ch = self._pubsub_channels.pop(chan, None)
+            if ch:
+                ch.close()
+        self._in_pubsub = data
+
+    def _pubsub_psubscription(self, obj, process_waiters):
+        kind, chan, data = obj
+        if process_waiters and self._in_pubsub and self._waiters:
+            self._process_data(obj)
+        if kind == b'punsubscribe':
+            self._pubsub_leaving.discard((True, chan))
+            ch = self._pubsub_patterns.pop(chan, None)
+            if ch:
+                ch.close()
+        self._in_pubsub = data
+
+    def _pubsub_pong(self, obj, process_waiters):
+        data = obj[-1]
+        if process_waiters and self._in_pubsub and self._waiters:
+            self._process_data(data or b'PONG')
+
+    def _put_messages(self, chan, batch):
+        ch = dict.get(self._pubsub_channels, chan)
+        if ch is None:
+            logger.warning("Messages for unknown channel %r", chan)
+            return
+        if isinstance(ch, Channel):
+            return ch.put_many(batch)
+        waiter = None
+        for data in batch:
+            waiter = ch.put_nowait(data) or waiter
+        return waiter
 
     def execute(self, command, *args, encoding=_NOTSET):
         """Executes redis command and returns Future waiting for the answer.
@@ -315,38 +411,103 @@ class RedisConnection(AbcConnection):
         self._waiters.append((fut, encoding, cb))
         return fut
 
+    def execute_many(self, commands, *, encoding=_NOTSET):
+        """Executes list of redis commands sending them with single write.
+
+        ``commands`` is a list of ``(command, *args)`` tuples;
+        commands changing connection state (pub/sub, SELECT, MULTI, etc)
+        are not allowed.
+        Returns list of Futures waiting for the answers.
+        """
+        if self._reader is None or self._reader.at_eof():
+            msg = self._close_msg or "Connection closed or corrupted"
+            raise ConnectionClosedError(msg)
+        if self._in_pubsub:
+            raise RedisError("Connection in SUBSCRIBE mode")
+        buf = bytearray()
+        checked = set()
+        for command, *args in commands:
+            if command not in checked:
+                if command is None:
+                    raise TypeError("command must not be None")
+                if command.upper().strip() in _STATE_COMMANDS:
+                    raise ValueError(
+                        "Command {!r} is not allowed in execute_many"
+                        .format(command))
+                checked.add(command)
+            if None in args:
+                raise TypeError("args must not contain None")
+            encode_command(command, *args, buf=buf)
+        if encoding is _NOTSET:
+            encoding = self._encoding
+        create_future = self._loop.create_future
+        futs = [create_future() for _ in range(len(commands))]
+        self._waiters.extend((fut, encoding, None) for fut in futs)
+        self._writer.write(buf)
+        return futs
+
     def execute_pubsub(self, command, *channels):
         """Executes redis (p)subscribe/(p)unsubscribe commands.
 
         Returns asyncio.gather coroutine waiting for all channels/patterns
         to receive answers.
         """
-        command = command.upper().strip()
-        assert command in _PUBSUB_COMMANDS, (
-            "Pub/Sub command expected", command)
+        return self.execute_pubsub_many([(command,) + channels])
+
+    def execute_pubsub_many(self, commands):
+        """Executes list of redis (p)subscribe/(p)unsubscribe commands
+        sending them with single write.
+
+        ``commands`` is a list of ``(command, *channels)`` tuples.
+        Returns asyncio.gather coroutine waiting for all channels/patterns
+        of all commands to receive answers.
+        """
         if self._reader is None or self._reader.at_eof():
             raise ConnectionClosedError("Connection closed or corrupted")
-        if None in set(channels):
-            raise TypeError("args must not contain None")
-        if not len(channels):
-            raise TypeError("No channels/patterns supplied")
-        is_pattern = len(command) in (10, 12)
-        mkchannel = partial(Channel, is_pattern=is_pattern, loop=self._loop)
-        channels = [ch if isinstance(ch, AbcChannel) else mkchannel(ch)
-                    for ch in channels]
-        if not all(ch.is_pattern == is_pattern for ch in channels):
-            raise ValueError("Not all channels {} match command {}"
-                             .format(channels, command))
-        cmd = encode_command(command, *(ch.name for ch in channels))
+        buf = bytearray()
+        waiters = []
+        for command, *channels in commands:
+            command = command.upper().strip()
+            assert command in _PUBSUB_COMMANDS, (
+                "Pub/Sub command expected", command)
+            if None in set(channels):
+                raise TypeError("args must not contain None")
+            if not len(channels):
+                raise TypeError("No channels/patterns supplied")
+            is_pattern = len(command) in (10, 12)
+            mkchannel = partial(Channel, is_pattern=is_pattern,
+                                loop=self._loop)
+            channels = [ch if isinstance(ch, AbcChannel) else mkchannel(ch)
+                        for ch in channels]
+            if not all(ch.is_pattern == is_pattern for ch in channels):
+                raise ValueError("Not all channels {} match command {}"
+                                 .format(channels, command))
+            encode_command(command, *(ch.name for ch in channels), buf=buf)
+            if command in _UNSUBSCRIBE_COMMANDS:
+                self._leave_pubsub(is_pattern, channels)
+            waiters.extend(
+                (ch, partial(self._update_pubsub, ch=ch)) for ch in channels)
         res = []
-        for ch in channels:
+        for ch, cb in waiters:
             fut = self._loop.create_future()
             res.append(fut)
-            cb = partial(self._update_pubsub, ch=ch)
             self._waiters.append((fut, None, cb))
-        self._writer.write(cmd)
+        self._writer.write(buf)
         return asyncio.gather(*res, loop=self._loop)
 
+    def _leave_pubsub(self, is_pattern, channels):
+        """Stop pausing reader on channels being unsubscribed.
+
+        Otherwise reply to (P)UNSUBSCRIBE would never be read
+        while reader waits for full channel to be drained.
+        """
+        keys = {(is_pattern, ch.name) for ch in channels}
+        self._pubsub_leaving.update(keys)
+        if self._pubsub_paused is not None:
+            key, resume = self._pubsub_paused
+            if key in keys:
+                _set_result(resume, None)
+
     def close(self):
         """Close connection."""
         self._do_close(ConnectionForcedCloseError())
@@ -8,6 +8,7 @@ __all__ = [
     'MultiExecError',
     'WatchVariableError',
     'ChannelClosedError',
+    'ChannelOverflowError',
     'ConnectionClosedError',
     'ConnectionForcedCloseError',
     'PoolClosedError',
@@ -70,6 +71,11 @@ class ChannelClosedError(RedisError):
     """
 
 
+class ChannelOverflowError(RedisError):
+    """Raised when Pub/Sub channel queue overflowed and messages were dropped.
+    """
+
+
 class ReadOnlyError(RedisError):
     """Raised from slave when read-only mode is enabled"""
 
@@ -0,0 +1,314 @@
+import asyncio
+from collections import namedtuple
+
+from .pubsub import GapMarker, Receiver, _IterHelper, _BatchIterHelper
+from .pubsub import OVERFLOW_DROP_OLDEST
+from .util import _converters
+
+__all__ = [
+    'create_keyspace_listener',
+    'KeyspaceEvent',
+    'KeyspaceListener',
+]
+
+
+KeyspaceEvent = namedtuple('KeyspaceEvent', 'db key event')
+
+# Notification class (``notify-keyspace-events`` flag) of every event
+EVENT_CLASSES = {
+    'del': 'g', 'expire': 'g', 'persist': 'g',
+    'rename_from': 'g', 'rename_to': 'g',
+    'move_from': 'g', 'move_to': 'g',
+    'copy_to': 'g', 'restore': 'g', 'sortstore': 'g',
+    'set': '$', 'setrange': '$', 'append': '$',
+    'incrby': '$', 'incrbyfloat': '$',
+    'lpush': 'l', 'rpush': 'l', 'lpop': 'l', 'rpop': 'l',
+    'linsert': 'l', 'lset': 'l', 'lrem': 'l', 'ltrim': 'l',
+    'hset': 'h', 'hincrby': 'h', 'hincrbyfloat': 'h', 'hdel': 'h',
+    'sadd': 's', 'srem': 's', 'spop': 's',
+    'sinterstore': 's', 'sunionstore': 's', 'sdiffstore': 's',
+    'zadd': 'z', 'zincr': 'z', 'zrem': 'z',
+    'zremrangebyscore': 'z', 'zremrangebyrank': 'z',
+    'zremrangebylex': 'z', 'zinterstore': 'z', 'zunionstore': 'z',
+    'xadd': 't', 'xtrim': 't', 'xdel': 't', 'xsetid': 't',
+    'expired': 'x',
+    'evicted': 'e',
+    'keymiss': 'm',
+    'new': 'n',
+    }
+
+# Classes enabled by 'A' flag
+_ALL_CLASSES = frozenset('g$lshzxet')
+
+
+def notify_flags(events=None, *, keyspace=False, keyevent=False):
+    """Returns ``notify-keyspace-events`` flags required
+    to receive specified events (all events if None).
+    """
+    flags = set()
+    if keyspace:
+        flags.add('K')
+    if keyevent:
+        flags.add('E')
+    if events is None:
+        flags.add('A')
+    else:
+        for event in events:
+            flags.add(EVENT_CLASSES.get(event, 'A'))
+    return ''.join(sorted(flags))
+
+
+def _expand_flags(flags):
+    flags = set(flags)
+    if 'A' in flags:
+        flags.discard('A')
+        flags |= _ALL_CLASSES
+    return flags
+
+
+def _merge_flags(current, required):
+    """Returns merged flags or None if nothing is to be enabled."""
+    current = _expand_flags(current)
+    merged = current | _expand_flags(required)
+    if merged == current:
+        return None
+    if merged >= _ALL_CLASSES:
+        merged = (merged - _ALL_CLASSES) | {'A'}
+    return ''.join(sorted(merged))
+
+
+def _escape_glob(prefix):
+    for char in b'\\*?[]':
+        char = bytes((char,))
+        prefix = prefix.replace(char, b'\\' + char)
+    return prefix
+
+
+async def create_keyspace_listener(redis, *, db=0, prefixes=None,
+                                   events=None, configure=True,
+                                   maxsize=0, overflow=OVERFLOW_DROP_OLDEST,
+                                   loop=None):
+    """Creates listener of keyspace notifications.
+
+    Subscribes to notifications of ``events`` (all if None)
+    for keys starting with any of ``prefixes`` (all keys if None)
+    in database ``db`` (all databases if None).
+    If ``configure`` is True ``notify-keyspace-events`` server option
+    is extended with notification classes of requested events.
+
+    This function is a coroutine.
+    """
+    listener = KeyspaceListener(redis, db=db, prefixes=prefixes,
+                                events=events, maxsize=maxsize,
+                                overflow=overflow, loop=loop)
+    if configure:
+        await listener.configure()
+    await listener.subscribe()
+    return listener
+
+
+class KeyspaceListener:
+    """Keyspace notifications listener yielding
+    parsed :class:`KeyspaceEvent` records.
+
+    The narrowest possible subscriptions are made:
+
+    * if ``prefixes`` are specified ``__keyspace@<db>__:<prefix>*``
+      patterns are subscribed and other events are filtered out
+      on client;
+
+    * otherwise ``__keyevent@<db>__:<event>`` channels are subscribed
+      for each event (single pattern if all events are requested).
+
+    Usage example:
+
+    >>> listener = await aioredis.create_keyspace_listener(
+    ...     redis, prefixes=['user:'], events=['set', 'del', 'expired'])
+    >>> async for events in listener.iter_batches():
+    ...     cache.invalidate(ev.key for ev in events)
+    """
+
+    def __init__(self, redis, *, db=0, prefixes=None, events=None,
+                 maxsize=0, overflow=OVERFLOW_DROP_OLDEST, loop=None):
+        if loop is None:
+            loop = asyncio.get_event_loop()
+        assert db is None or (isinstance(db, int) and db >= 0), (
+            "Invalid db", db)
+        assert events is None or events, "events must not be empty"
+        assert prefixes is None or prefixes, "prefixes must not be empty"
+        self._redis = redis
+        self._db = db
+        self._loop = loop
+        self._events = None
+        if events is not None:
+            self._events = frozenset(
+                _converters[type(ev)](ev) for ev in events)
+        self._prefixes = None
+        if prefixes is not None:
+            self._prefixes = tuple(
+                _converters[type(p)](p) for p in prefixes)
+        self._receiver = Receiver(loop=loop, maxsize=maxsize,
+                                  overflow=overflow)
+        self._filter_events = False
+        self._channels = []
+        self._patterns = []
+        self._init_subscriptions()
+
+    def __repr__(self):
+        return '<KeyspaceListener db:{} prefixes:{!r} events:{!r}>'.format(
+            self._db, self._prefixes,
+            self._events and sorted(self._events))
+
+    @property
+    def channels(self):
+        """List of subscribed channels."""
+        return list(self._channels)
+
+    @property
+    def patterns(self):
+        """List of subscribed patterns."""
+        return list(self._patterns)
+
+    @property
+    def flags(self):
+        """``notify-keyspace-events`` flags required by listener."""
+        events = self._events
+        if events is not None:
+            events = [ev.decode('utf-8') for ev in events]
+        return notify_flags(events,
+                            keyspace=self._prefixes is not None,
+                            keyevent=self._prefixes is None)
+
+    @property
+    def is_active(self):
+        """Returns True if listener has any active subscription."""
+        return self._receiver.is_active
+
+    async def configure(self):
+        """Enable notification classes required by listener,
+        keeping already enabled ones.
+
+        Returns True if server configuration was changed.
+        """
+        res = await self._redis.config_get('notify-keyspace-events')
+        current = res.get('notify-keyspace-events', '')
+        flags = _merge_flags(current, self.flags)
+        if flags is None:
+            return False
+        await self._redis.config_set('notify-keyspace-events', flags)
+        return True
+
+    async def subscribe(self):
+        """Subscribe to notification channels."""
+        receiver = self._receiver
+        if self._channels:
+            await self._redis.subscribe(
+                *map(receiver.channel, self._channels))
+        if self._patterns:
+            await self._redis.psubscribe(
+                *map(receiver.pattern, self._patterns))
+
+    async def stop(self):
+        """Unsubscribe from notification channels and stop listener."""
+        if self._channels:
+            await self._redis.unsubscribe(*self._channels)
+        if self._patterns:
+            await self._redis.punsubscribe(*self._patterns)
+        self._receiver.stop()
+
+    async def get(self, *, encoding=None):
+        """Wait for and return next :class:`KeyspaceEvent`.
+
+        Keys are decoded with ``encoding`` if specified.
+        Returns ``GapMarker`` if events could have been lost
+        and None if listener is stopped.
+        """
+        while True:
+            msg = await self._receiver.get()
+            if msg is None:
+                return
+            ev = self._parse(msg, encoding)
+            if ev is not None:
+                return ev
+
+    async def get_many(self, max_count=None, timeout=None, *,
+                       encoding=None):
+        """Wait for and return list of queued :class:`KeyspaceEvent`.
+
+        See :meth:`aioredis.pubsub.Receiver.get_many`.
+        """
+        end = None
+        if timeout is not None:
+            end = self._loop.time() + timeout
+        while True:
+            msgs = await self._receiver.get_many(max_count, timeout)
+            if not msgs:
+                return []
+            parse = self._parse
+            res = [ev for ev in (parse(msg, encoding) for msg in msgs)
+                   if ev is not None]
+            if res:
+                return res
+            if end is not None:
+                timeout = end - self._loop.time()
+                if timeout <= 0:
+                    return []
+
+    def iter(self, *, encoding=None):
+        """Returns async iterator over events.
+
+        Usage example:
+
+        >>> async for db, key, event in listener.iter():
+        ...     print(db, key, event)
+        """
+        return _IterHelper(self,
+                           is_active=lambda r: r._receiver._running,
+                           encoding=encoding)
+
+    def iter_batches(self, max_count=None, *, encoding=None):
+        """Returns async iterator over lists of queued events."""
+        return _BatchIterHelper(self,
+                                is_active=lambda r: r._receiver._running,
+                                max_count=max_count,
+                                encoding=encoding)
+
+    # internal methods
+
+    def _init_subscriptions(self):
+        db = b'*' if self._db is None else str(self._db).encode('utf-8')
+        if self._prefixes is not None:
+            self._patterns = [
+                b'__keyspace@' + db + b'__:' + _escape_glob(prefix) + b'*'
+                for prefix in self._prefixes]
+            self._filter_events = self._events is not None
+        elif self._events is None:
+            self._patterns = [b'__keyevent@' + db + b'__:*']
+        elif self._db is None:
+            self._patterns = [
+                b'__keyevent@*__:' + _escape_glob(ev)
+                for ev in sorted(self._events)]
+        else:
+            self._channels = [
+                b'__keyevent@' + db + b'__:' + ev
+                for ev in sorted(self._events)]
+
+    def _parse(self, msg, encoding):
+        ch, data = msg
+        if data is GapMarker:
+            return GapMarker
+        if ch.is_pattern:
+            channel, data = data
+        else:
+            channel = ch.name
+        head, _, tail = channel.partition(b':')
+        if head.startswith(b'__keyspace@'):
+            key, event = tail, data
+            if self._filter_events and event not in self._events:
+                return
+        else:
+            key, event = data, tail
+        db = int(head[head.index(b'@') + 1:-2])
+        if encoding is not None:
+            key = key.decode(encoding)
+        return KeyspaceEvent(db, key, event.decode('utf-8'))
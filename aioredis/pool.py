@@ -9,11 +9,28 @@ from .errors import PoolClosedError
 from .abc import AbcPool
 from .locks import Lock
 
+# Commands blocking connection until reply is ready
+_BLOCKING_COMMANDS = (
+    'BLPOP', b'BLPOP',
+    'BRPOP', b'BRPOP',
+    'BRPOPLPUSH', b'BRPOPLPUSH',
+    'BZPOPMIN', b'BZPOPMIN',
+    'BZPOPMAX', b'BZPOPMAX',
+    'WAIT', b'WAIT',
+    )
+
+# Commands blocking connection if called with BLOCK option
+_MAYBE_BLOCKING_COMMANDS = (
+    'XREAD', b'XREAD',
+    'XREADGROUP', b'XREADGROUP',
+    )
+
 
 async def create_pool(address, *, db=None, password=None, ssl=None,
                       encoding=None, minsize=1, maxsize=10,
                       parser=None, loop=None, create_connection_timeout=None,
-                      pool_cls=None, connection_cls=None):
+                      pool_cls=None, connection_cls=None,
+                      blocking_maxsize=None):
     # FIXME: rewrite docstring
     """Creates Redis Pool.
 
@@ -25,6 +42,9 @@ async def create_pool(address, *, db=None, password=None, ssl=None,
 
     All arguments are the same as for create_connection.
 
+    ``blocking_maxsize`` limits number of connections serving
+    blocking commands (same as ``maxsize`` if None).
+
     Returns RedisPool instance or a pool_cls if it is given.
     """
     if pool_cls:
@@ -46,12 +66,15 @@ async def create_pool(address, *, db=None, password=None, ssl=None,
             ssl = ssl or options['ssl']
         # TODO: minsize/maxsize
 
+    kw = {}
+    if blocking_maxsize is not None:
+        kw['blocking_maxsize'] = blocking_maxsize
     pool = cls(address, db, password, encoding,
                minsize=minsize, maxsize=maxsize,
                ssl=ssl, parser=parser,
                create_connection_timeout=create_connection_timeout,
                connection_cls=connection_cls,
-               loop=loop)
+               loop=loop, **kw)
     try:
         await pool._fill_free(override_min=False)
     except Exception as ex:
@@ -62,12 +85,19 @@ async def create_pool(address, *, db=None, password=None, ssl=None,
 
 
 class ConnectionsPool(AbcPool):
-    """Redis connections pool."""
+    """Redis connections pool.
+
+    Blocking commands (BLPOP, BRPOP, BRPOPLPUSH, BZPOPMIN/MAX, WAIT,
+    XREAD/XREADGROUP with BLOCK) are executed in a separate lane
+    of at most ``blocking_maxsize`` exclusively used connections,
+    so they never delay commands sent through shared connections.
+    """
 
     def __init__(self, address, db=None, password=None, encoding=None,
                  *, minsize, maxsize, ssl=None, parser=None,
                  create_connection_timeout=None,
                  connection_cls=None,
+                 blocking_maxsize=None,
                  loop=None):
         assert isinstance(minsize, int) and minsize >= 0, (
             "minsize must be int >= 0", minsize, type(minsize))
@@ -76,6 +106,11 @@ class ConnectionsPool(AbcPool):
             "maxsize must be int > 0", maxsize, type(maxsize))
         assert minsize <= maxsize, (
             "Invalid pool min/max sizes", minsize, maxsize)
+        if blocking_maxsize is None:
+            blocking_maxsize = maxsize
+        assert isinstance(blocking_maxsize, int) and blocking_maxsize > 0, (
+            "blocking_maxsize must be int > 0",
+            blocking_maxsize, type(blocking_maxsize))
         if loop is None:
             loop = asyncio.get_event_loop()
         self._address = address
@@ -95,6 +130,12 @@ class ConnectionsPool(AbcPool):
         self._close_waiter = None
         self._pubsub_conn = None
         self._connection_cls = connection_cls
+        self._blocking_pool = collections.deque(maxlen=blocking_maxsize)
+        self._blocking_used = set()
+        self._blocking_acquiring = 0
+        self._blocking_waiting = 0
+        self._blocking_cond = asyncio.Condition(lock=Lock(loop=loop),
+                                                loop=loop)
 
     def __repr__(self):
         return '<{} [db:{}, size:[{}:{}], free:{}]>'.format(
@@ -121,6 +162,17 @@ class ConnectionsPool(AbcPool):
         """Current number of free connections."""
         return len(self._pool)
 
+    @property
+    def blocking_maxsize(self):
+        """Maximum number of connections serving blocking commands."""
+        return self._blocking_pool.maxlen
+
+    @property
+    def blocking_size(self):
+        """Current number of connections serving blocking commands."""
+        return (len(self._blocking_pool) + len(self._blocking_used) +
+                self._blocking_acquiring)
+
     @property
     def address(self):
         return self._address
@@ -139,6 +191,10 @@ class ConnectionsPool(AbcPool):
             conn = self._pool.popleft()
             conn.close()
             waiters.append(conn.wait_closed())
+        while self._blocking_pool:
+            conn = self._blocking_pool.popleft()
+            conn.close()
+            waiters.append(conn.wait_closed())
         await asyncio.gather(*waiters, loop=self._loop)
 
     async def _do_close(self):
@@ -153,9 +209,19 @@ class ConnectionsPool(AbcPool):
             for conn in self._used:
                 conn.close()
                 waiters.append(conn.wait_closed())
+            while self._blocking_pool:
+                conn = self._blocking_pool.popleft()
+                conn.close()
+                waiters.append(conn.wait_closed())
+            for conn in self._blocking_used:
+                conn.close()
+                waiters.append(conn.wait_closed())
             await asyncio.gather(*waiters, loop=self._loop)
             # TODO: close _pubsub_conn connection
             logger.debug("Closed %d connection(s)", len(waiters))
+        with (await self._blocking_cond):
+            # wake up blocking commands waiting for connection
+            self._blocking_cond.notify_all()
 
     def close(self):
         """Close all free and in-progress connections and mark pool as closed.
@@ -194,7 +260,11 @@ class ConnectionsPool(AbcPool):
         that connection.
         If no connection is found, returns coroutine waiting for
         free connection to execute command.
+        Blocking commands are executed in a separate connections lane.
         """
+        if self._is_blocking(command, args):
+            coro = self._wait_execute_blocking(command, args, kw)
+            return self._check_result(coro, command, args, kw)
         conn, address = self.get_connection(command, args)
         if conn is not None:
             fut = conn.execute(command, *args, **kw)
@@ -211,7 +281,9 @@ class ConnectionsPool(AbcPool):
         (unsubscribing from all channels/patterns will leave connection
          locked for pub/sub use).
 
-        There is no auto-reconnect for this PUB/SUB connection.
+        There is no auto-reconnect for this PUB/SUB connection,
+        see :func:`aioredis.create_subscriber` for one restoring
+        subscriptions.
 
         Returns asyncio.gather coroutine waiting for all channels/patterns
         to receive answers.
@@ -264,6 +336,83 @@ class ConnectionsPool(AbcPool):
         finally:
             self.release(conn)
 
+    def _is_blocking(self, command, args):
+        command = command.upper().strip()
+        if command in _BLOCKING_COMMANDS:
+            return True
+        if command in _MAYBE_BLOCKING_COMMANDS:
+            return b'BLOCK' in args or 'BLOCK' in args
+        return False
+
+    async def _wait_execute_blocking(self, command, args, kw):
+        """Execute blocking command in exclusively used connection."""
+        conn = await self._acquire_blocking()
+        try:
+            return (await conn.execute(command, *args, **kw))
+        finally:
+            self._release_blocking(conn)
+
+    async def _acquire_blocking(self):
+        if self.closed:
+            raise PoolClosedError("Pool is closed")
+        with (await self._blocking_cond):
+            while True:
+                if self.closed:
+                    raise PoolClosedError("Pool is closed")
+                while self._blocking_pool:
+                    conn = self._blocking_pool.popleft()
+                    if conn.closed:
+                        continue
+                    if conn.db != self.db:
+                        conn.close()
+                        continue
+                    self._blocking_used.add(conn)
+                    return conn
+                if self.blocking_size < self.blocking_maxsize:
+                    # reserve slot; connect without holding the lock
+                    self._blocking_acquiring += 1
+                    break
+                self._blocking_waiting += 1
+                try:
+                    await self._blocking_cond.wait()
+                finally:
+                    self._blocking_waiting -= 1
+        try:
+            conn = await self._create_new_connection(self._address)
+        except BaseException:
+            self._blocking_acquiring -= 1
+            # give reserved slot back
+            self._notify_blocking()
+            raise
+        self._blocking_acquiring -= 1
+        if self.closed:
+            conn.close()
+            raise PoolClosedError("Pool is closed")
+        self._blocking_used.add(conn)
+        return conn
+
+    def _release_blocking(self, conn):
+        self._blocking_used.remove(conn)
+        if not conn.closed:
+            if conn._waiters:
+                # blocking command was cancelled (eg: by timeout)
+                logger.debug(
+                    "Connection %r has pending commands, closing it.", conn)
+                conn.close()
+            elif self.closed or conn.db != self.db:
+                conn.close()
+            else:
+                self._blocking_pool.append(conn)
+        self._notify_blocking()
+
+    def _notify_blocking(self):
+        if self._blocking_waiting:
+            asyncio.ensure_future(self._wakeup_blocking(), loop=self._loop)
+
+    async def _wakeup_blocking(self):
+        with (await self._blocking_cond):
+            self._blocking_cond.notify()
+
     async def _wait_execute_pubsub(self, address, command, args, kw):
         if self.closed:
             raise PoolClosedError("Pool is closed")
@@ -4,39 +4,135 @@ import types
 
 from .abc import AbcChannel
 from .util import _converters, _set_result
-from .errors import ChannelClosedError
+from .errors import ChannelClosedError, ChannelOverflowError
 from .log import logger
 
 __all__ = [
     "Channel",
     "EndOfStream",
+    "GapMarker",
     "Receiver",
+    "BroadcastChannel",
+    "Broadcaster",
+    "OVERFLOW_DROP_OLDEST",
+    "OVERFLOW_DROP_NEWEST",
+    "OVERFLOW_PAUSE",
+    "OVERFLOW_RAISE",
 ]
 
 
 # End of pubsub messages stream marker.
 EndOfStream = object()
 
+# Marker of possibly lost pubsub messages (eg: on reconnect).
+GapMarker = object()
 
-class Channel(AbcChannel):
-    """Wrapper around asyncio.Queue."""
+# Policies for messages received when queue is full
+OVERFLOW_DROP_OLDEST = 'drop_oldest'
+OVERFLOW_DROP_NEWEST = 'drop_newest'
+OVERFLOW_PAUSE = 'pause'
+OVERFLOW_RAISE = 'raise'
+
+_OVERFLOW_POLICIES = frozenset((
+    OVERFLOW_DROP_OLDEST, OVERFLOW_DROP_NEWEST,
+    OVERFLOW_PAUSE, OVERFLOW_RAISE,
+    ))
+
+
+class _BoundedQueueMixin:
+    """Messages queue size limit with overflow policy.
+
+    ``maxsize`` of 0 means unbounded queue.
+    On overflow messages are either dropped (oldest or newest one),
+    or connection stops reading until queue is drained (pause),
+    or newest message is dropped and next ``get()``
+    raises ChannelOverflowError (raise).
+    """
+
+    def _init_bounds(self, maxsize, overflow):
+        assert maxsize >= 0, ("maxsize must be >= 0", maxsize)
+        assert overflow in _OVERFLOW_POLICIES, (
+            "Invalid overflow policy", overflow)
+        self._maxsize = maxsize
+        self._overflow = overflow
+        self._dropped = 0
+        self._overflowed = False
+        self._drain_waiter = None
+
+    @property
+    def maxsize(self):
+        """Maximum number of queued messages (0 if unbounded)."""
+        return self._maxsize
+
+    @property
+    def dropped(self):
+        """Number of messages dropped on overflow."""
+        return self._dropped
+
+    def _enqueue(self, data):
+        """Put data into queue applying overflow policy.
+
+        Returns future to wait for before reading more messages
+        if queue is full and overflow policy is OVERFLOW_PAUSE.
+        """
+        queue = self._queue
+        if self._maxsize and queue.qsize() >= self._maxsize:
+            if self._overflow == OVERFLOW_DROP_OLDEST:
+                queue.get_nowait()
+                self._dropped += 1
+            elif self._overflow != OVERFLOW_PAUSE:
+                self._dropped += 1
+                self._overflowed = self._overflow == OVERFLOW_RAISE
+                return
+        queue.put_nowait(data)
+        if self._overflow == OVERFLOW_PAUSE and self._maxsize and \
+                queue.qsize() >= self._maxsize:
+            if self._drain_waiter is None:
+                self._drain_waiter = self._loop.create_future()
+            return self._drain_waiter
+
+    def _check_overflow(self):
+        if self._overflowed:
+            self._overflowed = False
+            raise ChannelOverflowError(
+                "{} messages dropped so far".format(self._dropped))
+
+    def _drained(self, force=False):
+        if self._drain_waiter is None:
+            return
+        if force or self._queue.qsize() < self._maxsize:
+            fut, self._drain_waiter = self._drain_waiter, None
+            _set_result(fut, None, self)
+
+
+class Channel(_BoundedQueueMixin, AbcChannel):
+    """Wrapper around asyncio.Queue.
+
+    Queue size can be limited with ``maxsize``,
+    ``overflow`` sets policy for messages received when queue is full,
+    see OVERFLOW_* constants.
+    """
     # doesn't make much sense with inheritance
     # __slots__ = ('_queue', '_name',
     #              '_closed', '_waiter',
     #              '_is_pattern', '_loop')
 
-    def __init__(self, name, is_pattern, loop=None):
+    def __init__(self, name, is_pattern, loop=None, *,
+                 maxsize=0, overflow=OVERFLOW_DROP_OLDEST):
+        if loop is None:
+            loop = asyncio.get_event_loop()
         self._queue = asyncio.Queue(loop=loop)
         self._name = _converters[type(name)](name)
         self._is_pattern = is_pattern
         self._loop = loop
         self._closed = False
         self._waiter = None
+        self._init_bounds(maxsize, overflow)
 
     def __repr__(self):
-        return "<{} name:{!r}, is_pattern:{}, qsize:{}>".format(
+        return "<{} name:{!r}, is_pattern:{}, qsize:{}, dropped:{}>".format(
             self.__class__.__name__,
-            self._name, self._is_pattern, self._queue.qsize())
+            self._name, self._is_pattern, self._queue.qsize(), self._dropped)
 
     @property
     def name(self):
@@ -65,10 +161,16 @@ class Channel(AbcChannel):
     async def get(self, *, encoding=None, decoder=None):
         """Coroutine that waits for and returns a message.
 
+        Returns ``GapMarker`` if messages could have been lost
+        (eg: subscription was restored after reconnect).
+
         :raises aioredis.ChannelClosedError: If channel is unsubscribed
             and has no messages.
+        :raises aioredis.ChannelOverflowError: If messages were dropped
+            since last call (with OVERFLOW_RAISE policy).
         """
         assert decoder is None or callable(decoder), decoder
+        self._check_overflow()
         if not self.is_active:
             if self._queue.qsize() == 1:
                 msg = self._queue.get_nowait()
@@ -76,6 +178,7 @@ class Channel(AbcChannel):
                 return
             raise ChannelClosedError()
         msg = await self._queue.get()
+        self._drained()
         if msg is None:
             # TODO: maybe we need an explicit marker for "end of stream"
             #       currently, returning None may overlap with
@@ -83,6 +186,8 @@ class Channel(AbcChannel):
             #       so the user would have to check `ch.is_active`
             #       to determine if its EoS or payload
             return
+        if msg is GapMarker:
+            return msg
         if self._is_pattern:
             dest_channel, msg = msg
         if encoding is not None:
@@ -97,6 +202,58 @@ class Channel(AbcChannel):
         """Shortcut to get JSON messages."""
         return (await self.get(encoding=encoding, decoder=json.loads))
 
+    async def get_many(self, max_count=None, timeout=None, *,
+                       encoding=None, decoder=None):
+        """Wait for and return list of queued messages.
+
+        Waits up to ``timeout`` seconds (forever if None) for a message
+        and returns it along with other queued messages,
+        at most ``max_count`` (all if None).
+        Empty list is returned on timeout or if channel got closed.
+
+        :raises aioredis.ChannelClosedError: If channel is unsubscribed
+            and has no messages.
+        """
+        assert decoder is None or callable(decoder), decoder
+        assert max_count is None or max_count > 0, max_count
+        self._check_overflow()
+        if not self.is_active:
+            if self._queue.qsize() == 1:
+                msg = self._queue.get_nowait()
+                assert msg is None, msg
+                return []
+            raise ChannelClosedError()
+        queue = self._queue
+        if queue.empty():
+            if self._waiter is None:
+                self._waiter = self._loop.create_future()
+            await asyncio.wait([self._waiter], timeout=timeout,
+                               loop=self._loop)
+        count = queue.qsize()
+        if self._closed:
+            count -= 1  # leave end of stream marker in queue
+        if max_count is not None:
+            count = min(count, max_count)
+        msgs = [queue.get_nowait() for _ in range(count)]
+        self._drained()
+        if GapMarker in msgs:
+            return [msg if msg is GapMarker else
+                    self._decode_batch([msg], encoding, decoder)[0]
+                    for msg in msgs]
+        return self._decode_batch(msgs, encoding, decoder)
+
+    def _decode_batch(self, msgs, encoding, decoder):
+        if self._is_pattern:
+            dests = [dest for dest, _ in msgs]
+            msgs = [msg for _, msg in msgs]
+        if encoding is not None:
+            msgs = [msg.decode(encoding) for msg in msgs]
+        if decoder is not None:
+            msgs = list(map(decoder, msgs))
+        if self._is_pattern:
+            return list(zip(dests, msgs))
+        return msgs
+
     def iter(self, *, encoding=None, decoder=None):
         """Same as get method but its native coroutine.
 
@@ -110,6 +267,20 @@ class Channel(AbcChannel):
                            encoding=encoding,
                            decoder=decoder)
 
+    def iter_batches(self, max_count=None, *, encoding=None, decoder=None):
+        """Returns async iterator over lists of queued messages.
+
+        Usage example:
+
+        >>> async for msgs in ch.iter_batches():
+        ...     print(len(msgs))
+        """
+        return _BatchIterHelper(self,
+                                is_active=lambda ch: ch.is_active,
+                                max_count=max_count,
+                                encoding=encoding,
+                                decoder=decoder)
+
     async def wait_message(self):
         """Waits for message to become available in channel.
 
@@ -130,10 +301,34 @@ class Channel(AbcChannel):
     # internal methods
 
     def put_nowait(self, data):
-        self._queue.put_nowait(data)
+        # gap marker is never dropped
+        if self._maxsize and data is not GapMarker:
+            waiter = self._enqueue(data)
+        else:
+            waiter = None
+            self._queue.put_nowait(data)
         if self._waiter is not None:
             fut, self._waiter = self._waiter, None
             _set_result(fut, None, self)
+        return waiter
+
+    def put_many(self, items):
+        """Put list of messages into channel.
+
+        Same as put_nowait but waiter is woken up once for all messages.
+        """
+        waiter = None
+        if self._maxsize:
+            for data in items:
+                waiter = self._enqueue(data) or waiter
+        else:
+            put = self._queue.put_nowait
+            for data in items:
+                put(data)
+        if self._waiter is not None:
+            fut, self._waiter = self._waiter, None
+            _set_result(fut, None, self)
+        return waiter
 
     def close(self):
         """Marks channel as inactive.
@@ -142,7 +337,12 @@ class Channel(AbcChannel):
         on `unsubscribe` command.
         """
         if not self._closed:
-            self.put_nowait(None)
+            # end of stream marker is never dropped
+            self._queue.put_nowait(None)
+            if self._waiter is not None:
+                fut, self._waiter = self._waiter, None
+                _set_result(fut, None, self)
+            self._drained(force=True)
         self._closed = True
 
 
@@ -168,7 +368,20 @@ class _IterHelper:
         return msg
 
 
-class Receiver:
+class _BatchIterHelper(_IterHelper):
+
+    __slots__ = ()
+
+    async def __anext__(self):
+        if not self._is_active(self._ch):
+            raise StopAsyncIteration    # noqa
+        msgs = await self._ch.get_many(*self._args, **self._kw)
+        if not msgs:
+            raise StopAsyncIteration    # noqa
+        return msgs
+
+
+class Receiver(_BoundedQueueMixin):
     """Multi-producers, single-consumer Pub/Sub queue.
 
     Can be used in cases where a single consumer task
@@ -198,9 +411,14 @@ class Receiver:
     >>> await redis.punsubscribe('hello')
     >>> mpsc.stop()
     >>> # any message received after stop() will be ignored.
+
+    Queue size can be limited with ``maxsize``,
+    ``overflow`` sets policy for messages received when queue is full,
+    see OVERFLOW_* constants.
     """
 
-    def __init__(self, loop=None):
+    def __init__(self, loop=None, *, maxsize=0,
+                 overflow=OVERFLOW_DROP_OLDEST):
         if loop is None:
             loop = asyncio.get_event_loop()
         self._queue = asyncio.Queue(loop=loop)
@@ -208,10 +426,12 @@ class Receiver:
         self._waiter = None
         self._running = True
         self._loop = loop
+        self._init_bounds(maxsize, overflow)
 
     def __repr__(self):
-        return ('<Receiver is_active:{}, senders:{}, qsize:{}>'
-                .format(self.is_active, len(self._refs), self._queue.qsize()))
+        return ('<Receiver is_active:{}, senders:{}, qsize:{}, dropped:{}>'
+                .format(self.is_active, len(self._refs), self._queue.qsize(),
+                        self._dropped))
 
     def channel(self, name):
         """Create a channel.
@@ -267,18 +487,27 @@ class Receiver:
 
         * or None in case Receiver is not active or has just been stopped.
 
+        Message is ``GapMarker`` if messages could have been lost
+        (eg: subscription was restored after reconnect).
+
         :raises aioredis.ChannelClosedError: If listener is stopped
             and all messages have been received.
+        :raises aioredis.ChannelOverflowError: If messages were dropped
+            since last call (with OVERFLOW_RAISE policy).
         """
         assert decoder is None or callable(decoder), decoder
+        self._check_overflow()
         if not self.is_active:
             if not self._running:   # inactive but running
                 raise ChannelClosedError()
             return
         obj = await self._queue.get()
+        self._drained()
         if obj is EndOfStream:
             return
         ch, msg = obj
+        if msg is GapMarker:
+            return obj
         if ch.is_pattern:
             dest_ch, msg = msg
         if encoding is not None:
@@ -289,6 +518,62 @@ class Receiver:
             return ch, (dest_ch, msg)
         return ch, msg
 
+    async def get_many(self, max_count=None, timeout=None, *,
+                       encoding=None, decoder=None):
+        """Wait for and return list of queued pub/sub messages.
+
+        Waits up to ``timeout`` seconds (forever if None) for a message
+        and returns it along with other queued messages,
+        at most ``max_count`` (all if None).
+        Messages are same tuples as returned by ``get()``.
+        Empty list is returned on timeout or if Receiver is not active
+        or has just been stopped.
+
+        :raises aioredis.ChannelClosedError: If listener is stopped
+            and all messages have been received.
+        """
+        assert decoder is None or callable(decoder), decoder
+        assert max_count is None or max_count > 0, max_count
+        self._check_overflow()
+        if not self.is_active:
+            if not self._running:   # inactive but running
+                raise ChannelClosedError()
+            return []
+        queue = self._queue
+        if queue.empty():
+            if self._waiter is None:
+                self._waiter = self._loop.create_future()
+            await asyncio.wait([self._waiter], timeout=timeout,
+                               loop=self._loop)
+        count = queue.qsize()
+        if not self._running:
+            if count == 1:
+                queue.get_nowait()  # end of stream marker
+                return []
+            count -= 1  # leave end of stream marker in queue
+        if max_count is not None:
+            count = min(count, max_count)
+        objs = [queue.get_nowait() for _ in range(count)]
+        self._drained()
+        if encoding is None and decoder is None:
+            return objs
+        res = []
+        for ch, msg in objs:
+            if msg is GapMarker:
+                res.append((ch, msg))
+                continue
+            if ch.is_pattern:
+                dest_ch, msg = msg
+            if encoding is not None:
+                msg = msg.decode(encoding)
+            if decoder is not None:
+                msg = decoder(msg)
+            if ch.is_pattern:
+                res.append((ch, (dest_ch, msg)))
+            else:
+                res.append((ch, msg))
+        return res
+
     async def wait_message(self):
         """Blocks until new message appear."""
         if not self._queue.empty():
@@ -332,6 +617,21 @@ class Receiver:
                            encoding=encoding,
                            decoder=decoder)
 
+    def iter_batches(self, max_count=None, *, encoding=None, decoder=None):
+        """Returns async iterator over lists of queued messages.
+
+        Usage example:
+
+        >>> async for msgs in mpsc.iter_batches():
+        ...     for ch, msg in msgs:
+        ...         print(ch, msg)
+        """
+        return _BatchIterHelper(self,
+                                is_active=lambda r: r.is_active or r._running,
+                                max_count=max_count,
+                                encoding=encoding,
+                                decoder=decoder)
+
     # internal methods
 
     def _put_nowait(self, data, *, sender):
@@ -340,12 +640,20 @@ class Receiver:
                            " sender: %r, data: %r",
                            sender, data)
             return
-        if data is not EndOfStream:
-            data = (sender, data)
-        self._queue.put_nowait(data)
+        waiter = None
+        if data is EndOfStream:
+            # end of stream marker is never dropped
+            self._queue.put_nowait(data)
+            self._drained(force=True)
+        elif data is GapMarker:
+            # nor is gap marker
+            self._queue.put_nowait((sender, data))
+        else:
+            waiter = self._enqueue((sender, data))
         if self._waiter is not None:
             fut, self._waiter = self._waiter, None
             _set_result(fut, None, self)
+        return waiter
 
     def _close(self, sender):
         self._refs.pop((sender.name, sender.is_pattern))
@@ -387,7 +695,7 @@ class _Sender(AbcChannel):
         raise RuntimeError("MPSC channel does not allow direct get() calls")
 
     def put_nowait(self, data):
-        self._receiver._put_nowait(data, sender=self)
+        return self._receiver._put_nowait(data, sender=self)
 
     def close(self):
         # TODO: close() is exclusive so we can not share same _Sender
@@ -397,3 +705,157 @@ class _Sender(AbcChannel):
             return
         self._closed = True
         self._receiver._close(self)
+
+
+class BroadcastChannel(AbcChannel):
+    """Pub/Sub channel fanning out messages to local subscribers.
+
+    Every message received by this channel is put into queues
+    of all channels created with :meth:`subscribe`.
+    Does not allow direct ``.get()`` calls.
+    """
+
+    def __init__(self, name, is_pattern, loop=None):
+        self._name = _converters[type(name)](name)
+        self._is_pattern = is_pattern
+        self._loop = loop
+        self._closed = False
+        self._subscribers = []
+
+    def __repr__(self):
+        return "<{} name:{!r}, is_pattern:{}, subscribers:{}>".format(
+            self.__class__.__name__,
+            self._name, self._is_pattern, len(self._subscribers))
+
+    @property
+    def name(self):
+        """Encoded channel name or pattern."""
+        return self._name
+
+    @property
+    def is_pattern(self):
+        """Set to True if channel is subscribed to pattern."""
+        return self._is_pattern
+
+    @property
+    def is_active(self):
+        return not self._closed
+
+    @property
+    def subscribers(self):
+        """Number of local subscribers."""
+        return len(self._subscribers)
+
+    def subscribe(self, *, maxsize=0, overflow=OVERFLOW_DROP_OLDEST):
+        """Create new local subscriber :class:`Channel`."""
+        assert not self._closed, "Channel is closed"
+        ch = Channel(self._name, self._is_pattern, loop=self._loop,
+                     maxsize=maxsize, overflow=overflow)
+        self._subscribers.append(ch)
+        return ch
+
+    def unsubscribe(self, ch):
+        """Close local subscriber channel.
+
+        Returns True if it was the last subscriber.
+        """
+        if ch in self._subscribers:
+            self._subscribers.remove(ch)
+            ch.close()
+        return not self._subscribers
+
+    async def get(self, *, encoding=None, decoder=None):
+        raise RuntimeError(
+            "Broadcast channel does not allow direct get() calls")
+
+    def put_nowait(self, data):
+        pause = None
+        for ch in self._subscribers:
+            waiter = ch.put_nowait(data)
+            if waiter is not None and pause is None:
+                pause = waiter
+        return pause
+
+    def close(self):
+        self._closed = True
+        subscribers, self._subscribers = self._subscribers, []
+        for ch in subscribers:
+            ch.close()
+
+
+class Broadcaster:
+    """Shares channel/pattern subscriptions between local consumers.
+
+    Single (P)SUBSCRIBE command is sent for the first consumer
+    of channel/pattern and (P)UNSUBSCRIBE once the last one leaves.
+
+    Example use case:
+
+    >>> broadcaster = Broadcaster(redis)
+    >>> ch = await broadcaster.subscribe('chan:1')
+    >>> async for msg in ch.iter():
+    ...     await websocket.send(msg)
+    >>> await broadcaster.unsubscribe(ch)
+    """
+
+    def __init__(self, redis, *, loop=None):
+        if loop is None:
+            loop = asyncio.get_event_loop()
+        self._redis = redis
+        self._loop = loop
+        self._refs = {}
+
+    def __repr__(self):
+        return '<Broadcaster channels:{}>'.format(len(self._refs))
+
+    def subscribe(self, channel, *, maxsize=0,
+                  overflow=OVERFLOW_DROP_OLDEST):
+        """Subscribe new local consumer to channel.
+
+        Returns :class:`Channel` receiving channel messages.
+        """
+        return self._subscribe(channel, False, maxsize, overflow)
+
+    def psubscribe(self, pattern, *, maxsize=0,
+                   overflow=OVERFLOW_DROP_OLDEST):
+        """Subscribe new local consumer to pattern.
+
+        Returns :class:`Channel` receiving pattern messages.
+        """
+        return self._subscribe(pattern, True, maxsize, overflow)
+
+    async def unsubscribe(self, ch):
+        """Close consumer's channel and unsubscribe
+        if it was the last consumer.
+        """
+        key = ch.name, ch.is_pattern
+        broadcast = self._refs.get(key)
+        if broadcast is None or not broadcast.unsubscribe(ch):
+            return
+        del self._refs[key]
+        if not broadcast.is_active:
+            return
+        if broadcast.is_pattern:
+            await self._redis.punsubscribe(broadcast.name)
+        else:
+            await self._redis.unsubscribe(broadcast.name)
+
+    async def _subscribe(self, name, is_pattern, maxsize, overflow):
+        key = _converters[type(name)](name), is_pattern
+        broadcast = self._refs.get(key)
+        if broadcast is not None and broadcast.is_active:
+            return broadcast.subscribe(maxsize=maxsize, overflow=overflow)
+        broadcast = BroadcastChannel(name, is_pattern, loop=self._loop)
+        self._refs[key] = broadcast
+        ch = broadcast.subscribe(maxsize=maxsize, overflow=overflow)
+        try:
+            if is_pattern:
+                await self._redis.psubscribe(broadcast)
+            else:
+                await self._redis.subscribe(broadcast)
+        except Exception:
+            if self._refs.get(key) is broadcast:
+                del self._refs[key]
+            broadcast.close()
+            raise
+        return ch
@@ -0,0 +1,311 @@
+import asyncio
+import hashlib
+import uuid
+from collections import deque
+
+from .errors import ReplyError
+from .log import logger
+from .util import _converters
+
+__all__ = [
+    'QueueConsumer',
+    ]
+
+
+# KEYS: queue, processing list, alive key, consumers set
+# ARGV: count, visibility timeout (ms), consumer name
+_FETCH_SCRIPT = b"""\
+local items = {}
+for i = 1, tonumber(ARGV[1]) do
+    local item = redis.call('RPOPLPUSH', KEYS[1], KEYS[2])
+    if not item then
+        break
+    end
+    items[i] = item
+end
+redis.call('PSETEX', KEYS[3], ARGV[2], '1')
+redis.call('SADD', KEYS[4], ARGV[3])
+return items
+"""
+
+# KEYS: processing list, alive key
+# ARGV: visibility timeout (ms), items...
+_ACK_SCRIPT = b"""\
+local removed = 0
+for i = 2, #ARGV do
+    removed = removed + redis.call('LREM', KEYS[1], -1, ARGV[i])
+end
+redis.call('PSETEX', KEYS[2], ARGV[1], '1')
+return removed
+"""
+
+# KEYS: queue, processing list, alive key, consumers set
+# ARGV: consumer name
+_REQUEUE_SCRIPT = b"""\
+if redis.call('EXISTS', KEYS[3]) == 1 then
+    return -1
+end
+local count = redis.call('LLEN', KEYS[2])
+-- oldest items are pushed last to be popped first
+for i = 0, count - 1, 1000 do
+    local items = redis.call('LRANGE', KEYS[2], i, i + 999)
+    redis.call('RPUSH', KEYS[1], unpack(items))
+end
+redis.call('DEL', KEYS[2])
+redis.call('SREM', KEYS[4], ARGV[1])
+return count
+"""
+
+# KEYS: processing list, alive key, consumers set
+# ARGV: consumer name
+_LEAVE_SCRIPT = b"""\
+if redis.call('LLEN', KEYS[1]) > 0 then
+    return 0
+end
+redis.call('DEL', KEYS[2])
+return redis.call('SREM', KEYS[3], ARGV[1])
+"""
+
+
+class _Script:
+
+    __slots__ = ('_script', '_digest')
+
+    def __init__(self, script):
+        self._script = script
+        self._digest = hashlib.sha1(script).hexdigest()
+
+    async def __call__(self, redis, keys, args):
+        try:
+            return (await redis.execute(
+                b'EVALSHA', self._digest, len(keys), *keys, *args,
+                encoding=None))
+        except ReplyError as err:
+            if not err.args[0].startswith('NOSCRIPT'):
+                raise
+        return (await redis.execute(
+            b'EVAL', self._script, len(keys), *keys, *args,
+            encoding=None))
+
+
+_fetch = _Script(_FETCH_SCRIPT)
+_ack = _Script(_ACK_SCRIPT)
+_requeue = _Script(_REQUEUE_SCRIPT)
+_leave = _Script(_LEAVE_SCRIPT)
+
+
+class QueueConsumer:
+    """Reliable work queue consumer over Redis list.
+
+    Items are moved from the tail of ``queue`` list into consumer's
+    own processing list (``<queue>:processing:<consumer_name>``)
+    by a Lua script doing up to ``prefetch`` RPOPLPUSH calls;
+    the following batch is moved in background while current one
+    is processed.  On empty queue BRPOPLPUSH waits up to ``timeout``
+    seconds for a new item.  Items left in processing list by previous
+    run of the same consumer are yielded first.
+
+    Item is removed from processing list once acknowledged: with
+    ``auto_ack`` when the next item is requested or consumer is closed,
+    otherwise by :meth:`ack`.  LREM calls are sent by ``ack_batch``
+    items and before waiting on empty queue.
+
+    Consumer registers itself in ``<queue>:consumers`` set and keeps
+    ``<queue>:alive:<consumer_name>`` key set for ``visibility_timeout``
+    milliseconds, refreshing it in background.  Once the key expires
+    other consumers push items of its processing list back to queue
+    (see :meth:`requeue_dead`).
+
+    For Redis Cluster use hash tag in queue name (eg: ``{jobs}``).
+
+    Usage example:
+
+    >>> consumer = QueueConsumer(redis, 'jobs', 'worker:1')
+    >>> async for item in consumer:
+    ...     await process(item)
+    """
+
+    def __init__(self, redis, queue, consumer_name=None, *, prefetch=100,
+                 ack_batch=100, timeout=1, visibility_timeout=30000,
+                 auto_ack=True, loop=None):
+        if loop is None:
+            loop = asyncio.get_event_loop()
+        assert prefetch > 0, ("Invalid prefetch", prefetch)
+        assert ack_batch > 0, ("Invalid ack_batch", ack_batch)
+        if not isinstance(timeout, int):
+            raise TypeError("timeout argument must be int")
+        if timeout <= 0:
+            raise ValueError("timeout must be greater than 0")
+        assert visibility_timeout > 0, (
+            "Invalid visibility_timeout", visibility_timeout)
+        if consumer_name is None:
+            consumer_name = uuid.uuid4().hex
+        queue = _converters[type(queue)](queue)
+        self._consumer = _converters[type(consumer_name)](consumer_name)
+        self._redis = redis
+        self._queue = queue
+        self._processing = queue + b':processing:' + self._consumer
+        self._alive = queue + b':alive:' + self._consumer
+        self._consumers = queue + b':consumers'
+        self._prefetch_count = prefetch
+        self._ack_batch = ack_batch
+        self._timeout = timeout
+        self._visibility_timeout = visibility_timeout
+        self._auto_ack = auto_ack
+        self._loop = loop
+        self._buffer = deque()
+        self._acks = []
+        self._last_item = None
+        self._recovered = False
+        self._last_requeue = None
+        self._prefetch = None
+        self._heartbeat = None
+        self._closed = False
+
+    def __repr__(self):
+        return '<QueueConsumer queue:{!r} consumer:{!r}>'.format(
+            self._queue, self._consumer)
+
+    @property
+    def processing(self):
+        """Name of consumer's processing list."""
+        return self._processing
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if self._last_item is not None:
+            self.ack(self._last_item)
+            self._last_item = None
+        if len(self._acks) >= self._ack_batch:
+            await self.flush_acks()
+        while not self._buffer:
+            if self._closed:
+                raise StopAsyncIteration    # noqa
+            await self._fill()
+        item = self._buffer.popleft()
+        if self._auto_ack:
+            self._last_item = item
+        return item
+
+    def ack(self, item):
+        """Schedule item acknowledgement."""
+        self._acks.append(item)
+
+    async def flush_acks(self):
+        """Send scheduled acknowledgements."""
+        if self._acks:
+            items, self._acks = self._acks, []
+            await _ack(self._redis, [self._processing, self._alive],
+                       [self._visibility_timeout] + items)
+
+    async def requeue_dead(self):
+        """Move items of dead consumers back to queue.
+
+        Returns number of requeued items.
+        """
+        self._last_requeue = self._loop.time()
+        consumers = await self._redis.execute(
+            b'SMEMBERS', self._consumers, encoding=None)
+        res = 0
+        for consumer in consumers:
+            if consumer == self._consumer:
+                continue
+            count = await _requeue(
+                self._redis,
+                [self._queue, self._queue + b':processing:' + consumer,
+                 self._queue + b':alive:' + consumer, self._consumers],
+                [consumer])
+            if count > 0:
+                res += count
+        return res
+
+    async def close(self):
+        """Stop iteration and remove acknowledged items.
+
+        With ``auto_ack`` the last yielded item is acknowledged too.
+        Consumer leaves ``<queue>:consumers`` set if its processing list
+        is empty; otherwise remaining items are yielded again after
+        restart or requeued by other consumers once alive key expires.
+        """
+        self._closed = True
+        if self._heartbeat is not None:
+            self._heartbeat.cancel()
+            self._heartbeat = None
+        if self._prefetch is not None:
+            self._prefetch.cancel()
+            self._prefetch = None
+        self._buffer.clear()
+        if self._last_item is not None:
+            self.ack(self._last_item)
+            self._last_item = None
+        await self.flush_acks()
+        await _leave(self._redis,
+                     [self._processing, self._alive, self._consumers],
+                     [self._consumer])
+
+    # internal methods
+
+    async def _fill(self):
+        if self._heartbeat is None:
+            self._heartbeat = asyncio.ensure_future(self._keep_alive(),
+                                                    loop=self._loop)
+        batch = []
+        if self._prefetch is not None:
+            fut, self._prefetch = self._prefetch, None
+            batch = await fut
+        if not batch:
+            await self.flush_acks()
+            await self._maybe_requeue()
+            batch = await self._fetch()
+        if not batch:
+            batch = await self._wait_item()
+        self._buffer.extend(batch)
+        if batch and not self._closed:
+            self._prefetch = asyncio.ensure_future(self._fetch(),
+                                                   loop=self._loop)
+
+    async def _fetch(self):
+        if not self._recovered:
+            self._recovered = True
+            items = await self._redis.execute(
+                b'LRANGE', self._processing, 0, -1, encoding=None)
+            if items:
+                items.reverse()     # oldest first
+                return items
+        return (await _fetch(
+            self._redis,
+            [self._queue, self._processing, self._alive, self._consumers],
+            [self._prefetch_count, self._visibility_timeout,
+             self._consumer]))
+
+    async def _wait_item(self):
+        await self._redis.execute(
+            b'PSETEX', self._alive,
+            self._visibility_timeout + self._timeout * 1000, b'1')
+        item = await self._redis.execute(
+            b'BRPOPLPUSH', self._queue, self._processing, self._timeout,
+            encoding=None)
+        if item is None:
+            return []
+        return [item]
+
+    async def _keep_alive(self):
+        interval = self._visibility_timeout / 3000
+        while True:
+            await asyncio.sleep(interval, loop=self._loop)
+            try:
+                await self._redis.execute(
+                    b'PSETEX', self._alive, self._visibility_timeout, b'1')
+            except asyncio.CancelledError:
+                raise
+            except Exception as err:
+                logger.warning("Queue consumer heartbeat failed: %r", err)
+
+    async def _maybe_requeue(self):
+        if self._last_requeue is not None:
+            elapsed = (self._loop.time() - self._last_requeue) * 1000
+            if elapsed < self._visibility_timeout:
+                return
+        await self.requeue_dead()
@@ -1,9 +1,22 @@
 from .commands import RedisSentinel, create_sentinel
-from .pool import SentinelPool, create_sentinel_pool
+from .pool import (
+    SentinelPool,
+    create_sentinel_pool,
+    SLAVE_FIRST,
+    SLAVE_RANDOM,
+    SLAVE_ROUND_ROBIN,
+    SLAVE_LOWEST_LATENCY,
+    SLAVE_LOWEST_LAG,
+)
 
 __all__ = [
     "create_sentinel",
     "create_sentinel_pool",
     "RedisSentinel",
     "SentinelPool",
+    "SLAVE_FIRST",
+    "SLAVE_RANDOM",
+    "SLAVE_ROUND_ROBIN",
+    "SLAVE_LOWEST_LATENCY",
+    "SLAVE_LOWEST_LAG",
 ]
@@ -2,12 +2,14 @@ import asyncio
 
 from ..util import wait_ok, wait_convert
 from ..commands import Redis
-from .pool import create_sentinel_pool
+from .pool import create_sentinel_pool, SLAVE_FIRST
 
 
 async def create_sentinel(sentinels, *, db=None, password=None,
                           encoding=None, minsize=1, maxsize=10,
-                          ssl=None, timeout=0.2, loop=None):
+                          ssl=None, timeout=0.2, quorum=1, discover_ttl=1.0,
+                          slave_selection=SLAVE_FIRST, spread_slaves=False,
+                          latency_probe_interval=5.0, loop=None):
     """Creates Redis Sentinel client.
 
     `sentinels` is a list of sentinel nodes.
@@ -24,6 +26,12 @@ async def create_sentinel(sentinels, *, db=None, password=None,
                                       maxsize=maxsize,
                                       ssl=ssl,
                                       timeout=timeout,
+                                      quorum=quorum,
+                                      discover_ttl=discover_ttl,
+                                      slave_selection=slave_selection,
+                                      spread_slaves=spread_slaves,
+                                      latency_probe_interval=(
+                                          latency_probe_interval),
                                       loop=loop)
     return RedisSentinel(pool)
 
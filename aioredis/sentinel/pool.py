@@ -1,5 +1,6 @@
 import asyncio
 import contextlib
+import random
 
 from concurrent.futures import ALL_COMPLETED
 from async_timeout import timeout as async_timeout
@@ -22,10 +23,26 @@ _NON_DISCOVERED = object()
 
 _logger = sentinel_logger.getChild('monitor')
 
+# Slave selection strategies
+SLAVE_FIRST = 'first'
+SLAVE_RANDOM = 'random'
+SLAVE_ROUND_ROBIN = 'round_robin'
+SLAVE_LOWEST_LATENCY = 'lowest_latency'
+SLAVE_LOWEST_LAG = 'lowest_lag'
+
+_SLAVE_SELECTIONS = frozenset((
+    SLAVE_FIRST, SLAVE_RANDOM, SLAVE_ROUND_ROBIN,
+    SLAVE_LOWEST_LATENCY, SLAVE_LOWEST_LAG,
+    ))
+
 
 async def create_sentinel_pool(sentinels, *, db=None, password=None,
                                encoding=None, minsize=1, maxsize=10,
-                               ssl=None, parser=None, timeout=0.2, loop=None):
+                               ssl=None, parser=None, timeout=0.2,
+                               quorum=1, discover_ttl=1.0,
+                               slave_selection=SLAVE_FIRST,
+                               spread_slaves=False,
+                               latency_probe_interval=5.0, loop=None):
     """Create SentinelPool."""
     # FIXME: revise default timeout value
     assert isinstance(sentinels, (list, tuple)), sentinels
@@ -40,6 +57,11 @@ async def create_sentinel_pool(sentinels, *, db=None, password=None,
                         minsize=minsize,
                         maxsize=maxsize,
                         timeout=timeout,
+                        quorum=quorum,
+                        discover_ttl=discover_ttl,
+                        slave_selection=slave_selection,
+                        spread_slaves=spread_slaves,
+                        latency_probe_interval=latency_probe_interval,
                         loop=loop)
     await pool.discover()
     return pool
@@ -50,13 +72,37 @@ class SentinelPool:
 
     Holds connection pools to known and discovered (TBD) Sentinels
     as well as services' connections.
+
+    Master address is accepted once reported by ``quorum`` sentinels;
+    verified address is reused for ``discover_ttl`` seconds.
+
+    Slave is picked out of healthy slaves with ``slave_selection``:
+    either one of SLAVE_FIRST, SLAVE_RANDOM, SLAVE_ROUND_ROBIN,
+    SLAVE_LOWEST_LATENCY, SLAVE_LOWEST_LAG or a callable receiving
+    list of slaves' states (as reported by sentinel) and returning one.
+    SLAVE_LOWEST_LATENCY ranks slaves by average round trip
+    of ROLE sent on connect and of PING sent to every known slave
+    each ``latency_probe_interval`` seconds; once other slave becomes
+    the fastest one slave pool is switched to it.
+    With ``spread_slaves`` every new slave connection is made
+    to a freshly selected slave.
     """
 
+    LATENCY_ALPHA = 0.2
+
     def __init__(self, sentinels, *, db=None, password=None, ssl=None,
                  encoding=None, parser=None, minsize, maxsize, timeout,
+                 quorum=1, discover_ttl=1.0, slave_selection=SLAVE_FIRST,
+                 spread_slaves=False, latency_probe_interval=5.0,
                  loop=None):
         if loop is None:
             loop = asyncio.get_event_loop()
+        assert quorum >= 1, ("quorum must be >= 1", quorum)
+        assert callable(slave_selection) or \
+            slave_selection in _SLAVE_SELECTIONS, (
+                "Invalid slave_selection", slave_selection)
+        assert latency_probe_interval > 0, (
+            "Invalid latency_probe_interval", latency_probe_interval)
         # TODO: add connection/discover timeouts;
         #       and what to do if no master is found:
         #       (raise error or try forever or try until timeout)
@@ -68,6 +114,15 @@ class SentinelPool:
         self._pools = []     # list of sentinel pools
         self._masters = {}
         self._slaves = {}
+        self._quorum = quorum
+        self._discover_ttl = discover_ttl
+        self._masters_cache = {}    # service -> (address, expires at)
+        self._slaves_cache = {}     # service -> (slaves, expires at)
+        self._slave_selection = slave_selection
+        self._spread_slaves = spread_slaves
+        self._slaves_counter = {}
+        self._slaves_latency = {}
+        self._probe_conns = {}      # slave address -> connection
         self._parser_class = parser
         self._redis_db = db
         self._redis_password = password
@@ -85,12 +140,8 @@ class SentinelPool:
                     ch, (ev, data) = await monitor.get(encoding='utf-8')
                     ev = ev.decode('utf-8')
                     _logger.debug("%s: %s", ev, data)
-                    if ev in ('+odown',):
-                        typ, name, *tail = data.split(' ')
-                        if typ == 'master':
-                            self._need_rediscover(name)
-                # TODO: parse messages;
-                #   watch +new-epoch which signals `failover in progres`
+                    self._handle_event(ev, data)
+                # TODO: watch +new-epoch which signals `failover in progres`
                 #   freeze reconnection
                 #   wait / discover new master (find proper way)
                 #   unfreeze reconnection
@@ -103,6 +154,10 @@ class SentinelPool:
             except asyncio.CancelledError:
                 pass
         self._monitor_task = asyncio.ensure_future(echo_events(), loop=loop)
+        self._probe_task = None
+        if slave_selection == SLAVE_LOWEST_LATENCY:
+            self._probe_task = asyncio.ensure_future(
+                self._probe_slaves(latency_probe_interval), loop=loop)
 
     @property
     def discover_timeout(self):
@@ -133,6 +188,7 @@ class SentinelPool:
         if service not in self._slaves:
             self._slaves[service] = ManagedPool(
                 self, service, is_master=False,
+                spread=self._spread_slaves,
                 db=self._redis_db,
                 password=self._redis_password,
                 encoding=self._redis_encoding,
@@ -173,6 +229,14 @@ class SentinelPool:
         task, self._monitor_task = self._monitor_task, None
         task.cancel()
         tasks.append(task)
+        task, self._probe_task = self._probe_task, None
+        if task is not None:
+            task.cancel()
+            tasks.append(task)
+        while self._probe_conns:
+            _, conn = self._probe_conns.popitem()
+            conn.close()
+            tasks.append(conn.wait_closed())
         while self._pools:
             pool = self._pools.pop(0)
             pool.close()
@@ -252,72 +316,110 @@ class SentinelPool:
             return err
 
     async def discover_master(self, service, timeout):
-        """Perform Master discovery for specified service."""
-        # TODO: get lock
-        idle_timeout = timeout
-        # FIXME: single timeout used 4 times;
-        #   meaning discovery can take up to:
-        #   3 * timeout * (sentinels count)
-        #
-        #   having one global timeout also can leed to
-        #   a problem when not all sentinels are checked.
+        """Perform Master discovery for specified service.
 
-        # use a copy, cause pools can change
-        pools = self._pools[:]
-        for sentinel in pools:
+        All sentinels are queried concurrently; addresses reported
+        by quorum of sentinels are verified to have master role
+        in order of reaching quorum until one of them passes.
+        """
+        cached = self._masters_cache.get(service)
+        if cached is not None and cached[1] > self._loop.time():
             try:
-                with async_timeout(timeout, loop=self._loop):
-                    address = await self._get_masters_address(
-                        sentinel, service)
+                return await self._connect_master(
+                    service, cached[0], timeout)
+            except (DiscoverError, asyncio.TimeoutError, OSError):
+                self._masters_cache.pop(service, None)
 
-                pool = self._masters[service]
-                with async_timeout(timeout, loop=self._loop), \
-                        contextlib.ExitStack() as stack:
-                    conn = await pool._create_new_connection(address)
-                    stack.callback(conn.close)
-                    await self._verify_service_role(conn, 'master')
-                    stack.pop_all()
+        conn = await self._connect_quorum_master(service, timeout)
+        self._masters_cache[service] = (
+            conn.address, self._loop.time() + self._discover_ttl)
+        return conn
 
-                return conn
-            except asyncio.CancelledError:
-                # we must correctly handle CancelledError(s):
-                #   application may be stopped or function can be cancelled
-                #   by outer timeout, so we must stop the look up.
-                raise
-            except asyncio.TimeoutError:
-                continue
-            except DiscoverError as err:
-                sentinel_logger.debug("DiscoverError(%r, %s): %r",
-                                      sentinel, service, err)
-                await asyncio.sleep(idle_timeout, loop=self._loop)
-                continue
-            except RedisError as err:
-                raise MasterReplyError("Service {} error".format(service), err)
-            except Exception:
-                # TODO: clear (drop) connections to schedule reconnect
-                await asyncio.sleep(idle_timeout, loop=self._loop)
-                continue
-        else:
-            raise MasterNotFoundError("No master found for {}".format(service))
+    async def _connect_quorum_master(self, service, timeout):
+        # use a copy, cause pools can change
+        tasks = [
+            asyncio.ensure_future(
+                self._get_masters_address(sentinel, service),
+                loop=self._loop)
+            for sentinel in self._pools[:]
+        ]
+        votes = {}
+        error = None
+        rejected = False
+        try:
+            with async_timeout(timeout, loop=self._loop):
+                # votes are still collected while candidate is verified
+                for fut in asyncio.as_completed(tasks, loop=self._loop):
+                    try:
+                        address = await fut
+                    except asyncio.CancelledError:
+                        raise
+                    except RedisError as err:
+                        error = err
+                        continue
+                    except Exception as err:
+                        sentinel_logger.debug(
+                            "Failed to get %s master address: %r",
+                            service, err)
+                        continue
+                    votes[address] = votes.get(address, 0) + 1
+                    if votes[address] != self._quorum:
+                        continue
+                    try:
+                        return await self._connect_master(
+                            service, address, timeout)
+                    except (DiscoverError, asyncio.TimeoutError,
+                            OSError) as err:
+                        rejected = True
+                        sentinel_logger.debug(
+                            "Failed to connect to %s master %r: %r",
+                            service, address, err)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            for task in tasks:
+                task.cancel()
+        if error is not None and not rejected:
+            raise MasterReplyError("Service {} error".format(service), error)
+        raise MasterNotFoundError("No master found for {}".format(service))
+
+    async def _connect_master(self, service, address, timeout):
+        pool = self._masters[service]
+        try:
+            with async_timeout(timeout, loop=self._loop), \
+                    contextlib.ExitStack() as stack:
+                conn = await pool._create_new_connection(address)
+                stack.callback(conn.close)
+                await self._verify_service_role(conn, 'master')
+                stack.pop_all()
+            return conn
+        except RedisError as err:
+            raise MasterReplyError("Service {} error".format(service), err)
 
     async def discover_slave(self, service, timeout, **kwargs):
-        """Perform Slave discovery for specified service."""
-        # TODO: use kwargs to change how slaves are picked up
-        #   (eg: round-robin, priority, random, etc)
+        """Perform Slave discovery for specified service.
+
+        Slave is picked out of healthy slaves reported by sentinel
+        according to ``slave_selection``.
+        """
+        cached = self._slaves_cache.get(service)
+        if cached is not None and cached[1] > self._loop.time():
+            try:
+                return await self._connect_slave(
+                    service, self._select_slave(service, cached[0]), timeout)
+            except (DiscoverError, RedisError,
+                    asyncio.TimeoutError, OSError):
+                self._slaves_cache.pop(service, None)
         idle_timeout = timeout
         pools = self._pools[:]
         for sentinel in pools:
             try:
                 with async_timeout(timeout, loop=self._loop):
-                    address = await self._get_slave_address(
-                        sentinel, service)  # add **kwargs
-                pool = self._slaves[service]
-                with async_timeout(timeout, loop=self._loop), \
-                        contextlib.ExitStack() as stack:
-                    conn = await pool._create_new_connection(address)
-                    stack.callback(conn.close)
-                    await self._verify_service_role(conn, 'slave')
-                    stack.pop_all()
+                    slaves = await self._get_slaves(sentinel, service)
+                address = self._select_slave(service, slaves)
+                conn = await self._connect_slave(service, address, timeout)
+                self._slaves_cache[service] = (
+                    slaves, self._loop.time() + self._discover_ttl)
                 return conn
             except asyncio.CancelledError:
                 raise
@@ -333,6 +435,102 @@ class SentinelPool:
                 continue
         raise SlaveNotFoundError("No slave found for {}".format(service))
 
+    def _select_slave(self, service, slaves):
+        selection = self._slave_selection
+        if callable(selection):
+            state = selection(slaves)
+        elif selection == SLAVE_RANDOM:
+            state = random.choice(slaves)
+        elif selection == SLAVE_ROUND_ROBIN:
+            idx = self._slaves_counter.get(service, 0)
+            self._slaves_counter[service] = idx + 1
+            state = sorted(slaves, key=_slave_address)[idx % len(slaves)]
+        elif selection == SLAVE_LOWEST_LATENCY:
+            # see _connect_slave and _probe_slaves;
+            # not yet measured slaves are tried first
+            state = min(slaves, key=lambda state: self._slaves_latency.get(
+                _slave_address(state), 0))
+        elif selection == SLAVE_LOWEST_LAG:
+            state = max(slaves, key=lambda state: int(
+                state.get('slave-repl-offset', 0)))
+        else:
+            state = slaves[0]
+        return _slave_address(state)
+
+    async def _connect_slave(self, service, address, timeout):
+        pool = self._slaves[service]
+        try:
+            with async_timeout(timeout, loop=self._loop), \
+                    contextlib.ExitStack() as stack:
+                conn = await pool._connect(address)
+                stack.callback(conn.close)
+                started = self._loop.time()
+                await self._verify_service_role(conn, 'slave')
+                self._update_latency(address, self._loop.time() - started)
+                stack.pop_all()
+            return conn
+        except (DiscoverError, asyncio.TimeoutError, OSError):
+            # penalize unavailable slave
+            self._update_latency(address, timeout)
+            raise
+
+    async def _probe_slaves(self, interval):
+        """Periodically measure latency of known slaves
+        and switch slave pools to the fastest one.
+        """
+        try:
+            while True:
+                await asyncio.sleep(interval, loop=self._loop)
+                known = set()
+                for service, (slaves, _) in list(self._slaves_cache.items()):
+                    pool = self._slaves.get(service)
+                    if pool is None:
+                        continue
+                    addresses = [_slave_address(state) for state in slaves]
+                    known.update(addresses)
+                    await asyncio.gather(*(
+                        self._ping_slave(pool, address)
+                        for address in addresses), loop=self._loop)
+                    address = self._select_slave(service, slaves)
+                    if not pool._spread and pool.address is not None and \
+                            pool.address != address:
+                        _logger.debug("Slave %r of %s is faster than %r",
+                                      address, service, pool.address)
+                        pool.switch_address(address)
+                for address in set(self._probe_conns) - known:
+                    self._probe_conns.pop(address).close()
+        except asyncio.CancelledError:
+            pass
+
+    async def _ping_slave(self, pool, address):
+        timeout = self.discover_timeout
+        conn = self._probe_conns.pop(address, None)
+        try:
+            with async_timeout(timeout, loop=self._loop):
+                if conn is None or conn.closed:
+                    conn = await pool._connect(address)
+                started = self._loop.time()
+                await conn.execute('ping')
+        except asyncio.CancelledError:
+            if conn is not None:
+                conn.close()
+            raise
+        except (RedisError, asyncio.TimeoutError, OSError) as err:
+            _logger.debug("Slave %r latency probe failed: %r", address, err)
+            if conn is not None:
+                conn.close()
+            # penalize unavailable slave
+            self._update_latency(address, timeout)
+        else:
+            self._update_latency(address, self._loop.time() - started)
+            self._probe_conns[address] = conn
+
+    def _update_latency(self, address, latency):
+        old = self._slaves_latency.get(address)
+        if old is not None:
+            latency = old + self.LATENCY_ALPHA * (latency - old)
+        self._slaves_latency[address] = latency
+
     async def _get_masters_address(self, sentinel, service):
         # NOTE: we don't use `get-master-addr-by-name`
         #   as it can provide stale data so we repeat
@@ -348,31 +546,83 @@ class SentinelPool:
             raise BadState(state)
         return address
 
-    async def _get_slave_address(self, sentinel, service):
-        # Find and return single slave address
+    async def _get_slaves(self, sentinel, service):
+        # Find and return states of healthy slaves
         slaves = await sentinel.execute(b'sentinel', b'slaves',
                                         service, encoding='utf-8')
         if not slaves:
             raise UnknownService()
+        healthy = []
         for state in map(make_dict, slaves):
-            address = state['ip'], int(state['port'])
             flags = set(state['flags'].split(','))
             if {'s_down', 'o_down', 'disconnected'} & flags:
                 continue
-            return address
-        else:
+            healthy.append(state)
+        if not healthy:
             raise BadState(state)   # XXX: only last state
+        return healthy
 
     async def _verify_service_role(self, conn, role):
         res = await conn.execute(b'role', encoding='utf-8')
         if res[0] != role:
             raise RoleMismatch(res)
 
+    def _handle_event(self, event, data):
+        """Handle Sentinel event received by monitor."""
+        try:
+            if event == '+switch-master':
+                # <master name> <old ip> <old port> <new ip> <new port>
+                name, _, _, ip, port = data.split(' ')
+                self._switch_master(name, (ip, int(port)))
+            elif event in ('+odown', '+sdown', '-sdown', '+slave'):
+                # <instance type> <name> <ip> <port>
+                #   [@ <master name> <master ip> <master port>]
+                typ, name, ip, port, *tail = data.split(' ')
+                if typ == 'master' and event == '+odown':
+                    self._need_rediscover(name)
+                elif typ == 'slave' and len(tail) == 4:
+                    self._slave_state_changed(
+                        tail[1], (ip, int(port)), up=event != '+sdown')
+        except ValueError:
+            _logger.warning("Malformed %s event: %r", event, data)
+
+    def _switch_master(self, service, address):
+        sentinel_logger.info("Master of %s switched to %r", service, address)
+        self._masters_cache[service] = (
+            address, self._loop.time() + self._discover_ttl)
+        pool = self._masters.get(service)
+        if pool is not None:
+            pool.switch_address(address)
+        # old master is going to become a slave
+        self._slaves_cache.pop(service, None)
+        pool = self._slaves.get(service)
+        if pool is not None:
+            pool.need_rediscover()
+
+    def _slave_state_changed(self, service, address, *, up):
+        pool = self._slaves.get(service)
+        if pool is None:
+            return
+        if not up:
+            self._slaves_cache.pop(service, None)
+        if not up and pool.address == address:
+            sentinel_logger.debug(
+                "Slave %r of %s is down; must rediscover", address, service)
+            pool.need_rediscover()
+        elif up and pool.address is None:
+            # NOTE: slave pool is discovered on next acquire
+            sentinel_logger.debug(
+                "Slave %r of %s is available", address, service)
+
     def _need_rediscover(self, service):
         sentinel_logger.debug("Must redisover service %s", service)
-        for service, pool in self._masters.items():
+        self._masters_cache.pop(service, None)
+        self._slaves_cache.pop(service, None)
+        pool = self._masters.get(service)
+        if pool is not None:
             pool.need_rediscover()
-        for service, pool in self._slaves.items():
+        pool = self._slaves.get(service)
+        if pool is not None:
             pool.need_rediscover()
 
 
@@ -380,7 +630,7 @@ class ManagedPool(ConnectionsPool):
 
     def __init__(self, sentinel, service, is_master,
                  db=None, password=None, encoding=None, parser=None,
-                 *, minsize, maxsize, ssl=None, loop=None):
+                 *, minsize, maxsize, ssl=None, spread=False, loop=None):
         super().__init__(_NON_DISCOVERED,
                          db=db, password=password, encoding=encoding,
                          minsize=minsize, maxsize=maxsize, ssl=ssl,
@@ -389,6 +639,7 @@ class ManagedPool(ConnectionsPool):
         self._sentinel = sentinel
         self._service = service
         self._is_master = is_master
+        self._spread = spread and not is_master
         self._discover_timeout = .2
 
     @property
@@ -403,6 +654,10 @@ class ManagedPool(ConnectionsPool):
         return super().get_connection(command, args)
 
     async def _create_new_connection(self, address):
+        if address is _NON_DISCOVERED and \
+                self._address is not _NON_DISCOVERED:
+            # discovered by previous connection while filling the pool
+            address = self._address
         if address is _NON_DISCOVERED:
             # Perform service discovery.
             # Returns Connection or raises error if no service can be found.
@@ -418,6 +673,13 @@ class ManagedPool(ConnectionsPool):
             sentinel_logger.debug("Discoverred new address %r for %s",
                                   conn.address, self._service)
             return conn
+        if self._spread:
+            # every new connection goes to a freshly selected slave
+            return await self._sentinel.discover_slave(
+                self._service, timeout=self._sentinel.discover_timeout)
+        return await self._connect(address)
+
+    async def _connect(self, address):
         return await super()._create_new_connection(address)
 
     def _drop_closed(self):
@@ -439,6 +701,13 @@ class ManagedPool(ConnectionsPool):
 
     def release(self, conn):
         was_closed = conn.closed
+        if not was_closed and not self._spread and \
+                self._address is not _NON_DISCOVERED and \
+                conn.address != self._address:
+            # pool was switched to other address while connection was used
+            conn.close()
+            super().release(conn)
+            return
         super().release(conn)
         # if connection was closed while used and not by release()
         if was_closed:
@@ -446,15 +715,55 @@ class ManagedPool(ConnectionsPool):
                 "Released closed connection; must rediscover")
             self._sentinel._need_rediscover(self._service)
 
+    async def _acquire_blocking(self):
+        if self._address is _NON_DISCOVERED:
+            await self.clear()
+        while True:
+            conn = await super()._acquire_blocking()
+            if self._spread or self._address is _NON_DISCOVERED or \
+                    conn.address == self._address:
+                return conn
+            # pool was switched to other address while connection was free
+            self._release_blocking(conn)
+
+    def _release_blocking(self, conn):
+        if not conn.closed and not self._spread and \
+                self._address is not _NON_DISCOVERED and \
+                conn.address != self._address:
+            # pool was switched to other address while connection was used
+            conn.close()
+        super()._release_blocking(conn)
+
     def need_rediscover(self):
         self._address = _NON_DISCOVERED
 
+    def switch_address(self, address):
+        """Point pool to new service address (eg: after failover).
+
+        Free connections to old address (including ones kept for
+        blocking commands) are closed right away,
+        connections in use are closed when released.
+        """
+        if self._address == address:
+            return
+        sentinel_logger.debug("Switching %s from %r to %r",
+                              self._service, self.address, address)
+        self._address = address
+        while self._pool:
+            self._pool.popleft().close()
+        while self._blocking_pool:
+            self._blocking_pool.popleft().close()
+
 
 def make_dict(plain_list):
     it = iter(plain_list)
     return dict(zip(it, it))
 
 
+def _slave_address(state):
+    return state['ip'], int(state['port'])
+
+
 class DiscoverError(Exception):
     """Internal errors for masters/slaves discovery."""
 
@@ -94,6 +94,25 @@ class StreamReader(asyncio.StreamReader):
             await self._wait_for_data('readobj')
         # NOTE: after break we return None which must be handled as b''
 
+    async def readobjs(self):
+        """
+        Return list of all Redis objects parsed from read buffer
+        waiting for at least one to become available.
+        """
+        objs = [await self.readobj()]
+        gets = self._parser.gets
+        while True:
+            try:
+                obj = gets()
+            except Exception as exc:
+                # raised on next call
+                self.set_exception(exc)
+                break
+            if obj is False:
+                break
+            objs.append(obj)
+        return objs
+
     async def _read_not_allowed(self, *args, **kwargs):
         raise RuntimeError('Use readobj')
 
@@ -0,0 +1,287 @@
+import asyncio
+import types
+
+from .abc import AbcChannel
+from .connection import create_connection
+from .errors import ConnectionClosedError
+from .log import logger
+from .pubsub import Channel, GapMarker
+from .util import _converters
+
+__all__ = [
+    'create_subscriber',
+    'ResilientSubscriber',
+]
+
+
+async def create_subscriber(address, *, db=None, password=None, ssl=None,
+                            parser=None, timeout=None, min_backoff=0.1,
+                            max_backoff=10, loop=None):
+    """Creates Pub/Sub subscriber restoring its subscriptions
+    when connection is lost.
+
+    This function is a coroutine.
+    """
+    if loop is None:
+        loop = asyncio.get_event_loop()
+
+    def connect():
+        return create_connection(address, db=db,
+                                 password=password,
+                                 ssl=ssl,
+                                 parser=parser,
+                                 timeout=timeout,
+                                 loop=loop)
+    conn = await connect()
+    return ResilientSubscriber(conn, connect,
+                               min_backoff=min_backoff,
+                               max_backoff=max_backoff,
+                               loop=loop)
+
+
+class ResilientSubscriber:
+    """Pub/Sub subscriber surviving connection losses.
+
+    Subscribed channels and patterns are remembered; when connection
+    is lost, subscriber reconnects (with exponential backoff
+    from ``min_backoff`` up to ``max_backoff`` seconds) and
+    subscribes to all of them again in a single write.
+    ``GapMarker`` is put into every channel once connection is lost,
+    as messages published meanwhile are not delivered.
+
+    Usage example:
+
+    >>> sub = await aioredis.create_subscriber('redis://localhost')
+    >>> ch, = await sub.subscribe('chan:1')
+    >>> async for msg in ch.iter():
+    ...     if msg is GapMarker:
+    ...         await resync()
+    ...     else:
+    ...         print(msg)
+    """
+
+    def __init__(self, connection, connect, *, min_backoff=0.1,
+                 max_backoff=10, loop=None):
+        if loop is None:
+            loop = asyncio.get_event_loop()
+        assert 0 < min_backoff <= max_backoff, (
+            "Invalid backoff", min_backoff, max_backoff)
+        self._conn = connection
+        self._connect = connect
+        self._min_backoff = min_backoff
+        self._max_backoff = max_backoff
+        self._loop = loop
+        self._channels = {}
+        self._patterns = {}
+        self._closed = False
+        self._connected = asyncio.Event(loop=loop)
+        self._connected.set()
+        self._reconnect_task = asyncio.ensure_future(
+            self._reconnect_loop(), loop=loop)
+
+    def __repr__(self):
+        return '<ResilientSubscriber connected:{} channels:{} patterns:{}>'\
+            .format(self.connected, len(self._channels), len(self._patterns))
+
+    @property
+    def channels(self):
+        """Read-only channels dict."""
+        return types.MappingProxyType(self._channels)
+
+    @property
+    def patterns(self):
+        """Read-only patterns dict."""
+        return types.MappingProxyType(self._patterns)
+
+    @property
+    def connected(self):
+        """True if subscriptions are served by open connection."""
+        return self._conn is not None and not self._conn.closed
+
+    @property
+    def closed(self):
+        """True if subscriber is closed."""
+        return self._closed
+
+    def subscribe(self, channel, *channels):
+        """Subscribe to specified channels.
+
+        Arguments can be instances of :class:`~aioredis.Channel`.
+        Returns list of subscribed channels.
+        """
+        return self._subscribe(b'SUBSCRIBE', self._channels,
+                               (channel,) + channels, is_pattern=False)
+
+    def psubscribe(self, pattern, *patterns):
+        """Subscribe to specified patterns.
+
+        Arguments can be instances of :class:`~aioredis.Channel`.
+        Returns list of subscribed pattern channels.
+        """
+        return self._subscribe(b'PSUBSCRIBE', self._patterns,
+                               (pattern,) + patterns, is_pattern=True)
+
+    def unsubscribe(self, channel, *channels):
+        """Unsubscribe from specified channels and close them."""
+        return self._unsubscribe(b'UNSUBSCRIBE', self._channels,
+                                 (channel,) + channels)
+
+    def punsubscribe(self, pattern, *patterns):
+        """Unsubscribe from specified patterns and close them."""
+        return self._unsubscribe(b'PUNSUBSCRIBE', self._patterns,
+                                 (pattern,) + patterns)
+
+    def close(self):
+        """Close connection and all channels."""
+        if self._closed:
+            return
+        self._closed = True
+        self._reconnect_task.cancel()
+        if self._conn is not None:
+            self._conn.close()
+        self._connected.set()   # wake up waiters
+        for registry in (self._channels, self._patterns):
+            while registry:
+                _, ch = registry.popitem()
+                ch.close()
+
+    async def wait_closed(self):
+        """Wait until subscriber is closed."""
+        await asyncio.gather(self._reconnect_task, loop=self._loop,
+                             return_exceptions=True)
+        if self._conn is not None:
+            await self._conn.wait_closed()
+
+    # internal methods
+
+    async def _subscribe(self, command, registry, channels, *, is_pattern):
+        res = []
+        for ch in channels:
+            name = ch.name if isinstance(ch, AbcChannel) else \
+                _converters[type(ch)](ch)
+            if name not in registry:
+                if not isinstance(ch, AbcChannel):
+                    ch = Channel(name, is_pattern, loop=self._loop)
+                elif ch.is_pattern != is_pattern:
+                    raise ValueError("Channel {!r} does not match command {}"
+                                     .format(ch, command))
+                registry[name] = ch
+            res.append(registry[name])
+        conn = await self._wait_connection()
+        try:
+            await conn.execute_pubsub(command, *map(_Relay, res))
+        except ConnectionClosedError:
+            if self._closed:
+                raise
+            # subscriptions are restored on reconnect
+        return res
+
+    async def _unsubscribe(self, command, registry, channels):
+        res = []
+        for ch in channels:
+            name = ch.name if isinstance(ch, AbcChannel) else \
+                _converters[type(ch)](ch)
+            ch = registry.pop(name, None)
+            if ch is not None:
+                res.append(ch)
+        if res and self.connected:
+            try:
+                await self._conn.execute_pubsub(
+                    command, *(ch.name for ch in res))
+            except ConnectionClosedError:
+                pass
+        for ch in res:
+            ch.close()
+
+    async def _wait_connection(self):
+        while not self._closed:
+            if self.connected:
+                return self._conn
+            self._connected.clear()
+            await self._connected.wait()
+        raise ConnectionClosedError("Subscriber is closed")
+
+    async def _reconnect_loop(self):
+        try:
+            while not self._closed:
+                await self._conn.wait_closed()
+                if self._closed:
+                    break
+                self._connected.clear()
+                logger.warning("Pub/Sub connection lost, reconnecting")
+                for ch in self._channels.values():
+                    ch.put_nowait(GapMarker)
+                for ch in self._patterns.values():
+                    ch.put_nowait(GapMarker)
+                self._conn = await self._reconnect()
+                self._connected.set()
+        except asyncio.CancelledError:
+            pass
+
+    async def _reconnect(self):
+        backoff = self._min_backoff
+        while True:
+            conn = None
+            try:
+                conn = await self._connect()
+                await self._resubscribe(conn)
+                return conn
+            except asyncio.CancelledError:
+                if conn is not None:
+                    conn.close()
+                raise
+            except Exception as err:
+                if conn is not None:
+                    conn.close()
+                logger.warning("Pub/Sub reconnect failed: %r;"
+                               " retrying in %.2fs", err, backoff)
+            await asyncio.sleep(backoff, loop=self._loop)
+            backoff = min(backoff * 2, self._max_backoff)
+
+    async def _resubscribe(self, conn):
+        commands = []
+        if self._channels:
+            commands.append((b'SUBSCRIBE',) + tuple(
+                map(_Relay, self._channels.values())))
+        if self._patterns:
+            commands.append((b'PSUBSCRIBE',) + tuple(
+                map(_Relay, self._patterns.values())))
+        if commands:
+            # all commands are sent with single write
+            await conn.execute_pubsub_many(commands)
+
+
+class _Relay(AbcChannel):
+    """Forwards connection messages to subscriber's channel.
+
+    Unlike the channel it is not closed along with connection.
+    """
+
+    def __init__(self, ch):
+        self._ch = ch
+
+    def __repr__(self):
+        return "<{} channel:{!r}>".format(self.__class__.__name__, self._ch)
+
+    @property
+    def name(self):
+        """Encoded channel name or pattern."""
+        return self._ch.name
+
+    @property
+    def is_pattern(self):
+        """Set to True if channel is subscribed to pattern."""
+        return self._ch.is_pattern
+
+    @property
+    def is_active(self):
+        return self._ch.is_active
+
+    async def get(self, *, encoding=None, decoder=None):
+        raise RuntimeError("Relay channel does not allow direct get() calls")
+
+    def put_nowait(self, data):
+        return self._ch.put_nowait(data)
+
+    def close(self):
+        pass
@@ -16,30 +16,24 @@ _converters = {
 }
 
 
-def _bytes_len(sized):
-    return str(len(sized)).encode('utf-8')
-
-
-def encode_command(*args):
+def encode_command(*args, buf=None):
     """Encodes arguments into redis bulk-strings array.
 
+    Encoded command is appended to ``buf`` bytearray if given.
+
     Raises TypeError if any of args not of bytearray, bytes, float, int, or str
     type.
     """
-    buf = bytearray()
-
-    def add(data):
-        return buf.extend(data + b'\r\n')
-
-    add(b'*' + _bytes_len(args))
+    if buf is None:
+        buf = bytearray()
+    buf.extend(b'*%d\r\n' % len(args))
     for arg in args:
-        if type(arg) in _converters:
-            barg = _converters[type(arg)](arg)
-            add(b'$' + _bytes_len(barg))
-            add(barg)
-        else:
+        converter = _converters.get(type(arg))
+        if converter is None:
             raise TypeError("Argument {!r} expected to be of bytearray, bytes,"
                             " float, int, or str type".format(arg))
+        barg = converter(arg)
+        buf.extend(b'$%d\r\n%s\r\n' % (len(barg), barg))
     return buf
 
 
@@ -0,0 +1,41 @@
+"""Microbenchmark for cluster key slot calculation.
+
+Usage::
+
+    $ python benchmarks/cluster_key_slot.py
+"""
+import timeit
+
+from aioredis.cluster.cluster import _key_slot, key_slot, key_slots
+from aioredis.cluster.crc import crc16
+
+
+def main(number=10000):
+    short_key = 'user:{12345}:profile'
+    long_key = 'session:' + 'x' * 1024
+    hot_keys = ['key:{}'.format(i) for i in range(100)]
+    cases = [
+        ('crc16, short key', crc16, short_key.encode()),
+        ('crc16, 1KiB key', crc16, long_key.encode()),
+        ('key_slot (no cache), short key', _key_slot, short_key),
+        ('key_slot, short key', key_slot, short_key),
+        ('key_slot (no cache), 1KiB key', _key_slot, long_key),
+        ('key_slot, 1KiB key', key_slot, long_key),
+    ]
+    for title, func, arg in cases:
+        elapsed = timeit.timeit(lambda: func(arg), number=number)
+        print('{:<40} {:>8.3f} usec/call'.format(
+            title, elapsed / number * 1e6))
+
+    elapsed = timeit.timeit(
+        lambda: [key_slot(key) for key in hot_keys], number=number // 10)
+    print('{:<40} {:>8.3f} usec/key'.format(
+        '100 x key_slot', elapsed / (number // 10) / 100 * 1e6))
+    elapsed = timeit.timeit(
+        lambda: key_slots(hot_keys), number=number // 10)
+    print('{:<40} {:>8.3f} usec/key'.format(
+        'key_slots(100 keys)', elapsed / (number // 10) / 100 * 1e6))
+
+
+if __name__ == '__main__':
+    main()
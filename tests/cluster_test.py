@@ -11,16 +11,28 @@ from aioredis.commands import ContextRedis
 from aioredis.commands.cluster import (
     parse_cluster_nodes, parse_cluster_slots, parse_cluster_nodes_lines
 )
-from aioredis.cluster import RedisCluster, RedisPoolCluster
+from aioredis.cluster import (
+    RedisCluster,
+    RedisPoolCluster,
+    READ_FROM_MASTER,
+    READ_PREFER_REPLICA,
+    READ_ROUND_ROBIN,
+    READ_LOWEST_LATENCY,
+    RetryPolicy,
+    NodeResult,
+)
 from aioredis.cluster.testcluster import TestCluster
 from aioredis.cluster.cluster import (
     parse_moved_response_error,
+    parse_redirect_response_error,
     ClusterNodesManager,
     ClusterNode,
     create_cluster,
     create_pool_cluster
 )
-from aioredis.errors import RedisClusterError
+from aioredis.cluster.crc import crc16
+from aioredis.errors import ConnectionClosedError, RedisClusterError
+from aioredis.util import decode
 
 
 RAW_SLAVE_INFO_DATA = b"""\
@@ -294,9 +306,10 @@ class FakeConnection:
         self.encoding = encoding
         self.return_value = return_value
         self.loop = loop
+        self.closed = False
 
     def close(self):
-        pass
+        self.closed = True
 
     @asyncio.coroutine
     def wait_closed(self):
@@ -318,6 +331,7 @@ class CreateConnectionMock:
     def __init__(self, connections):
         assert isinstance(connections, dict)
         self.connections = connections
+        self.created = {port: 0 for port in connections}
         self.contextManager = mock.patch(
             'aioredis.commands.create_connection',
             side_effect=self.get_fake_connection
@@ -330,6 +344,7 @@ class CreateConnectionMock:
         assert host == '127.0.0.1'
         expected_connection = self.connections[port]
         expected_connection.was_used = True
+        self.created[port] += 1
         assert db == 0
         assert password is None
         assert encoding == 'utf-8'
@@ -392,6 +407,142 @@ class PoolConnectionMock:
         )
 
 
+class FakeNodeConnection:
+    """Connection to a node of :class:`FakeClusterNodes`."""
+
+    def __init__(self, nodes, address, encoding):
+        self.nodes = nodes
+        self.address = address
+        self.port = address[1]
+        self.db = 0
+        self.encoding = encoding
+        self.closed = False
+        self.in_transaction = False
+        self._loop = nodes.loop
+        self.in_pubsub = 0
+        self._waiters = ()
+
+    def close(self):
+        self.closed = True
+
+    async def wait_closed(self):
+        pass
+
+    def execute(self, command, *args, encoding=None):
+        if self.closed:
+            raise ConnectionClosedError()
+        command = decode(command, 'utf-8').upper().encode('utf-8')
+        return asyncio.ensure_future(
+            self.nodes.reply(self.port, command, args), loop=self.nodes.loop)
+
+
+class FakeClusterNodes:
+    """Fake cluster serving ``slots`` topology (CLUSTER SLOTS reply).
+
+    Connections opened by clusters (and node pools) are replaced with
+    :class:`FakeNodeConnection`; CLUSTER NODES/SLOTS/INFO, READONLY
+    and PING are answered by the fake itself and recorded
+    in ``cluster_calls``, other commands are answered
+    by ``handler(port, command, *args)`` and recorded in ``calls``.
+    Handler may return an exception to raise or a coroutine to await.
+    """
+
+    def __init__(self, loop, slots=RAW_SLOTS_INFO):
+        self.loop = loop
+        self.slots = slots
+        self.epoch = 1
+        self.handler = lambda port, command, *args: b'OK'
+        self.calls = []
+        self.cluster_calls = []
+        self.connections = []
+        self.clusters = []
+
+    async def create_connection(self, address, *, encoding=None, **kwargs):
+        conn = FakeNodeConnection(self, address, encoding)
+        self.connections.append(conn)
+        return conn
+
+    def open_connections(self, port):
+        return [conn for conn in self.connections
+                if conn.port == port and not conn.closed]
+
+    def failover(self, slots):
+        """Switch to new topology bumping cluster epoch."""
+        self.slots = slots
+        self.epoch += 1
+
+    def take_ports(self):
+        """Return ports of recorded calls and forget them."""
+        ports = [port for port, *_ in self.calls]
+        self.calls.clear()
+        return ports
+
+    async def reply(self, port, command, args):
+        if command in (b'CLUSTER', b'READONLY', b'PING'):
+            self.cluster_calls.append((port, (args or (command,))[0]))
+            return self._cluster_reply(command, args)
+        self.calls.append((port, command, args))
+        reply = self.handler(port, command, *args)
+        if asyncio.iscoroutine(reply):
+            reply = await reply
+        if isinstance(reply, Exception):
+            raise reply
+        return reply
+
+    def _cluster_reply(self, command, args):
+        if command == b'READONLY':
+            return b'OK'
+        if command == b'PING':
+            return b'PONG'
+        if args[0] == b'SLOTS':
+            return self.slots
+        if args[0] == b'INFO':
+            return 'cluster_state:ok\r\ncluster_current_epoch:{}\r\n'.format(
+                self.epoch)
+        assert args[0] == b'NODES', args
+        lines = []
+        for start, end, master, *replicas in self.slots:
+            lines.append('{2} {0}:{1} master - 0 0 1 connected {3}-{4}'
+                         .format(*master, start, end))
+            lines.extend('{2} {0}:{1} slave {3} 0 0 1 connected'
+                         .format(*replica, master[2])
+                         for replica in replicas)
+        return '\n'.join(lines)
+
+    async def create_cluster(self, **kwargs):
+        return await self._create(create_cluster, kwargs)
+
+    async def create_pool_cluster(self, **kwargs):
+        return await self._create(create_pool_cluster, kwargs)
+
+    async def _create(self, create, kwargs):
+        cluster = await create(
+            [('127.0.0.1', self.slots[0][2][1])], loop=self.loop, **kwargs)
+        self.clusters.append(cluster)
+        self.calls.clear()
+        self.cluster_calls.clear()
+        return cluster
+
+
+@pytest.fixture
+def fake_cluster(loop):
+    nodes = FakeClusterNodes(loop)
+    patchers = [
+        mock.patch(target, side_effect=nodes.create_connection)
+        for target in ('aioredis.commands.create_connection',
+                       'aioredis.pool.create_connection')
+    ]
+    for patcher in patchers:
+        patcher.start()
+
+    yield nodes
+
+    for cluster in nodes.clusters:
+        loop.run_until_complete(cluster.clear())
+    for patcher in patchers:
+        patcher.stop()
+
+
 @pytest.fixture(scope='module')
 def free_ports():
     ports = []
@@ -450,18 +601,26 @@ def nodes(free_ports):
 
 @pytest.fixture
 def test_cluster(loop, nodes, cluster_server):
-    return loop.run_until_complete(
+    cluster = loop.run_until_complete(
         create_cluster(nodes, encoding='utf-8', loop=loop)
     )
 
+    yield cluster
+
+    loop.run_until_complete(cluster.clear())
+
 
 @pytest.fixture
 def test_cluster_no_slots_assigned(
         loop, nodes, cluster_server_no_slots_assigned):
-    return loop.run_until_complete(
+    cluster = loop.run_until_complete(
         create_cluster(nodes, encoding='utf-8', loop=loop)
     )
 
+    yield cluster
+
+    loop.run_until_complete(cluster.clear())
+
 
 @pytest.fixture
 def test_pool_cluster(loop, nodes, cluster_server):
@@ -518,6 +677,21 @@ def test_parse_moved_response_error():
     assert parse_moved_response_error(
         ReplyError('MOVED 3999 127.0.0.1:6381')
     ) == ('127.0.0.1', 6381)
+    assert parse_moved_response_error(
+        ReplyError('ASK 3999 127.0.0.1:6381')
+    ) is None
+
+
+def test_parse_redirect_response_error():
+    assert parse_redirect_response_error(ReplyError('')) is None
+    assert parse_redirect_response_error(ReplyError('ASK')) is None
+    assert parse_redirect_response_error(ReplyError('ERR wrong')) is None
+    assert parse_redirect_response_error(
+        ReplyError('MOVED 3999 127.0.0.1:6381')
+    ) == ('MOVED', 3999, ('127.0.0.1', 6381))
+    assert parse_redirect_response_error(
+        ReplyError('ASK 3999 127.0.0.1:6381')
+    ) == ('ASK', 3999, ('127.0.0.1', 6381))
 
 
 def test_nodes_ok_info_parse():
@@ -541,10 +715,80 @@ def test_slots_info_parse():
     assert data == SLOTS_INFO
 
 
+def test_create_from_slots():
+    manager = ClusterNodesManager.create_from_slots(RAW_SLOTS_INFO)
+    assert manager.masters_count == 3
+    assert manager.slaves_count == 3
+    assert manager.all_slots_covered
+
+    node = manager.get_node_by_slot(0)
+    assert node.address == ('127.0.0.1', 7000)
+    assert node.id == '89e2e5155998dbb93ae759a0c7293d312f7b2be6'
+    assert node.slots == ((0, 5460),)
+    assert manager.get_node_by_slot(16383).address == ('127.0.0.1', 7008)
+
+    slave = manager.get_node_by_address(('127.0.0.1', 7009))
+    assert slave.is_slave
+    assert slave.master == node.id
+    assert slave.slots == node.slots
+
+
+def test_create_from_slots_without_ids():
+    manager = ClusterNodesManager.create_from_slots([
+        [0, 99, ['127.0.0.1', 7000], ['127.0.0.1', 7001]],
+        [100, 199, ['127.0.0.1', 7002]],
+        [200, 300, ['127.0.0.1', 7000], ['127.0.0.1', 7001]],
+        [301, 16383, ['127.0.0.1', 7002]],
+    ])
+    node = manager.get_node_by_id('127.0.0.1:7000')
+    assert node.slots == ((0, 99), (200, 300))
+    assert manager.get_node_by_slot(250) is node
+    assert manager.get_node_by_slot(150).address == ('127.0.0.1', 7002)
+    assert manager.slaves[0].master == '127.0.0.1:7000'
+
+
 def test_key_slot():
     assert ClusterNodesManager.key_slot(SLOT_ZERO_KEY) == 0
     assert ClusterNodesManager.key_slot('key') == KEY_KEY_SLOT
     assert ClusterNodesManager.key_slot(b'key') == KEY_KEY_SLOT
+    assert ClusterNodesManager.key_slot(bytearray(b'key')) == KEY_KEY_SLOT
+    assert ClusterNodesManager.key_slot('{key}:1') == KEY_KEY_SLOT
+    assert ClusterNodesManager.key_slot('{}key') != KEY_KEY_SLOT
+    assert ClusterNodesManager.key_slot(1) != ClusterNodesManager.key_slot(1.0)
+
+
+def test_key_slots():
+    keys = [SLOT_ZERO_KEY, 'key', b'{key}:1', bytearray(b'key'), 'other']
+    assert ClusterNodesManager.key_slots(keys) == [
+        ClusterNodesManager.key_slot(key) for key in keys]
+    assert ClusterNodesManager.key_slots(keys)[:4] == [
+        0, KEY_KEY_SLOT, KEY_KEY_SLOT, KEY_KEY_SLOT]
+    assert ClusterNodesManager.key_slots([]) == []
+
+
+def _crc16_reference(data):
+    """Bitwise CRC16 (XMODEM) reference implementation."""
+    crc = 0
+    for byte in data:
+        crc ^= byte << 8
+        for _ in range(8):
+            if crc & 0x8000:
+                crc = ((crc << 1) ^ 0x1021) & 0xffff
+            else:
+                crc = (crc << 1) & 0xffff
+    return crc
+
+
+@pytest.mark.parametrize('data', [
+    b'', b'key', b'123456789', bytearray(b'key:24358'), bytes(range(256)),
+])
+def test_crc16(data):
+    assert crc16(data) == _crc16_reference(data)
+    assert crc16(memoryview(data)) == _crc16_reference(data)
+
+
+def test_crc16_check_value():
+    assert crc16(b'123456789') == 0x31c3
 
 
 def test_create():
@@ -647,6 +891,44 @@ def test_get_node_by_address():
     assert no_node is None
 
 
+def test_get_node_by_slot():
+    manager = ClusterNodesManager.create(NODE_INFO_DATA_FAIL)
+    master = manager.nodes[5]
+    assert manager.get_node_by_slot(0) is master
+    assert manager.get_node_by_slot(5460) is master
+    # slots 5461-10922 belong to failed master
+    assert manager.get_node_by_slot(5461) is None
+    assert manager.get_node_by_slot(16383) is manager.nodes[2]
+    assert manager.get_node_by_slot(-1) is None
+    assert manager.get_node_by_slot(16384) is None
+
+
+def test_set_slot_node():
+    manager = ClusterNodesManager.create(NODE_INFO_DATA_FAIL)
+    node1, node2 = manager.nodes[2], manager.nodes[5]
+    assert manager.get_node_by_slot(0) is node2
+
+    manager.set_slot_node(0, node1)
+    assert manager.get_node_by_slot(0) is node1
+    assert manager.get_node_by_slot(1) is node2
+
+
+def test_get_node_by_slot_fragmented():
+    data = [dict(node) for node in NODE_INFO_DATA_FAIL]
+    data[2]['slots'] = ((10923, 10923), (10925, 10930), (16383, 16383))
+    data[5]['slots'] = ((0, 5460), (10924, 10924), (10931, 16382))
+    manager = ClusterNodesManager.create(data)
+    node1, node2 = manager.nodes[2], manager.nodes[5]
+
+    assert manager.get_node_by_slot(10923) is node1
+    assert manager.get_node_by_slot(10924) is node2
+    assert manager.get_node_by_slot(10925) is node1
+    assert manager.get_node_by_slot(10930) is node1
+    assert manager.get_node_by_slot(10931) is node2
+    assert manager.get_node_by_slot(16382) is node2
+    assert manager.get_node_by_slot(16383) is node1
+
+
 @cluster_test
 @pytest.mark.run_loop
 async def test_create_cluster(test_cluster):
@@ -738,6 +1020,41 @@ async def test_execute(loop, test_cluster, free_ports):
     )
 
 
+@cluster_test
+@pytest.mark.run_loop
+async def test_execute_reuses_connection(loop, test_cluster, free_ports):
+    expected_connection = FakeConnection(free_ports[0], loop)
+    with CreateConnectionMock({free_ports[0]: expected_connection}) as mocked:
+        await test_cluster.execute('SET', SLOT_ZERO_KEY, 'value')
+        await test_cluster.execute('GET', SLOT_ZERO_KEY)
+        assert mocked.created[free_ports[0]] == 1
+
+        expected_connection.closed = True
+        await test_cluster.execute('GET', SLOT_ZERO_KEY)
+        assert mocked.created[free_ports[0]] == 2
+
+    await test_cluster.clear()
+    assert not test_cluster._connections
+
+
+@pytest.mark.run_loop
+async def test_close_stale_connections(fake_cluster):
+    cluster = await fake_cluster.create_cluster()
+    await cluster.get(SLOT_ZERO_KEY)
+    await cluster.get('key')
+    stale, = fake_cluster.open_connections(7000)
+    alive, = fake_cluster.open_connections(7008)
+
+    # 7000 left cluster, its slots moved to 7007
+    fake_cluster.failover(RAW_SLOTS_INFO[:1] + [
+        [0, 10921, ['127.0.0.1', 7007, 'node-7007']]])
+    assert await cluster.refresh_topology(force=True)
+    assert stale.closed
+    assert not alive.closed
+    await cluster.get(SLOT_ZERO_KEY)
+    assert fake_cluster.take_ports() == [7000, 7008, 7007]
+
+
 @cluster_test
 @pytest.mark.run_loop
 async def test_execute_with_moved(loop, test_cluster, free_ports):
@@ -746,7 +1063,7 @@ async def test_execute_with_moved(loop, test_cluster, free_ports):
             free_ports[0],
             loop,
             return_value=ReplyError(
-                'MOVED 6000 127.0.0.1:{}'.format(free_ports[1])
+                'MOVED 0 127.0.0.1:{}'.format(free_ports[1])
             )
         ),
         free_ports[1]: FakeConnection(free_ports[1], loop)
@@ -762,6 +1079,41 @@ async def test_execute_with_moved(loop, test_cluster, free_ports):
     expected_connections[free_ports[1]].execute.assert_called_once_with(
         b'SET', SLOT_ZERO_KEY, 'value'
     )
+    # slot owner is updated in place
+    node = test_cluster.get_node('GET', SLOT_ZERO_KEY)
+    assert node.address[1] == free_ports[1]
+    node = test_cluster.get_node('GET', 'key:0')
+    assert node.address[1] == free_ports[0]
+
+
+@cluster_test
+@pytest.mark.run_loop
+async def test_execute_with_ask(loop, test_cluster, free_ports):
+    expected_connections = {
+        free_ports[0]: FakeConnection(
+            free_ports[0],
+            loop,
+            return_value=ReplyError(
+                'ASK 0 127.0.0.1:{}'.format(free_ports[1])
+            )
+        ),
+        free_ports[1]: FakeConnection(free_ports[1], loop)
+    }
+    with CreateConnectionMock(expected_connections):
+        ok = await test_cluster.execute('SET', SLOT_ZERO_KEY, 'value')
+
+    assert ok
+
+    expected_connections[free_ports[0]].execute.assert_called_once_with(
+        b'SET', SLOT_ZERO_KEY, 'value'
+    )
+    assert expected_connections[free_ports[1]].execute.mock_calls == [
+        mock.call(b'ASKING'),
+        mock.call(b'SET', SLOT_ZERO_KEY, 'value'),
+    ]
+    # ASK does not change routing
+    node = test_cluster.get_node('GET', SLOT_ZERO_KEY)
+    assert node.address[1] == free_ports[0]
 
 
 @cluster_test
@@ -869,31 +1221,57 @@ async def test_pool_execute(loop, test_pool_cluster, free_ports):
 @cluster_test
 @pytest.mark.run_loop
 async def test_pool_execute_with_moved(loop, test_pool_cluster, free_ports):
-    expected_pool_connection = FakeConnection(
-        free_ports[0],
-        loop,
-        return_value=ReplyError(
-            'MOVED 6000 127.0.0.1:{}'.format(free_ports[1])
-        )
-    )
-    expected_direct_connection = FakeConnection(free_ports[1], loop)
+    expected_connections = {
+        free_ports[0]: FakeConnection(
+            free_ports[0],
+            loop,
+            return_value=ReplyError(
+                'MOVED 0 127.0.0.1:{}'.format(free_ports[1])
+            )
+        ),
+        free_ports[1]: FakeConnection(free_ports[1], loop)
+    }
 
-    with PoolConnectionMock(
-            test_pool_cluster, loop, {free_ports[0]: expected_pool_connection}
-    ):
-        with CreateConnectionMock(
-                {free_ports[1]: expected_direct_connection}
-        ):
-            ok = await test_pool_cluster.execute('SET', SLOT_ZERO_KEY, 'value')
+    with PoolConnectionMock(test_pool_cluster, loop, expected_connections):
+        ok = await test_pool_cluster.execute('SET', SLOT_ZERO_KEY, 'value')
 
     assert ok
 
-    expected_pool_connection.execute.assert_called_once_with(
+    expected_connections[free_ports[0]].execute.assert_called_once_with(
         b'SET', SLOT_ZERO_KEY, 'value'
     )
-    expected_direct_connection.execute.assert_called_once_with(
+    expected_connections[free_ports[1]].execute.assert_called_once_with(
         b'SET', SLOT_ZERO_KEY, 'value'
     )
+    pool = test_pool_cluster.get_node('GET', SLOT_ZERO_KEY)
+    assert pool.address[1] == free_ports[1]
+
+
+@cluster_test
+@pytest.mark.run_loop
+async def test_pool_execute_with_ask(loop, test_pool_cluster, free_ports):
+    expected_connections = {
+        free_ports[0]: FakeConnection(
+            free_ports[0],
+            loop,
+            return_value=ReplyError(
+                'ASK 0 127.0.0.1:{}'.format(free_ports[1])
+            )
+        ),
+        free_ports[1]: FakeConnection(free_ports[1], loop)
+    }
+
+    with PoolConnectionMock(test_pool_cluster, loop, expected_connections):
+        ok = await test_pool_cluster.execute('SET', SLOT_ZERO_KEY, 'value')
+
+    assert ok
+
+    assert expected_connections[free_ports[1]].execute.mock_calls == [
+        mock.call(b'ASKING'),
+        mock.call(b'SET', SLOT_ZERO_KEY, 'value'),
+    ]
+    pool = test_pool_cluster.get_node('GET', SLOT_ZERO_KEY)
+    assert pool.address[1] == free_ports[0]
 
 
 @cluster_test
@@ -984,6 +1362,73 @@ async def test_reload_cluster_pool(test_pool_cluster):
     await test_pool_cluster.clear()
 
 
+@pytest.mark.run_loop
+async def test_refresh_topology(fake_cluster):
+    cluster = await fake_cluster.create_cluster()
+    assert cluster.masters_count() == 3
+
+    def refreshes():
+        calls = [command for _, command in fake_cluster.cluster_calls]
+        fake_cluster.cluster_calls.clear()
+        return calls
+
+    assert await cluster.refresh_topology()
+    assert refreshes() == [b'INFO', b'SLOTS']
+
+    # debounced
+    assert not await cluster.refresh_topology()
+    assert refreshes() == []
+
+    # epoch has not changed
+    cluster.REFRESH_DEBOUNCE = 0
+    assert not await cluster.refresh_topology()
+    assert refreshes() == [b'INFO']
+
+    fake_cluster.failover(RAW_SLOTS_INFO[:1] + RAW_SLOTS_INFO[2:] + [
+        [0, 5460, ['127.0.0.1', 7009, 'node-7009']]])
+    assert await cluster.refresh_topology()
+    assert refreshes() == [b'INFO', b'SLOTS']
+    assert cluster.get_node('GET', SLOT_ZERO_KEY).address[1] == 7009
+
+    assert await cluster.refresh_topology(force=True)
+    assert refreshes() == [b'INFO', b'SLOTS']
+
+    # forced refresh does not share result of unforced one in progress
+    res = await asyncio.gather(
+        cluster.refresh_topology(), cluster.refresh_topology(force=True),
+        cluster.refresh_topology(force=True), loop=fake_cluster.loop)
+    assert res == [False, True, True]
+    assert refreshes() == [b'INFO', b'INFO', b'SLOTS']
+
+
+@cluster_test
+@pytest.mark.run_loop
+async def test_pool_cluster_refresh_topology(test_pool_cluster):
+    old_pools = dict(test_pool_cluster._cluster_pool)
+
+    assert await test_pool_cluster.refresh_topology(force=True)
+
+    new_pools = test_pool_cluster._cluster_pool
+    assert len(new_pools) == len(old_pools)
+    assert {id(pool) for pool in old_pools.values()} == {
+        id(pool) for pool in new_pools.values()}
+    assert all(not pool.closed for pool in new_pools.values())
+
+
+@cluster_test
+@pytest.mark.run_loop
+async def test_background_refresh(loop, nodes, cluster_server):
+    cluster = await create_cluster(
+        nodes, encoding='utf-8', refresh_interval=0.1, loop=loop)
+    try:
+        assert cluster._current_epoch is None
+        await asyncio.sleep(0.3, loop=loop)
+        assert cluster._current_epoch is not None
+    finally:
+        await cluster.clear()
+    assert cluster._refresher is None
+
+
 @cluster_test
 @pytest.mark.run_loop
 async def test_keys_command(test_cluster, key_and_slot, zero_slot_key):
@@ -1005,6 +1450,22 @@ async def test_scan_command(test_cluster, key_and_slot, zero_slot_key):
     assert sorted(res) == sorted([key, zero_slot_key])
 
 
+@cluster_test
+@pytest.mark.run_loop
+async def test_iscan_command(test_cluster, key_and_slot, zero_slot_key):
+    key, _ = key_and_slot
+
+    res = []
+    async for k in test_cluster.iscan(concurrency=1):
+        res.append(k)
+    assert sorted(res) == sorted([key, zero_slot_key])
+
+    res = []
+    async for page in test_cluster.iscan(match=key, pages=True):
+        res.extend(page)
+    assert res == [key]
+
+
 @cluster_test
 @pytest.mark.run_loop
 async def test_get_keys_in_slots(test_cluster, key_and_slot):
@@ -1495,11 +1956,470 @@ async def test_multi_key_commands_on_cluster(test_cluster):
     await test_cluster.set('other{key}', 2)
     await test_cluster.set('otherkey', 3)
 
-    with pytest.raises(ReplyError):
-        # these keys map to different slots
-        await test_cluster.delete('my{key}', 'otherkey')
+    assert await test_cluster.exists('my{key}', 'otherkey', 'nokey') == 2
+    assert await test_cluster.mget('otherkey', 'my{key}', 'nokey') == [
+        '3', '1', None]
 
-    await test_cluster.delete('my{key}', 'other{key}')
+    # these keys map to different slots
+    assert await test_cluster.delete('my{key}', 'otherkey') == 2
+
+    assert await test_cluster.delete('my{key}', 'other{key}') == 1
 
     assert await test_cluster.get('my{key}') is None
     assert await test_cluster.get('other{key}') is None
+
+
+@cluster_test
+@pytest.mark.run_loop
+async def test_mset_on_cluster(test_cluster):
+    keys = ['key:{}'.format(i) for i in range(20)]
+    pairs = [arg for i, key in enumerate(keys) for arg in (key, i)]
+    assert await test_cluster.mset(*pairs) is True
+
+    assert await test_cluster.mget(*keys) == [str(i) for i in range(20)]
+    assert await test_cluster.delete(*keys) == 20
+    assert await test_cluster.exists(*keys) == 0
+
+    with pytest.raises(TypeError):
+        await test_cluster.mset('key:1', 1, 'key:2')
+
+
+@pytest.mark.run_loop
+async def test_cross_slot_commands(fake_cluster):
+    cluster = await fake_cluster.create_cluster()
+    calls = fake_cluster.calls
+
+    def handler(port, command, *args):
+        if command == b'MGET':
+            return ['{}@{}'.format(key, port) for key in args]
+        if command == b'MSET':
+            return b'OK'
+        return len(args)
+
+    fake_cluster.handler = handler
+    keys = [SLOT_ZERO_KEY, 'key', '{key}:1', 'other']
+
+    res = await cluster.mget(*keys)
+    assert res == [
+        'key:24358@7000', 'key@7008', '{key}:1@7008', 'other@7008']
+    # one MGET per slot
+    assert sorted(calls) == [
+        (7000, b'MGET', (SLOT_ZERO_KEY,)),
+        (7008, b'MGET', ('key', '{key}:1')),
+        (7008, b'MGET', ('other',)),
+    ]
+
+    calls.clear()
+    assert await cluster.mset(SLOT_ZERO_KEY, 1, 'key', 2, '{key}:1', 3)
+    assert sorted(calls) == [
+        (7000, b'MSET', (SLOT_ZERO_KEY, 1)),
+        (7008, b'MSET', ('key', 2, '{key}:1', 3)),
+    ]
+
+    assert await cluster.delete(*keys) == 4
+    assert await cluster.exists(*keys) == 4
+    assert await cluster.unlink(*keys) == 4
+
+    calls.clear()
+    assert await cluster.mget('key', '{key}:1') == [
+        'key@7008', '{key}:1@7008']
+    assert calls == [(7008, b'MGET', ('key', '{key}:1'))]
+
+    # slot of 'other' has been moved to 7007
+    def moved(port, command, *args):
+        if port == 7008 and args == ('other',):
+            return ReplyError('MOVED 11361 127.0.0.1:7007')
+        return handler(port, command, *args)
+
+    fake_cluster.handler = moved
+    calls.clear()
+    assert await cluster.mget('key', 'other') == ['key@7008', 'other@7007']
+    assert sorted(calls) == [
+        (7007, b'MGET', ('other',)),
+        (7008, b'MGET', ('key',)),
+        (7008, b'MGET', ('other',)),
+    ]
+
+    with pytest.raises(TypeError):
+        await cluster.delete('key', None)
+
+    await cluster.clear()
+    fake_cluster.handler = handler
+    cluster = await fake_cluster.create_pool_cluster(minsize=1, maxsize=2)
+    assert await cluster.mget(*keys) == [
+        'key:24358@7000', 'key@7008', '{key}:1@7008', 'other@7008']
+    # sub-commands of a node are pipelined on single connection
+    assert len(fake_cluster.open_connections(7008)) == 1
+
+
+def _scan_handler(pages, fail=None):
+    def handler(port, command, cur, *args):
+        assert command == b'SCAN'
+        if (port, cur) == fail:
+            return ConnectionClosedError()
+        return pages[port][cur]
+    return handler
+
+
+@pytest.mark.run_loop
+async def test_iscan_cursors(fake_cluster):
+    pages = {
+        # cursor -> (next cursor, keys)
+        7000: {0: (5, ['a1', 'a2']), 5: (0, ['a3'])},
+        7007: {0: (3, []), 3: (0, ['b1'])},
+        7008: {0: (0, [])},
+    }
+    cluster = await fake_cluster.create_cluster()
+    fake_cluster.handler = _scan_handler(pages)
+
+    cursors = {
+        ('127.0.0.1', 7000): 0,
+        ('127.0.0.1', 7007): 0,
+        ('127.0.0.1', 7008): 0,
+    }
+    it = cluster.iscan(concurrency=1, cursors=cursors)
+    assert it.cursors == {
+        ('127.0.0.1', 7000): 0,
+        ('127.0.0.1', 7007): 0,
+        ('127.0.0.1', 7008): 0,
+    }
+    assert await it.__anext__() == 'a1'
+    assert await it.__anext__() == 'a2'
+    # page is not fully consumed yet
+    assert it.cursors[('127.0.0.1', 7000)] == 0
+    assert await it.__anext__() == 'a3'
+    assert it.cursors[('127.0.0.1', 7000)] == 5
+    assert await it.__anext__() == 'b1'
+    assert it.cursors == {
+        ('127.0.0.1', 7007): 3,
+        ('127.0.0.1', 7008): 0,
+    }
+
+    with pytest.raises(StopAsyncIteration):
+        await it.__anext__()
+    assert it.cursors == {}
+    assert sorted(
+        (port, cur) for port, _, (cur, *_) in fake_cluster.calls) == [
+        (7000, 0), (7000, 5), (7007, 0), (7007, 3), (7008, 0)]
+
+    res = []
+    async for page in cluster.iscan(pages=True):
+        res.append(page)
+    assert sorted(res) == [['a1', 'a2'], ['a3'], ['b1']]
+
+    assert sorted(await cluster.scan()) == ['a1', 'a2', 'a3', 'b1']
+
+    with pytest.raises(ValueError):
+        cluster.iscan(concurrency=0)
+    with pytest.raises(RedisClusterError):
+        cluster.iscan(cursors={('127.0.0.1', 6379): 0})
+
+
+@pytest.mark.run_loop
+async def test_iscan_resume(fake_cluster):
+    pages = {
+        7000: {0: (5, ['a1']), 5: (0, ['a2'])},
+        7007: {0: (3, ['b1']), 3: (0, ['b2'])},
+        7008: {0: (0, ['c1'])},
+    }
+    cluster = await fake_cluster.create_cluster()
+    fake_cluster.handler = _scan_handler(pages, fail=(7007, 3))
+
+    it = cluster.iscan(concurrency=2)
+    res = []
+    with pytest.raises(ConnectionClosedError):
+        async for key in it:
+            res.append(key)
+    checkpoint = it.cursors
+    assert ('127.0.0.1', 7007) in checkpoint
+
+    fake_cluster.handler = _scan_handler(pages)
+    fake_cluster.calls.clear()
+    async for key in cluster.iscan(cursors=checkpoint):
+        res.append(key)
+    assert sorted(set(res)) == ['a1', 'a2', 'b1', 'b2', 'c1']
+    calls = [(port, cur) for port, _, (cur, *_) in fake_cluster.calls]
+    assert (7007, 3) in calls
+    assert (7007, 0) not in calls
+
+
+def test_get_replicas():
+    manager = ClusterNodesManager.create_from_slots(RAW_SLOTS_INFO)
+    master = manager.get_node_by_slot(0)
+    assert [node.address for node in manager.get_replicas(master)] == [
+        ('127.0.0.1', 7009)]
+    replica = manager.get_node_by_address(('127.0.0.1', 7009))
+    assert manager.get_replicas(replica) == []
+
+
+@pytest.mark.run_loop
+async def test_read_policy(fake_cluster, loop):
+    cluster = await fake_cluster.create_cluster(read_from=READ_FROM_MASTER)
+    await cluster.get(SLOT_ZERO_KEY)
+    assert fake_cluster.take_ports() == [7000]
+
+    cluster = await fake_cluster.create_cluster(
+        read_from=READ_PREFER_REPLICA)
+    await cluster.get(SLOT_ZERO_KEY)
+    await cluster.execute(b'HGETALL', SLOT_ZERO_KEY)
+    # write commands always go to master
+    await cluster.set(SLOT_ZERO_KEY, 1)
+    await cluster.eval('return 1', keys=[SLOT_ZERO_KEY])
+    assert fake_cluster.take_ports() == [7009, 7009, 7000, 7000]
+    assert fake_cluster.cluster_calls == [(7009, b'READONLY')]
+
+    cluster = await fake_cluster.create_cluster(read_from=READ_ROUND_ROBIN)
+    for _ in range(4):
+        await cluster.get(SLOT_ZERO_KEY)
+    assert fake_cluster.take_ports() == [7000, 7009, 7000, 7009]
+
+    with pytest.raises(AssertionError):
+        await fake_cluster.create_cluster(read_from='slave')
+
+
+@pytest.mark.run_loop
+async def test_read_policy_latency(fake_cluster, loop):
+    async def reply(port):
+        if port == 7000:
+            await asyncio.sleep(.01, loop=loop)
+        return 'value'
+
+    fake_cluster.handler = lambda port, command, *args: reply(port)
+    cluster = await fake_cluster.create_cluster(
+        read_from=READ_LOWEST_LATENCY)
+    for _ in range(3):
+        assert await cluster.get(SLOT_ZERO_KEY) == 'value'
+    # unmeasured node is tried once, then the fastest one is used
+    assert fake_cluster.take_ports() == [7009, 7000, 7009]
+
+
+@cluster_test
+@pytest.mark.run_loop
+async def test_pool_cluster_read_from_replica(loop, nodes, cluster_server):
+    cluster = await create_pool_cluster(
+        nodes, encoding='utf-8', read_from=READ_PREFER_REPLICA, loop=loop)
+    try:
+        assert len(cluster._replica_pools) == cluster.slave_count()
+        await cluster.set(SLOT_ZERO_KEY, 'value')
+        pool = cluster._get_node_entity('get', SLOT_ZERO_KEY)
+        assert pool in cluster._replica_pools.values()
+        assert await cluster.get(SLOT_ZERO_KEY) in ('value', None)
+    finally:
+        await cluster.clear()
+    assert not cluster._replica_pools
+
+
+def test_retry_policy():
+    policy = RetryPolicy(attempts=2, backoff=0.1, max_backoff=0.3,
+                         budget=2, budget_ratio=0.5)
+    assert policy.acquire(0)
+    assert policy.acquire(1)
+    assert not policy.acquire(2)
+    # budget exhausted
+    assert not policy.acquire(0)
+    policy.deposit()
+    assert not policy.acquire(0)
+    policy.deposit()
+    assert policy.acquire(0)
+    for _ in range(10):
+        policy.deposit()
+    assert policy._tokens == 2
+
+    for attempt in range(5):
+        assert 0 <= policy.delay(attempt) <= min(0.3, 0.1 * 2 ** attempt)
+
+    with pytest.raises(AssertionError):
+        RetryPolicy(attempts=-1)
+
+
+def _retry_cluster(fake_cluster, replies, **policy):
+    policy.setdefault('backoff', 0)
+    fake_cluster.handler = lambda port, command, *args: replies.pop(0)
+    return fake_cluster.create_cluster(retry_policy=RetryPolicy(**policy))
+
+
+# 7009 replica promoted after 7000 failure
+PROMOTED_SLOTS_INFO = RAW_SLOTS_INFO[:1] + RAW_SLOTS_INFO[2:] + [
+    [0, 5460, ['127.0.0.1', 7009, '4236cd00bf46ffc4718479a766a8c8452d55cd17']]]
+
+
+@pytest.mark.run_loop
+async def test_execute_retry_tryagain(fake_cluster):
+    cluster = await _retry_cluster(fake_cluster, [
+        ReplyError('TRYAGAIN Multiple keys request during rehashing'),
+        'value',
+    ])
+    fake_cluster.failover(PROMOTED_SLOTS_INFO)
+    assert await cluster.execute('get', SLOT_ZERO_KEY) == 'value'
+    # topology is not refreshed
+    assert fake_cluster.take_ports() == [7000, 7000]
+    assert fake_cluster.cluster_calls == []
+
+
+@pytest.mark.run_loop
+async def test_execute_retry_failover(fake_cluster):
+    cluster = await _retry_cluster(fake_cluster, [
+        ConnectionClosedError('Reader at end of file'),
+        'value',
+        ReplyError('CLUSTERDOWN The cluster is down'),
+        'value',
+    ])
+    fake_cluster.failover(PROMOTED_SLOTS_INFO)
+    assert await cluster.execute('get', SLOT_ZERO_KEY) == 'value'
+    assert fake_cluster.take_ports() == [7000, 7009]
+    assert [cmd for _, cmd in fake_cluster.cluster_calls] == [
+        b'INFO', b'SLOTS']
+
+    fake_cluster.failover(RAW_SLOTS_INFO)
+    assert await cluster.execute('get', SLOT_ZERO_KEY) == 'value'
+    assert fake_cluster.take_ports() == [7009, 7000]
+
+
+@pytest.mark.run_loop
+async def test_execute_retry_write(fake_cluster):
+    # write may have been applied before connection failed
+    cluster = await _retry_cluster(fake_cluster, [
+        ConnectionClosedError('Reader at end of file'),
+        ReplyError('TRYAGAIN Multiple keys request during rehashing'),
+        b'OK',
+    ])
+    fake_cluster.failover(PROMOTED_SLOTS_INFO)
+    with pytest.raises(ConnectionClosedError):
+        await cluster.set(SLOT_ZERO_KEY, 'value')
+    assert fake_cluster.take_ports() == [7000]
+
+    # write is not resent but topology is refreshed in background
+    for _ in range(10):
+        await asyncio.sleep(0, loop=fake_cluster.loop)
+    assert [cmd for _, cmd in fake_cluster.cluster_calls] == [
+        b'INFO', b'SLOTS']
+    assert await cluster.set(SLOT_ZERO_KEY, 'value')
+    assert fake_cluster.take_ports() == [7009, 7009]
+
+
+@pytest.mark.run_loop
+async def test_execute_retry_exhausted(fake_cluster):
+    cluster = await _retry_cluster(
+        fake_cluster, [ReplyError('TRYAGAIN')] * 3, attempts=2)
+    with pytest.raises(ReplyError):
+        await cluster.execute('get', SLOT_ZERO_KEY)
+    assert fake_cluster.take_ports() == [7000, 7000, 7000]
+
+    cluster = await _retry_cluster(
+        fake_cluster, [ReplyError('TRYAGAIN')] * 2, budget=1)
+    with pytest.raises(ReplyError):
+        await cluster.execute('get', SLOT_ZERO_KEY)
+    assert fake_cluster.take_ports() == [7000, 7000]
+
+    cluster = await _retry_cluster(
+        fake_cluster, [ReplyError('ERR wrong number of arguments')])
+    with pytest.raises(ReplyError):
+        await cluster.execute('get', SLOT_ZERO_KEY)
+    assert fake_cluster.take_ports() == [7000]
+
+
+@pytest.mark.run_loop
+async def test_bound_commands(fake_cluster):
+    cluster = await _retry_cluster(
+        fake_cluster, ['value', b'OK', 'other', 2])
+
+    get = cluster.get
+    assert get is cluster.get
+    assert get.__name__ == 'get'
+    assert await get(SLOT_ZERO_KEY) == 'value'
+    assert await cluster.set('key', 'value')
+    assert fake_cluster.take_ports() == [7000, 7008]
+
+    # calls with keyword arguments go through execute
+    assert await cluster.get('key', encoding=None) == 'other'
+    assert await cluster.eval(
+        'return 1', keys=[SLOT_ZERO_KEY], args=[]) == 2
+    assert fake_cluster.take_ports() == [7008, 7000]
+
+    # private names are not cached
+    assert '_missing' not in cluster.__dict__
+    cluster._missing
+    assert '_missing' not in cluster.__dict__
+
+
+@pytest.mark.run_loop
+async def test_iter_nodes(fake_cluster, loop):
+    cluster = await fake_cluster.create_cluster()
+
+    cancelled = []
+
+    async def reply(port):
+        try:
+            if port == 7008:
+                await asyncio.sleep(10, loop=loop)
+            if port == 7009:
+                await asyncio.sleep(0.01, loop=loop)
+        except asyncio.CancelledError:
+            cancelled.append(port)
+            raise
+        return port
+
+    def handler(port, command):
+        assert command == b'DBSIZE'
+        if port == 7007:
+            return ReplyError('ERR')
+        return reply(port)
+
+    fake_cluster.handler = handler
+
+    results = []
+    async for res in cluster.iter_nodes('dbsize', timeout=0.1):
+        results.append(res)
+    results = {res.address[1]: res for res in results}
+    assert list(results)[-1] == 7008
+    assert results[7000] == NodeResult(('127.0.0.1', 7000), 7000, None)
+    assert isinstance(results[7007].error, ReplyError)
+    assert isinstance(results[7008].error, asyncio.TimeoutError)
+    assert results[7008].result is None
+
+    results = []
+    async for res in cluster.iter_nodes(b'DBSIZE', slaves=True,
+                                        timeout=0.1):
+        results.append(res.address[1])
+    assert len(results) == 6
+    assert results[-1] == 7008
+    assert results.index(7009) > results.index(7000)
+
+    # commands left after break are cancelled
+    cancelled.clear()
+    it = cluster.iter_nodes('dbsize')
+    async for res in it:
+        break
+    it.close()
+    await asyncio.sleep(0, loop=loop)
+    assert cancelled == [7008]
+
+
+@pytest.mark.run_loop
+async def test_pool_cluster_lazy_pools(fake_cluster, loop):
+    cluster = await fake_cluster.create_pool_cluster(
+        minsize=2, maxsize=5, lazy=True, idle_timeout=0.1,
+        pool_sizes={('127.0.0.1', 7000): (4, 20)})
+    # only connection used to load cluster nodes was opened
+    assert len(fake_cluster.connections) == 1
+
+    pools = {port: cluster.get_node('GET', key).connection
+             for port, key in ((7000, SLOT_ZERO_KEY), (7007, 'c'),
+                               (7008, 'key'))}
+    assert all(pool.size == 0 for pool in pools.values())
+    assert (pools[7000].minsize, pools[7000].maxsize) == (4, 20)
+    assert (pools[7007].minsize, pools[7007].maxsize) == (2, 5)
+
+    # idle pools lose their free connections
+    await cluster.get(SLOT_ZERO_KEY)
+    assert pools[7000].freesize == 4
+    await asyncio.sleep(0.15, loop=loop)
+    await cluster.get('c')
+    await cluster.trim_idle_pools()
+    assert pools[7000].freesize == 0
+    assert fake_cluster.open_connections(7000) == []
+    assert pools[7007].freesize == 2
+    assert len(fake_cluster.open_connections(7007)) == 2
+
+    await cluster.clear()
+    assert all(pool.closed for pool in pools.values())
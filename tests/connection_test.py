@@ -14,6 +14,8 @@ from aioredis import (
     Channel,
     MaxClientsError,
     )
+from aioredis.pubsub import OVERFLOW_PAUSE, Receiver
+from aioredis.stream import StreamReader
 
 
 @pytest.mark.run_loop
@@ -598,3 +600,121 @@ async def test_create_connection__unix_url(
     assert await conn.execute('ping') == pong
     assert conn.db == db
     assert conn.encoding == enc
+
+
+@pytest.mark.run_loop
+async def test_pubsub_pause_reading(loop):
+    reader = StreamReader(loop=loop)
+    writer = mock.Mock()
+    conn = RedisConnection(reader, writer, address=('localhost', 6379),
+                           loop=loop)
+    ch = Channel('chan:1', is_pattern=False, loop=loop,
+                 maxsize=1, overflow=OVERFLOW_PAUSE)
+    fut = conn.execute_pubsub('subscribe', ch)
+    reader.feed_data(b'*3\r\n$9\r\nsubscribe\r\n$6\r\nchan:1\r\n:1\r\n')
+    await fut
+    reader.feed_data(
+        b'*3\r\n$7\r\nmessage\r\n$6\r\nchan:1\r\n$1\r\na\r\n')
+    for _ in range(3):
+        await asyncio.sleep(0, loop=loop)
+    reader.feed_data(
+        b'*3\r\n$7\r\nmessage\r\n$6\r\nchan:1\r\n$1\r\nb\r\n')
+    for _ in range(3):
+        await asyncio.sleep(0, loop=loop)
+    # second message is not read until channel is drained
+    assert ch._queue.qsize() == 1
+    assert await ch.get() == b'a'
+    assert await ch.get() == b'b'
+    assert ch.dropped == 0
+    conn.close()
+    await conn.wait_closed()
+
+
+@pytest.mark.run_loop
+async def test_pubsub_pause_unsubscribe(loop):
+    reader = StreamReader(loop=loop)
+    conn = RedisConnection(reader, mock.Mock(), address=('localhost', 6379),
+                           loop=loop)
+    # channel created without loop
+    ch = Channel('chan:1', is_pattern=False,
+                 maxsize=2, overflow=OVERFLOW_PAUSE)
+    fut = conn.execute_pubsub('subscribe', ch)
+    reader.feed_data(b'*3\r\n$9\r\nsubscribe\r\n$6\r\nchan:1\r\n:1\r\n')
+    await fut
+
+    def msg(data):
+        return b'*3\r\n$7\r\nmessage\r\n$6\r\nchan:1\r\n$1\r\n%d\r\n' % (
+            data)
+    reader.feed_data(msg(0) + msg(1))
+    for _ in range(3):
+        await asyncio.sleep(0, loop=loop)
+    reader.feed_data(b''.join(msg(i) for i in range(2, 10)))
+    for _ in range(3):
+        await asyncio.sleep(0, loop=loop)
+    assert ch._queue.qsize() == 2
+    # reader is resumed to read unsubscribe reply
+    fut = conn.execute_pubsub('unsubscribe', ch)
+    reader.feed_data(b'*3\r\n$11\r\nunsubscribe\r\n$6\r\nchan:1\r\n:0\r\n')
+    assert await asyncio.wait_for(fut, .1, loop=loop) == [
+        [b'unsubscribe', b'chan:1', 0]]
+    assert not conn.in_pubsub
+    assert await ch.get_many() == [b'%d' % i for i in range(10)]
+    assert not ch.is_active
+    conn.close()
+    await conn.wait_closed()
+
+
+@pytest.mark.run_loop
+async def test_pubsub_messages_batch(loop):
+    reader = StreamReader(loop=loop)
+    conn = RedisConnection(reader, mock.Mock(), address=('localhost', 6379),
+                           loop=loop)
+    mpsc = Receiver(loop=loop)
+    ch1, ch2 = mpsc.channel('chan:1'), mpsc.channel('chan:2')
+    pch = Channel('chan:*', is_pattern=True, loop=loop)
+    fut = conn.execute_pubsub('subscribe', ch1, ch2)
+    fut2 = conn.execute_pubsub('psubscribe', pch)
+
+    def msg(chan, data):
+        return b'*3\r\n$7\r\nmessage\r\n$6\r\n%s\r\n$1\r\n%s\r\n' % (
+            chan, data)
+    reader.feed_data(
+        b'*3\r\n$9\r\nsubscribe\r\n$6\r\nchan:1\r\n:1\r\n'
+        b'*3\r\n$9\r\nsubscribe\r\n$6\r\nchan:2\r\n:2\r\n'
+        b'*3\r\n$10\r\npsubscribe\r\n$6\r\nchan:*\r\n:3\r\n' +
+        msg(b'chan:1', b'a') + msg(b'chan:1', b'b') +
+        msg(b'chan:2', b'c') + msg(b'chan:3', b'x') +
+        b'*4\r\n$8\r\npmessage\r\n$6\r\nchan:*\r\n'
+        b'$6\r\nchan:1\r\n$1\r\nd\r\n' +
+        msg(b'chan:1', b'e'))
+    await fut
+    await fut2
+    assert await mpsc.get_many() == [
+        (ch1, b'a'), (ch1, b'b'), (ch2, b'c'), (ch1, b'e')]
+    assert await pch.get() == (b'chan:1', b'd')
+    assert not conn.closed
+    conn.close()
+    await conn.wait_closed()
+
+
+@pytest.mark.run_loop
+async def test_execute_many(loop):
+    reader = StreamReader(loop=loop)
+    writer = mock.Mock()
+    conn = RedisConnection(reader, writer, address=('localhost', 6379),
+                           encoding='utf-8', loop=loop)
+    futs = conn.execute_many([('PUBLISH', 'chan:1', 'a'),
+                              (b'GET', 'key')])
+    assert writer.write.mock_calls == [mock.call(
+        b'*3\r\n$7\r\nPUBLISH\r\n$6\r\nchan:1\r\n$1\r\na\r\n'
+        b'*2\r\n$3\r\nGET\r\n$3\r\nkey\r\n')]
+    reader.feed_data(b':1\r\n$5\r\nvalue\r\n')
+    assert await asyncio.gather(*futs, loop=loop) == [1, 'value']
+
+    with pytest.raises(ValueError):
+        conn.execute_many([('GET', 'key'), ('SELECT', 1)])
+    with pytest.raises(TypeError):
+        conn.execute_many([('GET', None)])
+    assert len(writer.write.mock_calls) == 1
+    conn.close()
+    await conn.wait_closed()
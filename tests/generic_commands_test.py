@@ -603,6 +603,21 @@ async def test_scan(redis):
     assert len(test_values) == 10
 
 
+@pytest.redis_version(
+    6, 0, 0, reason='SCAN TYPE is available since redis>=6.0.0')
+@pytest.mark.run_loop
+async def test_scan_type(redis):
+    await redis.set('key:scan:type:string', 1)
+    await redis.rpush('key:scan:type:list', 1)
+
+    cursor, test_values = b'0', []
+    while cursor:
+        cursor, values = await redis.scan(
+            cursor=cursor, match=b'key:scan:type:*', key_type='list')
+        test_values.extend(values)
+    assert test_values == [b'key:scan:type:list']
+
+
 @pytest.mark.run_loop
 async def test_sort(redis):
     async def _make_list(key, items):
@@ -702,6 +717,25 @@ async def test_type(redis):
         await redis.type(None)
 
 
+@pytest.redis_version(4, 0, 0, reason='UNLINK is available since redis>=4.0.0')
+@pytest.mark.run_loop
+async def test_unlink(redis):
+    await add(redis, 'my-key', 123)
+    await add(redis, 'other-key', 123)
+
+    res = await redis.unlink('my-key', 'non-existent-key')
+    assert res == 1
+
+    res = await redis.unlink('other-key', 'other-key')
+    assert res == 1
+
+    with pytest.raises(TypeError):
+        await redis.unlink(None)
+
+    with pytest.raises(TypeError):
+        await redis.unlink('my-key', 'my-key', None)
+
+
 @pytest.redis_version(2, 8, 0, reason='SCAN is available since redis>=2.8.0')
 @pytest.mark.run_loop
 async def test_iscan(redis):
@@ -0,0 +1,153 @@
+import asyncio
+import pytest
+
+from aioredis.keyspace import (
+    KeyspaceEvent,
+    KeyspaceListener,
+    create_keyspace_listener,
+    notify_flags,
+    _merge_flags,
+    )
+
+
+class FakeRedis:
+
+    def __init__(self, config=''):
+        self.config = {'notify-keyspace-events': config}
+        self.calls = []
+        self.channels = {}
+
+    async def config_get(self, parameter):
+        return {parameter: self.config[parameter]}
+
+    async def config_set(self, parameter, value):
+        self.calls.append(('config_set', value))
+        self.config[parameter] = value
+
+    async def subscribe(self, *channels):
+        self.calls.append(('subscribe',) + tuple(ch.name for ch in channels))
+        self.channels.update((ch.name, ch) for ch in channels)
+
+    async def psubscribe(self, *channels):
+        self.calls.append(('psubscribe',) + tuple(ch.name for ch in channels))
+        self.channels.update((ch.name, ch) for ch in channels)
+
+    async def unsubscribe(self, *names):
+        self.calls.append(('unsubscribe',) + names)
+
+    async def punsubscribe(self, *names):
+        self.calls.append(('punsubscribe',) + names)
+
+
+def test_notify_flags():
+    assert notify_flags(keyevent=True) == 'AE'
+    assert notify_flags(['set', 'del', 'expired'], keyspace=True) == '$Kgx'
+    assert notify_flags(['unknown'], keyevent=True) == 'AE'
+
+
+def test_merge_flags():
+    assert _merge_flags('', 'E$') == '$E'
+    assert _merge_flags('KEA', 'E$') is None
+    assert _merge_flags('Kg', 'E$') == '$EKg'
+    assert _merge_flags('Eg$lshzxt', 'Ke') == 'AEK'
+    assert _merge_flags('AE', 'Em') == 'AEm'
+
+
+def test_subscriptions(loop):
+    listener = KeyspaceListener(None, loop=loop)
+    assert listener.channels == []
+    assert listener.patterns == [b'__keyevent@0__:*']
+    assert listener.flags == 'AE'
+
+    listener = KeyspaceListener(None, db=1, events=['set', b'del'],
+                                loop=loop)
+    assert listener.channels == [b'__keyevent@1__:del',
+                                 b'__keyevent@1__:set']
+    assert listener.patterns == []
+    assert listener.flags == '$Eg'
+
+    listener = KeyspaceListener(None, db=None, events=['set'], loop=loop)
+    assert listener.patterns == [b'__keyevent@*__:set']
+
+    listener = KeyspaceListener(None, prefixes=['user:', 'a*b'],
+                                events=['set'], loop=loop)
+    assert listener.channels == []
+    assert listener.patterns == [b'__keyspace@0__:user:*',
+                                 b'__keyspace@0__:a\\*b*']
+    assert listener.flags == '$K'
+
+
+@pytest.mark.run_loop
+async def test_configure(loop):
+    redis = FakeRedis('Kg')
+    await create_keyspace_listener(redis, events=['set'], loop=loop)
+    assert redis.calls == [
+        ('config_set', '$EKg'),
+        ('subscribe', b'__keyevent@0__:set'),
+        ]
+
+    redis = FakeRedis('AKE')
+    await create_keyspace_listener(redis, prefixes=['user:'], loop=loop)
+    assert redis.calls == [
+        ('psubscribe', b'__keyspace@0__:user:*'),
+        ]
+
+    redis = FakeRedis('')
+    await create_keyspace_listener(redis, configure=False, loop=loop)
+    assert redis.config == {'notify-keyspace-events': ''}
+
+
+@pytest.mark.run_loop
+async def test_keyevent_batches(loop):
+    redis = FakeRedis()
+    listener = await create_keyspace_listener(redis, events=['set', 'del'],
+                                              loop=loop)
+    redis.channels[b'__keyevent@0__:set'].put_nowait(b'user:1')
+    redis.channels[b'__keyevent@0__:del'].put_nowait(b'user:2')
+    redis.channels[b'__keyevent@0__:set'].put_nowait(b'user:3')
+
+    assert await listener.get_many() == [
+        KeyspaceEvent(0, b'user:1', 'set'),
+        KeyspaceEvent(0, b'user:2', 'del'),
+        KeyspaceEvent(0, b'user:3', 'set'),
+        ]
+    assert await listener.get_many(timeout=.01) == []
+
+    redis.channels[b'__keyevent@0__:del'].put_nowait(b'user:4')
+    assert await listener.get(encoding='utf-8') == KeyspaceEvent(
+        0, 'user:4', 'del')
+
+    await listener.stop()
+    assert redis.calls[-1] == (
+        'unsubscribe', b'__keyevent@0__:del', b'__keyevent@0__:set')
+    assert await listener.get() is None
+
+
+@pytest.mark.run_loop
+async def test_keyspace_filter(loop):
+    redis = FakeRedis()
+    listener = await create_keyspace_listener(
+        redis, db=None, prefixes=['user:'], events=['del', 'expired'],
+        loop=loop)
+    pattern = redis.channels[b'__keyspace@*__:user:*']
+    pattern.put_nowait((b'__keyspace@2__:user:1', b'set'))
+    pattern.put_nowait((b'__keyspace@2__:user:1', b'expired'))
+    pattern.put_nowait((b'__keyspace@3__:user:2:a', b'del'))
+
+    res = []
+
+    async def reader():
+        async for events in listener.iter_batches():
+            res.extend(events)
+
+    tsk = asyncio.ensure_future(reader(), loop=loop)
+    await asyncio.sleep(0, loop=loop)
+    pattern.put_nowait((b'__keyspace@2__:user:1', b'hset'))
+    await asyncio.sleep(0, loop=loop)
+    await listener.stop()
+    await tsk
+    assert res == [
+        KeyspaceEvent(2, b'user:1', 'expired'),
+        KeyspaceEvent(3, b'user:2:a', 'del'),
+        ]
+    assert redis.calls[-1] == ('punsubscribe', b'__keyspace@*__:user:*')
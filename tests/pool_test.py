@@ -552,3 +552,74 @@ async def test_async_with(create_pool, server, loop):
     async with pool.get() as conn:
         msg = await conn.execute('echo', 'hello')
         assert msg == b'hello'
+
+
+@pytest.mark.run_loop
+async def test_blocking_lane(create_pool, server, loop):
+    pool = await create_pool(
+        server.tcp_address,
+        minsize=1, maxsize=1, blocking_maxsize=1, loop=loop)
+    assert pool.blocking_maxsize == 1
+
+    pop1 = asyncio.ensure_future(
+        pool.execute('blpop', 'lane:list', 0), loop=loop)
+    pop2 = asyncio.ensure_future(
+        pool.execute(b'BLPOP', 'lane:list', 0), loop=loop)
+    await asyncio.sleep(.01, loop=loop)
+    assert pool.blocking_size == 1
+    assert pool.size == 1
+
+    with async_timeout.timeout(1, loop=loop):
+        assert await pool.execute('ping') == b'PONG'
+        assert await pool.execute('rpush', 'lane:list', 'a', 'b') == 2
+        assert await pop1 == [b'lane:list', b'a']
+        assert await pop2 == [b'lane:list', b'b']
+    assert pool.blocking_size == 1
+
+    pop = asyncio.ensure_future(
+        pool.execute('blpop', 'lane:list', 0), loop=loop)
+    await asyncio.sleep(.01, loop=loop)
+    pop.cancel()
+    await asyncio.sleep(.01, loop=loop)
+    # connection with cancelled command is closed
+    assert pool.blocking_size == 0
+
+
+@pytest.mark.run_loop
+async def test_blocking_lane_slow_connect(loop):
+    pool = ConnectionsPool(('localhost', 6379), minsize=0, maxsize=1,
+                           blocking_maxsize=2, loop=loop)
+    connecting = []
+
+    class FakeConnection:
+        db = 0
+        closed = False
+        _waiters = ()
+
+    async def create_connection(address):
+        fut = loop.create_future()
+        connecting.append(fut)
+        return await fut
+
+    pool._create_new_connection = create_connection
+    slow = asyncio.ensure_future(pool._acquire_blocking(), loop=loop)
+    fast = asyncio.ensure_future(pool._acquire_blocking(), loop=loop)
+    await asyncio.sleep(0, loop=loop)
+    # slow connect does not block other acquires
+    assert len(connecting) == 2
+    conn = FakeConnection()
+    connecting[1].set_result(conn)
+    assert await fast is conn
+    waiter = asyncio.ensure_future(pool._acquire_blocking(), loop=loop)
+    await asyncio.sleep(0, loop=loop)
+    assert not waiter.done()
+
+    # failed connect gives slot back to waiting acquire
+    connecting[0].set_exception(ConnectionRefusedError())
+    with pytest.raises(ConnectionRefusedError):
+        await slow
+    await asyncio.sleep(0, loop=loop)
+    assert len(connecting) == 3
+    connecting[2].set_result(FakeConnection())
+    assert await waiter is not conn
+    assert pool.blocking_size == 2
@@ -1,4 +1,5 @@
 import asyncio
+import json
 import pytest
 import aioredis
 
@@ -46,6 +47,25 @@ async def test_publish_json(create_connection, redis, server, loop):
     sub.cancel()
 
 
+@pytest.mark.run_loop
+async def test_publish_many(create_redis, redis, server, loop):
+    sub = await create_redis(server.tcp_address, loop=loop)
+    ch1, ch2 = await sub.subscribe('chan:1', 'chan:2')
+
+    res = await redis.publish_many([
+        ('chan:1', 'Hello'), ('chan:2', 'world'), ('chan:3', '!')])
+    assert res == [1, 1, 0]
+    assert await ch1.get() == b'Hello'
+    assert await ch2.get() == b'world'
+
+    res = await redis.publish_many(
+        [('chan:1', {"Hello": "world"})], serializer=json.dumps,
+        in_executor=True)
+    assert res == [1]
+    assert await ch1.get_json() == {"Hello": "world"}
+    assert await redis.publish_many([]) == []
+
+
 @pytest.mark.run_loop
 async def test_subscribe(redis):
     res = await redis.subscribe('chan:1', 'chan:2')
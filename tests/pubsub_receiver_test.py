@@ -5,9 +5,19 @@ import sys
 
 from unittest import mock
 
-from aioredis import ChannelClosedError
+from aioredis import ChannelClosedError, ChannelOverflowError
 from aioredis.abc import AbcChannel
-from aioredis.pubsub import Receiver, _Sender
+from aioredis.pubsub import (
+    BroadcastChannel,
+    Broadcaster,
+    Channel,
+    GapMarker,
+    Receiver,
+    _Sender,
+    OVERFLOW_DROP_NEWEST,
+    OVERFLOW_PAUSE,
+    OVERFLOW_RAISE,
+)
 
 
 def test_listener_channel(loop):
@@ -327,3 +337,244 @@ async def test_pubsub_receiver_call_stop_with_empty_queue(
     dt = loop.time() - now
     assert dt <= 1.5
     assert not mpsc.is_active
+
+
+@pytest.mark.run_loop
+async def test_channel_overflow_drop(loop):
+    ch = Channel('chan:1', is_pattern=False, loop=loop, maxsize=2)
+    assert ch.maxsize == 2
+    for msg in (b'1', b'2', b'3'):
+        assert ch.put_nowait(msg) is None
+    assert ch.dropped == 1
+    assert await ch.get() == b'2'
+    assert await ch.get() == b'3'
+
+    ch = Channel('chan:1', is_pattern=False, loop=loop,
+                 maxsize=2, overflow=OVERFLOW_DROP_NEWEST)
+    for msg in (b'1', b'2', b'3'):
+        ch.put_nowait(msg)
+    assert ch.dropped == 1
+    # neither gap nor end of stream marker is ever dropped
+    ch.put_nowait(GapMarker)
+    ch.close()
+    assert ch.dropped == 1
+    assert await ch.get() == b'1'
+    assert await ch.get() == b'2'
+    assert await ch.get() is GapMarker
+    assert await ch.get() is None
+    assert not ch.is_active
+
+
+@pytest.mark.run_loop
+async def test_channel_overflow_raise(loop):
+    ch = Channel('chan:1', is_pattern=False, loop=loop,
+                 maxsize=1, overflow=OVERFLOW_RAISE)
+    ch.put_nowait(b'1')
+    ch.put_nowait(b'2')
+    ch.put_nowait(b'3')
+    with pytest.raises(ChannelOverflowError):
+        await ch.get()
+    assert ch.dropped == 2
+    assert await ch.get() == b'1'
+
+
+@pytest.mark.run_loop
+async def test_channel_overflow_pause(loop):
+    ch = Channel('chan:1', is_pattern=False, loop=loop,
+                 maxsize=2, overflow=OVERFLOW_PAUSE)
+    assert ch.put_nowait(b'1') is None
+    waiter = ch.put_nowait(b'2')
+    assert waiter is not None
+    assert ch.put_nowait(b'3') is waiter
+    assert await ch.get() == b'1'
+    assert not waiter.done()
+    assert await ch.get() == b'2'
+    assert waiter.done()
+    assert ch.dropped == 0
+
+    waiter = ch.put_nowait(b'4')
+    ch.close()
+    assert waiter.done()
+
+
+@pytest.mark.run_loop
+async def test_receiver_overflow(loop):
+    mpsc = Receiver(loop=loop, maxsize=2)
+    snd = mpsc.channel('chan:1')
+    for msg in (b'1', b'2', b'3'):
+        snd.put_nowait(msg)
+    assert mpsc.dropped == 1
+    snd.put_nowait(GapMarker)
+    assert mpsc.dropped == 1
+    assert await mpsc.get() == (snd, b'2')
+    assert await mpsc.get() == (snd, b'3')
+    assert await mpsc.get() == (snd, GapMarker)
+
+    mpsc = Receiver(loop=loop, maxsize=1, overflow=OVERFLOW_RAISE)
+    snd = mpsc.channel('chan:1')
+    snd.put_nowait(b'1')
+    snd.put_nowait(b'2')
+    with pytest.raises(ChannelOverflowError):
+        await mpsc.get()
+    assert await mpsc.get() == (snd, b'1')
+
+    mpsc = Receiver(loop=loop, maxsize=1, overflow=OVERFLOW_PAUSE)
+    snd = mpsc.channel('chan:1')
+    waiter = snd.put_nowait(b'1')
+    assert waiter is not None and not waiter.done()
+    mpsc.stop()
+    assert waiter.done()
+
+
+@pytest.mark.run_loop
+async def test_channel_get_many(loop):
+    # channel created without loop
+    ch = Channel('chan:1', is_pattern=False)
+    assert await ch.get_many(timeout=0.01) == []
+    for msg in (b'1', b'2', b'3'):
+        ch.put_nowait(msg)
+    assert await ch.get_many(2, encoding='utf-8') == ['1', '2']
+    assert await ch.get_many(decoder=json.loads) == [3]
+    loop.call_soon(ch.put_nowait, b'[4]')
+    assert await ch.get_many(decoder=json.loads) == [[4]]
+
+    ch.put_nowait(b'5')
+    ch.close()
+    assert await ch.get_many() == [b'5']
+    assert await ch.get_many() == []
+    with pytest.raises(ChannelClosedError):
+        await ch.get_many()
+
+    ch = Channel('chan:*', is_pattern=True, loop=loop)
+    ch.put_nowait((b'chan:1', b'1'))
+    ch.put_nowait((b'chan:2', b'2'))
+    assert await ch.get_many(encoding='utf-8') == [
+        (b'chan:1', '1'), (b'chan:2', '2')]
+
+
+@pytest.mark.run_loop
+async def test_channel_iter_batches(loop):
+    ch = Channel('chan:1', is_pattern=False, loop=loop)
+    for msg in (b'1', b'2', b'3'):
+        ch.put_nowait(msg)
+
+    async def produce():
+        await asyncio.sleep(0, loop=loop)
+        ch.put_nowait(b'4')
+        ch.close()
+    asyncio.ensure_future(produce(), loop=loop)
+
+    batches = []
+    async for msgs in ch.iter_batches(2):  # noqa
+        batches.append(msgs)
+    assert batches == [[b'1', b'2'], [b'3'], [b'4']]
+    assert not ch.is_active
+
+
+@pytest.mark.run_loop
+async def test_receiver_get_many(loop):
+    mpsc = Receiver(loop=loop)
+    assert await mpsc.get_many() == []
+    snd1 = mpsc.channel('chan:1')
+    snd2 = mpsc.pattern('chan:*')
+    assert await mpsc.get_many(timeout=0.01) == []
+    snd1.put_nowait(b'1')
+    snd2.put_nowait((b'chan:2', b'2'))
+    assert await mpsc.get_many(encoding='utf-8') == [
+        (snd1, '1'), (snd2, (b'chan:2', '2'))]
+
+    snd1.put_nowait(b'3')
+    snd1.put_nowait(b'4')
+    mpsc.stop()
+    batches = []
+    async for msgs in mpsc.iter_batches(1):  # noqa
+        batches.append(msgs)
+    assert batches == [[(snd1, b'3')], [(snd1, b'4')]]
+    with pytest.raises(ChannelClosedError):
+        await mpsc.get_many()
+
+
+def _closed_messages(ch):
+    assert ch._closed
+    msgs = []
+    while ch._queue.qsize() > 1:
+        msgs.append(ch._queue.get_nowait())
+    return msgs
+
+
+def test_broadcast_channel(loop):
+    bc = BroadcastChannel('chan:1', is_pattern=False, loop=loop)
+    assert isinstance(bc, AbcChannel)
+    assert bc.name == b'chan:1'
+    ch1 = bc.subscribe()
+    ch2 = bc.subscribe(maxsize=1, overflow=OVERFLOW_PAUSE)
+    assert bc.subscribers == 2
+
+    assert bc.put_nowait(b'1') is not None
+    assert ch1._queue.qsize() == ch2._queue.qsize() == 1
+
+    assert not bc.unsubscribe(ch2)
+    assert _closed_messages(ch2) == [b'1']
+    assert bc.put_nowait(b'2') is None
+
+    bc.close()
+    assert not bc.is_active
+    assert ch1._closed
+    assert bc.subscribers == 0
+
+
+class FakeRedis:
+
+    def __init__(self):
+        self.calls = []
+        self.channels = {}
+
+    async def subscribe(self, ch):
+        self.calls.append(('subscribe', ch.name))
+        self.channels[ch.name] = ch
+
+    async def psubscribe(self, ch):
+        self.calls.append(('psubscribe', ch.name))
+        self.channels[ch.name] = ch
+
+    async def unsubscribe(self, name):
+        self.calls.append(('unsubscribe', name))
+        self.channels.pop(name).close()
+
+    async def punsubscribe(self, name):
+        self.calls.append(('punsubscribe', name))
+        self.channels.pop(name).close()
+
+
+@pytest.mark.run_loop
+async def test_broadcaster(loop):
+    redis = FakeRedis()
+    broadcaster = Broadcaster(redis, loop=loop)
+
+    ch1 = await broadcaster.subscribe('chan:1')
+    ch2 = await broadcaster.subscribe(b'chan:1')
+    pch = await broadcaster.psubscribe('chan:*')
+    assert redis.calls == [('subscribe', b'chan:1'),
+                           ('psubscribe', b'chan:*')]
+
+    redis.channels[b'chan:1'].put_nowait(b'hello')
+    redis.channels[b'chan:*'].put_nowait((b'chan:1', b'hello'))
+    assert await ch1.get() == b'hello'
+    assert await ch2.get() == b'hello'
+    assert await pch.get() == (b'chan:1', b'hello')
+
+    await broadcaster.unsubscribe(ch1)
+    assert not ch1.is_active
+    assert len(redis.calls) == 2
+    await broadcaster.unsubscribe(ch2)
+    await broadcaster.unsubscribe(pch)
+    assert redis.calls[2:] == [('unsubscribe', b'chan:1'),
+                               ('punsubscribe', b'chan:*')]
+
+    # subscription closed by connection is made again
+    ch = await broadcaster.subscribe('chan:2')
+    redis.channels[b'chan:2'].close()
+    assert not ch.is_active
+    ch = await broadcaster.subscribe('chan:2')
+    assert redis.calls[-2:] == [('subscribe', b'chan:2'),
+                                ('subscribe', b'chan:2')]
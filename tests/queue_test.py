@@ -0,0 +1,108 @@
+import asyncio
+import pytest
+
+from aioredis.queue import QueueConsumer
+
+
+async def consume(consumer, count):
+    res = []
+    async for item in consumer:
+        res.append(item)
+        if len(res) == count:
+            break
+    return res
+
+
+@pytest.mark.run_loop
+async def test_consume(redis, loop):
+    await redis.lpush('queue', *range(10))
+    consumer = QueueConsumer(redis, 'queue', 'c1', prefetch=3,
+                             ack_batch=4, loop=loop)
+    assert consumer.processing == b'queue:processing:c1'
+    res = await consume(consumer, 10)
+    assert res == [b'%d' % i for i in range(10)]
+    await consumer.close()
+    # last item is acknowledged on close
+    assert await redis.lrange('queue:processing:c1', 0, -1) == []
+    assert await redis.llen('queue') == 0
+    assert await redis.smembers('queue:consumers') == []
+    assert not await redis.exists('queue:alive:c1')
+
+
+@pytest.mark.run_loop
+async def test_wait_item(redis, create_redis, server, loop):
+    producer = await create_redis(server.tcp_address, loop=loop)
+    consumer = QueueConsumer(redis, 'queue', 'c1', timeout=1, loop=loop)
+    fut = asyncio.ensure_future(consume(consumer, 1), loop=loop)
+    await asyncio.sleep(.1, loop=loop)
+    assert not fut.done()
+    await producer.lpush('queue', 'item')
+    assert await fut == [b'item']
+    await consumer.close()
+
+
+@pytest.mark.run_loop
+async def test_manual_ack(redis, loop):
+    await redis.lpush('queue', 'a', 'b', 'c')
+    consumer = QueueConsumer(redis, 'queue', 'c1', auto_ack=False,
+                             loop=loop)
+    res = await consume(consumer, 3)
+    assert res == [b'a', b'b', b'c']
+    consumer.ack(b'b')
+    await consumer.flush_acks()
+    assert await redis.lrange('queue:processing:c1', 0, -1) == [b'c', b'a']
+    await consumer.close()
+
+    # unacknowledged items are yielded first after restart
+    await redis.lpush('queue', 'd')
+    consumer = QueueConsumer(redis, 'queue', 'c1', loop=loop)
+    assert await consume(consumer, 3) == [b'a', b'c', b'd']
+    await consumer.close()
+
+
+@pytest.mark.run_loop
+async def test_heartbeat(redis, loop):
+    await redis.lpush('queue', 'a')
+    consumer = QueueConsumer(redis, 'queue', 'c1', auto_ack=False,
+                             visibility_timeout=300, loop=loop)
+    assert await consume(consumer, 1) == [b'a']
+    await asyncio.sleep(.5, loop=loop)
+    # alive while item is processed
+    assert await redis.exists('queue:alive:c1')
+    await consumer.close()
+    # unacknowledged item is kept for requeue
+    assert await redis.smembers('queue:consumers') == [b'c1']
+    await asyncio.sleep(.4, loop=loop)
+    assert not await redis.exists('queue:alive:c1')
+
+
+@pytest.mark.run_loop
+async def test_requeue_dead(redis, loop):
+    await redis.lpush('queue', 'a', 'b', 'c')
+    dead = QueueConsumer(redis, 'queue', 'dead', prefetch=2,
+                         visibility_timeout=100, loop=loop)
+    assert await consume(dead, 1) == [b'a']
+    await asyncio.sleep(.01, loop=loop)     # let next batch be prefetched
+    await dead.close()
+
+    consumer = QueueConsumer(redis, 'queue', 'alive', loop=loop)
+    assert await consumer.requeue_dead() == 0
+    await asyncio.sleep(.2, loop=loop)
+    # last yielded item was acknowledged on close
+    assert await consumer.requeue_dead() == 2
+    assert await redis.smembers('queue:consumers') == []
+    assert await consume(consumer, 2) == [b'b', b'c']
+    await consumer.close()
+
+
+def test_invalid_args(loop):
+    with pytest.raises(TypeError):
+        QueueConsumer(None, 'queue', timeout=.5, loop=loop)
+    with pytest.raises(ValueError):
+        QueueConsumer(None, 'queue', timeout=0, loop=loop)
+    with pytest.raises(AssertionError):
+        QueueConsumer(None, 'queue', prefetch=0, loop=loop)
+    with pytest.raises(AssertionError):
+        QueueConsumer(None, 'queue', visibility_timeout=0, loop=loop)
+    consumer = QueueConsumer(None, 'queue', loop=loop)
+    assert consumer.processing.startswith(b'queue:processing:')
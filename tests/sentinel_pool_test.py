@@ -0,0 +1,462 @@
+import asyncio
+import pytest
+
+from aioredis import ReplyError
+from aioredis.errors import MasterNotFoundError, MasterReplyError
+from aioredis.sentinel import (
+    SLAVE_RANDOM,
+    SLAVE_ROUND_ROBIN,
+    SLAVE_LOWEST_LATENCY,
+    SLAVE_LOWEST_LAG,
+)
+from aioredis.sentinel.pool import SentinelPool
+
+
+class FakeConnection:
+    in_transaction = in_pubsub = False
+    db = 0
+
+    def __init__(self, address, role='master', delays=None):
+        self.address = address
+        self.closed = False
+        self.role = role
+        self.delays = delays or {}
+        self._waiters = ()
+
+    async def execute(self, command, *args, **kwargs):
+        await asyncio.sleep(self.delays.get(self.address, 0))
+        if command == 'ping':
+            return b'PONG'
+        assert command == b'role'
+        return [self.role]
+
+    def close(self):
+        self.closed = True
+
+    async def wait_closed(self):
+        pass
+
+
+class FakeSentinel:
+    """Replies to SENTINEL MASTER with given address after delay."""
+
+    def __init__(self, reply, delay=0, *, loop):
+        self.reply = reply
+        self.delay = delay
+        self.calls = 0
+        self.loop = loop
+
+    async def execute(self, *args, **kwargs):
+        self.calls += 1
+        await asyncio.sleep(self.delay, loop=self.loop)
+        if isinstance(self.reply, Exception):
+            raise self.reply
+        if self.reply is None:
+            return []
+        ip, port = self.reply
+        return ['ip', ip, 'port', str(port), 'flags', 'master']
+
+    def close(self):
+        pass
+
+    async def wait_closed(self):
+        pass
+
+
+class FakeSlavesSentinel:
+    """Replies to SENTINEL SLAVES with given slaves states."""
+
+    def __init__(self, *slaves):
+        self.slaves = slaves
+        self.calls = 0
+
+    async def execute(self, *args, **kwargs):
+        self.calls += 1
+        return [['ip', ip, 'port', str(port),
+                 'flags', flags, 'slave-repl-offset', str(offset)]
+                for (ip, port), flags, offset in self.slaves]
+
+    def close(self):
+        pass
+
+    async def wait_closed(self):
+        pass
+
+
+@pytest.fixture
+def sentinel_pool(loop):
+    pool = SentinelPool([('127.0.0.1', 26379)],
+                        minsize=1, maxsize=2, timeout=0.2, loop=loop)
+    yield pool
+    pool.close()
+    loop.run_until_complete(pool.wait_closed())
+
+
+def _with_sentinels(pool, *sentinels, roles=None):
+    pool._pools[:] = sentinels
+    master = pool.master_for('main')
+    connected = []
+
+    async def create_connection(address):
+        connected.append(address)
+        return FakeConnection(address, (roles or {}).get(address, 'master'))
+
+    master._create_new_connection = create_connection
+    return connected
+
+
+def _discovered(pool, address):
+    pool._address = address
+    conn = FakeConnection(address)
+    pool._pool.append(conn)
+    return conn
+
+
+@pytest.mark.run_loop
+async def test_switch_master_event(sentinel_pool, loop):
+    master = sentinel_pool.master_for('main')
+    slave = sentinel_pool.slave_for('main')
+    other = sentinel_pool.master_for('other')
+    free = _discovered(master, ('127.0.0.1', 6379))
+    _discovered(slave, ('127.0.0.1', 6380))
+    _discovered(other, ('127.0.0.1', 6390))
+
+    sentinel_pool._monitor.pattern('*').put_nowait(
+        (b'+switch-master', b'main 127.0.0.1 6379 127.0.0.1 6380'))
+    for _ in range(3):
+        await asyncio.sleep(0, loop=loop)
+
+    assert master.address == ('127.0.0.1', 6380)
+    assert free.closed
+    assert master.freesize == 0
+    assert slave.address is None
+    assert other.address == ('127.0.0.1', 6390)
+
+
+@pytest.mark.run_loop
+async def test_switch_drains_used_connections(sentinel_pool, loop):
+    master = sentinel_pool.master_for('main')
+    used = FakeConnection(('127.0.0.1', 6379))
+    master._address = ('127.0.0.1', 6379)
+    master._used.add(used)
+
+    master.switch_address(('127.0.0.1', 6380))
+    assert not used.closed
+    master.release(used)
+    assert used.closed
+    assert master.size == 0
+    # no rediscovery is needed
+    assert master.address == ('127.0.0.1', 6380)
+
+
+@pytest.mark.run_loop
+async def test_switch_drops_free_blocking_connections(sentinel_pool, loop):
+    old, new = ('127.0.0.1', 6379), ('127.0.0.1', 6380)
+    connected = _with_sentinels(sentinel_pool)
+    master = sentinel_pool.master_for('main')
+    master._address = old
+    free = FakeConnection(old)
+    master._blocking_pool.append(free)
+
+    sentinel_pool._monitor.pattern('*').put_nowait(
+        (b'+switch-master', b'main 127.0.0.1 6379 127.0.0.1 6380'))
+    for _ in range(3):
+        await asyncio.sleep(0, loop=loop)
+    assert free.closed
+    assert master.blocking_size == 0
+    conn = await master._acquire_blocking()
+    assert conn.address == new
+    master._release_blocking(conn)
+
+    # connection to demoted master left free while address was changed
+    stale = FakeConnection(old)
+    master._blocking_pool.appendleft(stale)
+    conn = await master._acquire_blocking()
+    assert stale.closed
+    assert conn.address == new
+    assert connected == [new]
+
+
+def test_sdown_events(sentinel_pool):
+    master = sentinel_pool.master_for('main')
+    slave = sentinel_pool.slave_for('main')
+    other = sentinel_pool.master_for('other')
+    _discovered(master, ('127.0.0.1', 6379))
+    _discovered(slave, ('127.0.0.1', 6380))
+    _discovered(other, ('127.0.0.1', 6390))
+
+    # master is subjectively down, failover is not decided yet
+    sentinel_pool._handle_event('+sdown', 'master main 127.0.0.1 6379')
+    assert master.address == ('127.0.0.1', 6379)
+
+    sentinel_pool._handle_event(
+        '+sdown',
+        'slave 127.0.0.1:6381 127.0.0.1 6381 @ main 127.0.0.1 6379')
+    assert slave.address == ('127.0.0.1', 6380)
+    sentinel_pool._handle_event(
+        '+slave', 'slave 127.0.0.1:6381 127.0.0.1 6381 @ main 127.0.0.1 6379')
+    sentinel_pool._handle_event(
+        '+sdown',
+        'slave 127.0.0.1:6380 127.0.0.1 6380 @ main 127.0.0.1 6379')
+    assert slave.address is None
+
+    sentinel_pool._handle_event('+odown', 'master main 127.0.0.1 6379 #q 2')
+    assert master.address is None
+    assert other.address == ('127.0.0.1', 6390)
+
+    # malformed events are ignored
+    sentinel_pool._handle_event('+switch-master', 'main 127.0.0.1')
+    sentinel_pool._handle_event('+sdown', 'slave x 127.0.0.1 port @ main')
+
+
+@pytest.mark.run_loop
+async def test_discover_master_quorum(sentinel_pool, loop):
+    old, new = ('127.0.0.1', 6379), ('127.0.0.1', 6380)
+    sentinels = [
+        FakeSentinel(old, loop=loop),
+        FakeSentinel(new, 0.01, loop=loop),
+        FakeSentinel(new, 0.02, loop=loop),
+        FakeSentinel(new, 10, loop=loop),
+    ]
+    connected = _with_sentinels(sentinel_pool, *sentinels)
+    sentinel_pool._quorum = 2
+
+    started = loop.time()
+    conn = await sentinel_pool.discover_master('main', timeout=1)
+    assert loop.time() - started < 0.5
+    assert conn.address == new
+    assert connected == [new]
+
+    # verified address is cached
+    conn = await sentinel_pool.discover_master('main', timeout=1)
+    assert conn.address == new
+    assert [s.calls for s in sentinels] == [1, 1, 1, 1]
+
+    # +odown drops cached address
+    sentinel_pool._handle_event('+odown', 'master main 127.0.0.1 6380 #q 2')
+    await sentinel_pool.discover_master('main', timeout=1)
+    assert [s.calls for s in sentinels] == [2, 2, 2, 2]
+
+
+@pytest.mark.run_loop
+async def test_discover_master_quorum_fallback(sentinel_pool, loop):
+    old, new = ('127.0.0.1', 6379), ('127.0.0.1', 6380)
+    # fastest sentinel reports demoted master
+    sentinels = [
+        FakeSentinel(old, loop=loop),
+        FakeSentinel(new, 0.01, loop=loop),
+    ]
+    connected = _with_sentinels(
+        sentinel_pool, *sentinels, roles={old: 'slave'})
+
+    conn = await sentinel_pool.discover_master('main', timeout=1)
+    assert conn.address == new
+    assert connected == [old, new]
+    assert sentinel_pool._masters_cache['main'][0] == new
+
+
+@pytest.mark.run_loop
+async def test_need_rediscover_drops_cache(sentinel_pool, loop):
+    address = ('127.0.0.1', 6379)
+    sentinel = FakeSentinel(address, loop=loop)
+    _with_sentinels(sentinel_pool, sentinel)
+    master = sentinel_pool.master_for('main')
+    await sentinel_pool.discover_master('main', timeout=1)
+    assert sentinel.calls == 1
+
+    # connection closed while used
+    conn = _discovered(master, address)
+    master._pool.remove(conn)
+    master._used.add(conn)
+    conn.close()
+    master.release(conn)
+    assert master.address is None
+    await sentinel_pool.discover_master('main', timeout=1)
+    assert sentinel.calls == 2
+
+
+@pytest.mark.run_loop
+async def test_discover_master_cache_role_mismatch(sentinel_pool, loop):
+    old, new = ('127.0.0.1', 6379), ('127.0.0.1', 6380)
+    sentinel = FakeSentinel(new, loop=loop)
+    connected = _with_sentinels(
+        sentinel_pool, sentinel, roles={old: 'slave'})
+    sentinel_pool._masters_cache['main'] = (old, loop.time() + 10)
+
+    conn = await sentinel_pool.discover_master('main', timeout=1)
+    assert conn.address == new
+    assert connected == [old, new]
+    assert sentinel_pool._masters_cache['main'][0] == new
+
+    # expired cache is not used
+    sentinel_pool._masters_cache['main'] = (old, loop.time() - 1)
+    conn = await sentinel_pool.discover_master('main', timeout=1)
+    assert connected == [old, new, new]
+
+
+@pytest.mark.run_loop
+async def test_discover_master_not_found(sentinel_pool, loop):
+    address = ('127.0.0.1', 6379)
+    _with_sentinels(
+        sentinel_pool,
+        FakeSentinel(address, 10, loop=loop),
+        FakeSentinel(None, loop=loop),
+    )
+    with pytest.raises(MasterNotFoundError):
+        await sentinel_pool.discover_master('main', timeout=0.05)
+
+    _with_sentinels(
+        sentinel_pool,
+        FakeSentinel(ReplyError('ERR No such master'), loop=loop),
+        FakeSentinel(None, loop=loop),
+    )
+    with pytest.raises(MasterReplyError):
+        await sentinel_pool.discover_master('main', timeout=0.05)
+
+    _with_sentinels(
+        sentinel_pool, FakeSentinel(address, loop=loop),
+        roles={address: 'slave'})
+    with pytest.raises(MasterNotFoundError):
+        await sentinel_pool.discover_master('main', timeout=0.05)
+
+
+def _with_slaves(pool, *slaves, down=(), delays=None):
+    pool._pools[:] = [FakeSlavesSentinel(*slaves)]
+    slave = pool.slave_for('main')
+    connected = []
+
+    async def connect(address):
+        if address in down:
+            raise ConnectionRefusedError(address)
+        connected.append(address)
+        return FakeConnection(address, 'slave', delays)
+
+    slave._connect = connect
+    return connected
+
+
+SLAVES = [
+    (('127.0.0.1', 6380), 'slave', 100),
+    (('127.0.0.1', 6381), 'slave', 300),
+    (('127.0.0.1', 6382), 'slave,s_down', 500),
+    (('127.0.0.1', 6383), 'slave', 200),
+]
+
+
+@pytest.mark.run_loop
+async def test_discover_slave_first(sentinel_pool, loop):
+    connected = _with_slaves(sentinel_pool, *SLAVES)
+    for _ in range(3):
+        conn = await sentinel_pool.discover_slave('main', timeout=1)
+        assert conn.address == ('127.0.0.1', 6380)
+    # slaves list is cached
+    assert sentinel_pool._pools[0].calls == 1
+    assert len(connected) == 3
+
+
+@pytest.mark.run_loop
+async def test_discover_slave_round_robin(sentinel_pool, loop):
+    sentinel_pool._slave_selection = SLAVE_ROUND_ROBIN
+    connected = _with_slaves(sentinel_pool, *SLAVES)
+    for _ in range(4):
+        await sentinel_pool.discover_slave('main', timeout=1)
+    assert connected == [('127.0.0.1', 6380), ('127.0.0.1', 6381),
+                         ('127.0.0.1', 6383), ('127.0.0.1', 6380)]
+
+
+@pytest.mark.run_loop
+async def test_discover_slave_random(sentinel_pool, loop):
+    sentinel_pool._slave_selection = SLAVE_RANDOM
+    connected = _with_slaves(sentinel_pool, *SLAVES)
+    for _ in range(30):
+        await sentinel_pool.discover_slave('main', timeout=1)
+    assert set(connected) == {('127.0.0.1', 6380), ('127.0.0.1', 6381),
+                              ('127.0.0.1', 6383)}
+
+
+@pytest.mark.run_loop
+async def test_discover_slave_lowest_lag(sentinel_pool, loop):
+    sentinel_pool._slave_selection = SLAVE_LOWEST_LAG
+    _with_slaves(sentinel_pool, *SLAVES)
+    conn = await sentinel_pool.discover_slave('main', timeout=1)
+    assert conn.address == ('127.0.0.1', 6381)
+
+
+@pytest.mark.run_loop
+async def test_discover_slave_lowest_latency(sentinel_pool, loop):
+    sentinel_pool._slave_selection = SLAVE_LOWEST_LATENCY
+    sentinel_pool._slaves_latency.update({
+        ('127.0.0.1', 6380): 0.01,
+        ('127.0.0.1', 6381): 0.002,
+    })
+    connected = _with_slaves(
+        sentinel_pool, *SLAVES, down=[('127.0.0.1', 6383)])
+    # not measured slave is probed first and penalized when down
+    with pytest.raises(ConnectionRefusedError):
+        await sentinel_pool._connect_slave(
+            'main', ('127.0.0.1', 6383), timeout=1)
+    assert sentinel_pool._slaves_latency[('127.0.0.1', 6383)] == 1
+    conn = await sentinel_pool.discover_slave('main', timeout=1)
+    assert conn.address == ('127.0.0.1', 6381)
+    assert connected == [('127.0.0.1', 6381)]
+
+
+@pytest.mark.run_loop
+async def test_probe_slaves_latency(loop):
+    pool = SentinelPool([('127.0.0.1', 26379)],
+                        minsize=1, maxsize=1, timeout=0.2,
+                        slave_selection=SLAVE_LOWEST_LATENCY,
+                        latency_probe_interval=0.01, loop=loop)
+    fast, slow = ('127.0.0.1', 6380), ('127.0.0.1', 6381)
+    delays = {('127.0.0.1', 6381): 0.02, ('127.0.0.1', 6383): 0.02}
+    try:
+        _with_slaves(pool, *SLAVES, delays=delays)
+        slave = pool.slave_for('main')
+        slave.release(await slave.acquire())
+        assert slave.address == fast
+
+        # first slave slows down
+        delays.update({fast: 0.02, slow: 0})
+        for _ in range(100):
+            await asyncio.sleep(0.01, loop=loop)
+            if slave.address != fast:
+                break
+        assert slave.address == slow
+        assert pool._slaves_latency[slow] < pool._slaves_latency[fast]
+        conn = await slave.acquire()
+        assert conn.address == slow
+        slave.release(conn)
+    finally:
+        pool.close()
+        await pool.wait_closed()
+    assert pool._probe_conns == {}
+
+
+@pytest.mark.run_loop
+async def test_discover_slave_custom_selection(sentinel_pool, loop):
+    sentinel_pool._slave_selection = lambda slaves: slaves[-1]
+    _with_slaves(sentinel_pool, *SLAVES)
+    conn = await sentinel_pool.discover_slave('main', timeout=1)
+    assert conn.address == ('127.0.0.1', 6383)
+
+
+@pytest.mark.run_loop
+async def test_spread_slaves(loop):
+    pool = SentinelPool([('127.0.0.1', 26379)],
+                        minsize=3, maxsize=3, timeout=0.2,
+                        slave_selection=SLAVE_ROUND_ROBIN,
+                        spread_slaves=True, loop=loop)
+    try:
+        connected = _with_slaves(pool, *SLAVES)
+        slave = pool.slave_for('main')
+        conn = await slave.acquire()
+        assert slave.size == 3
+        assert sorted(connected) == [('127.0.0.1', 6380),
+                                     ('127.0.0.1', 6381),
+                                     ('127.0.0.1', 6383)]
+        # connections to other slaves are kept on release
+        slave.release(conn)
+        assert slave.freesize == 3
+    finally:
+        pool.close()
+        await pool.wait_closed()
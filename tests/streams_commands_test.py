@@ -0,0 +1,178 @@
+import asyncio
+import pytest
+
+from aioredis import ReplyError
+from aioredis.commands.streams import StreamGroupConsumer, parse_messages
+
+
+streams_test = pytest.redis_version(
+    5, 0, 0, reason="Streams only available since Redis 5.0.0")
+
+
+async def add_messages(redis, stream, count):
+    ids = []
+    for i in range(count):
+        ids.append(await redis.xadd(stream, {'n': i}))
+    return ids
+
+
+@streams_test
+@pytest.mark.run_loop
+async def test_xadd_xrange(redis):
+    id1 = await redis.xadd('stream:1', {'a': 1, 'b': 'x'})
+    id2 = await redis.xadd('stream:1', {'a': 2}, max_len=100)
+    assert await redis.xlen('stream:1') == 2
+    assert await redis.xrange('stream:1') == [
+        (id1, {b'a': b'1', b'b': b'x'}),
+        (id2, {b'a': b'2'}),
+        ]
+    assert await redis.xrevrange('stream:1', count=1) == [
+        (id2, {b'a': b'2'}),
+        ]
+    assert await redis.xrange('stream:1', id2, encoding='utf-8') == [
+        (id2.decode('utf-8'), {'a': '2'}),
+        ]
+    assert await redis.xdel('stream:1', id1) == 1
+    assert await redis.xtrim('stream:1', 0, exact_len=True) == 1
+
+    with pytest.raises(ValueError):
+        await redis.xadd('stream:1', {})
+
+
+@streams_test
+@pytest.mark.run_loop
+async def test_xread(redis, loop):
+    id1, id2 = await add_messages(redis, 'stream:2', 2)
+    res = await redis.xread(['stream:2'], latest_ids=['0'], count=1)
+    assert res == [(b'stream:2', id1, {b'n': b'0'})]
+    res = await redis.xread(['stream:2'], timeout=None, latest_ids=[id1])
+    assert res == [(b'stream:2', id2, {b'n': b'1'})]
+    assert await redis.xread(['stream:2'], timeout=10) == []
+
+    with pytest.raises(ValueError):
+        await redis.xread(['stream:2'], latest_ids=['0', '0'])
+    with pytest.raises(TypeError):
+        await redis.xread(['stream:2'], timeout=1.5)
+    with pytest.raises(ValueError):
+        await redis.xread(['stream:2'], timeout=-1)
+
+
+@streams_test
+@pytest.mark.run_loop
+async def test_consumer_group(redis):
+    assert await redis.xgroup_create('stream:3', 'group', '$',
+                                     mkstream=True)
+    with pytest.raises(ReplyError):
+        await redis.xgroup_create('stream:3', 'group')
+    id1, id2 = await add_messages(redis, 'stream:3', 2)
+
+    res = await redis.xread_group('group', 'c1', ['stream:3'], count=1)
+    assert res == [(b'stream:3', id1, {b'n': b'0'})]
+    res = await redis.xread_group('group', 'c2', ['stream:3'], timeout=None)
+    assert res == [(b'stream:3', id2, {b'n': b'1'})]
+
+    count, start, stop, consumers = await redis.xpending('stream:3', 'group')
+    assert (count, start, stop) == (2, id1, id2)
+    assert consumers == [[b'c1', b'1'], [b'c2', b'1']]
+    pending = await redis.xpending('stream:3', 'group', '-', '+', 10, 'c1')
+    assert [p[:2] for p in pending] == [[id1, b'c1']]
+
+    res = await redis.xclaim('stream:3', 'group', 'c2', 0, id1)
+    assert res == [(id1, {b'n': b'0'})]
+    assert await redis.xack('stream:3', 'group', id1, id2) == 2
+    assert await redis.xpending('stream:3', 'group', '-', '+', 10) == []
+
+    assert await redis.xgroup_setid('stream:3', 'group', '0')
+    assert await redis.xgroup_delconsumer('stream:3', 'group', 'c1') == 0
+    assert await redis.xgroup_destroy('stream:3', 'group') == 1
+
+
+@streams_test
+@pytest.mark.run_loop
+async def test_ixread_group(redis, loop):
+    await redis.xgroup_create('stream:4', 'group', '$', mkstream=True)
+    ids = await add_messages(redis, 'stream:4', 10)
+
+    consumer = redis.ixread_group('stream:4', 'group', 'c1', count=3,
+                                  timeout=10, ack_batch=4, loop=loop)
+    res = []
+    async for message_id, fields in consumer:
+        res.append(message_id)
+        if len(res) == 10:
+            break
+    await consumer.close()
+    assert res == ids
+    # last message is acknowledged on close
+    assert await redis.xpending('stream:4', 'group', '-', '+', 10) == []
+
+
+def test_parse_messages():
+    assert parse_messages(None) == []
+    assert parse_messages([[b'1-0', [b'a', b'1']], None]) == [
+        (b'1-0', {b'a': b'1'}),
+        ]
+
+
+class FakeRedis:
+
+    def __init__(self, messages, pending=()):
+        self.messages = list(messages)
+        self.history = []
+        self.pending = list(pending)
+        self.calls = []
+
+    async def xread_group(self, group, consumer, streams, timeout, count,
+                          latest_ids, encoding):
+        self.calls.append(('xread_group', latest_ids[0], timeout))
+        if latest_ids[0] != b'>':
+            batch, self.history = self.history, []
+        else:
+            batch = self.messages[:count]
+            del self.messages[:count]
+            if not batch and timeout:
+                await asyncio.sleep(timeout / 1000)
+        return [(streams[0], message_id, fields)
+                for message_id, fields in batch]
+
+    async def xack(self, stream, group, *ids):
+        self.calls.append(('xack',) + ids)
+        return len(ids)
+
+    async def xpending(self, stream, group, start, stop, count, encoding):
+        self.calls.append(('xpending',))
+        pending, self.pending = self.pending, []
+        return pending
+
+    async def xclaim(self, stream, group, consumer, min_idle, *ids,
+                     encoding):
+        self.calls.append(('xclaim',) + ids)
+        return [(message_id, {b'claimed': b'1'}) for message_id in ids]
+
+
+@pytest.mark.run_loop
+async def test_group_consumer(loop):
+    redis = FakeRedis(
+        [(b'%d-0' % i, {b'n': b'%d' % i}) for i in range(1, 6)],
+        pending=[[b'0-1', b'c1', 5000, 1],
+                 [b'0-2', b'c2', 10, 1],
+                 [b'0-3', b'c2', 5000, 1]])
+    # own pending messages, one of them deleted from stream
+    redis.history = [(b'0-0', {b'n': b'0'}), (b'0-5', None)]
+    consumer = StreamGroupConsumer(redis, 'stream', 'group', 'c1',
+                                   count=2, timeout=10, ack_batch=3,
+                                   claim_min_idle=1000, loop=loop)
+    res = []
+    async for message_id, fields in consumer:
+        res.append(message_id)
+        if len(res) == 7:
+            break
+    await consumer.close()
+    assert res == [b'0-0', b'1-0', b'2-0', b'3-0', b'4-0', b'5-0', b'0-3']
+    acks = [call for call in redis.calls if call[0] == 'xack']
+    assert acks == [
+        ('xack', b'0-5', b'0-0', b'1-0'),
+        ('xack', b'2-0', b'3-0', b'4-0'),
+        ('xack', b'5-0'),
+        ('xack', b'0-3'),
+        ]
+    assert ('xclaim', b'0-3') in redis.calls
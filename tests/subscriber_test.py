@@ -0,0 +1,95 @@
+import asyncio
+import pytest
+
+from unittest import mock
+
+from aioredis import RedisConnection, Channel
+from aioredis.pubsub import GapMarker
+from aioredis.stream import StreamReader
+from aioredis.subscriber import ResilientSubscriber
+
+
+def reply(kind, name, count):
+    return b'*3\r\n$%d\r\n%s\r\n$%d\r\n%s\r\n:%d\r\n' % (
+        len(kind), kind, len(name), name, count)
+
+
+def message(name, data):
+    return b'*3\r\n$7\r\nmessage\r\n$%d\r\n%s\r\n$%d\r\n%s\r\n' % (
+        len(name), name, len(data), data)
+
+
+def make_connection(loop):
+    reader = StreamReader(loop=loop)
+    conn = RedisConnection(reader, mock.Mock(),
+                           address=('localhost', 6379), loop=loop)
+    return conn, reader
+
+
+async def wait_written(conn, count, loop):
+    for _ in range(100):
+        if len(conn._writer.write.mock_calls) >= count:
+            return [call[1][0] for call in conn._writer.write.mock_calls]
+        await asyncio.sleep(0.01, loop=loop)
+    assert False, "Nothing written"
+
+
+@pytest.mark.run_loop
+async def test_resubscribe(loop):
+    conn1, reader1 = make_connection(loop)
+    conn2, reader2 = make_connection(loop)
+    attempts = []
+
+    async def connect():
+        attempts.append(loop.time())
+        if len(attempts) == 1:
+            raise OSError("Connection refused")
+        return conn2
+
+    sub = ResilientSubscriber(conn1, connect, min_backoff=0.01, loop=loop)
+    fut = asyncio.ensure_future(sub.subscribe('chan:1'), loop=loop)
+    await wait_written(conn1, 1, loop)
+    reader1.feed_data(reply(b'subscribe', b'chan:1', 1))
+    ch, = await fut
+    assert isinstance(ch, Channel)
+    fut = asyncio.ensure_future(sub.psubscribe('chan:*'), loop=loop)
+    await wait_written(conn1, 2, loop)
+    reader1.feed_data(reply(b'psubscribe', b'chan:*', 2))
+    pch, = await fut
+    assert dict(sub.channels) == {b'chan:1': ch}
+    assert dict(sub.patterns) == {b'chan:*': pch}
+
+    reader1.feed_data(message(b'chan:1', b'a'))
+    assert await ch.get() == b'a'
+
+    # connection is lost
+    reader1.feed_eof()
+    assert await ch.get() is GapMarker
+    assert await pch.get() is GapMarker
+    assert ch.is_active and pch.is_active
+
+    written = await wait_written(conn2, 1, loop)
+    assert written == [b'*2\r\n$9\r\nSUBSCRIBE\r\n$6\r\nchan:1\r\n'
+                       b'*2\r\n$10\r\nPSUBSCRIBE\r\n$6\r\nchan:*\r\n']
+    assert len(attempts) == 2
+    assert not sub.connected
+    reader2.feed_data(reply(b'subscribe', b'chan:1', 1) +
+                      reply(b'psubscribe', b'chan:*', 2))
+    reader2.feed_data(message(b'chan:1', b'b'))
+    assert await ch.get() == b'b'
+    for _ in range(3):
+        await asyncio.sleep(0, loop=loop)
+    assert sub.connected
+
+    fut = asyncio.ensure_future(sub.unsubscribe(ch), loop=loop)
+    await wait_written(conn2, 2, loop)
+    reader2.feed_data(reply(b'unsubscribe', b'chan:1', 1))
+    await fut
+    assert not ch.is_active
+    assert dict(sub.channels) == {}
+
+    sub.close()
+    await sub.wait_closed()
+    assert sub.closed
+    assert not pch.is_active
+    assert conn2.closed